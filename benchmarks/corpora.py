@@ -0,0 +1,62 @@
+"""
+This module generates synthetic French corpora, of any size,
+for the benchmarks.
+"""
+import random
+
+
+
+# Words of each kind of corpus
+_plain_words = (
+    "le la les un une des et ou mais donc or ni car que qui dans sur sous "
+    "avec sans pour par vers chez entre il elle on nous vous ils elles "
+    "fenouil oulipo poisson maison jardin ville chemin soleil nuit jour "
+    "temps homme femme enfant livre lettre mot phrase roman conte histoire "
+    "marcher parler lire ecrire chanter dormir manger courir partir venir "
+    "grand petit beau vieux jeune noir blanc rouge vert bleu long court"
+).split()
+_accent_words = (
+    "été élève écrit à où déjà là-bas très après près forêt fenêtre tête "
+    "château île naïf maïs noël aiguë cœur garçon français façade reçu "
+    "hôpital côté rôle théâtre événement fièvre mère père frère lumière "
+    "élégant épée écolière pâté âme bâton dîner goûter août sûr mûr"
+).split()
+_ligature_words = (
+    "cœur œuvre œuf bœuf sœur nœud vœu mœurs œil manœuvre chœur œsophage "
+    "ex-æquo curriculum-vitæ cæcum tænia nævus lætitia Œdipe Æsope"
+).split()
+_punctuation = (", ", ", ", "; ", " : ", ". ", " ! ", " ? ", "... ", " — ", "\n")
+
+# Proportions of each list of words, by kind of corpus
+corpora = {
+    'plain': {'plain': 1},
+    'french': {'plain': 8, 'accent': 2, 'ligature': 0.2},
+    'accents': {'plain': 1, 'accent': 4},
+    'ligatures': {'plain': 1, 'ligature': 2},
+}
+_word_lists = {'plain': _plain_words, 'accent': _accent_words, 'ligature': _ligature_words}
+
+def generate(kind: str, size: int, seed: int = 0) -> str:
+    """
+    Return a text of given kind (see 'corpora') of about
+    'size' characters: sentences of random words, with
+    punctuation and line breaks.
+    """
+    if kind not in corpora:
+        raise ValueError(f"'kind' argument must be in {set(corpora.keys())}")
+    rng = random.Random(seed)
+    words, weights = [], []
+    for name, weight in corpora[kind].items():
+        words.extend(_word_lists[name])
+        weights.extend([weight / len(_word_lists[name])] * len(_word_lists[name]))
+    # Average word is about 6 characters with its separator
+    n_words = size // 6 + 1
+    separators = rng.choices((" ",) * 8 + _punctuation, k=n_words)
+    parts = []
+    for word, separator in zip(rng.choices(words, weights, k=n_words), separators):
+        parts.append(word)
+        parts.append(separator)
+    text = ''.join(parts)
+    while len(text) < size:
+        text += text
+    return text[:size]
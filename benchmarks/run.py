@@ -0,0 +1,282 @@
+"""
+Benchmarks of the public functions of src/utils.py, on synthetic
+French corpora of increasing size.
+
+For each function, corpus and size, it reports the time of a call,
+the throughput (MB/s of UTF-8 text) and the peak memory allocated
+during the call; for each function and corpus, the scaling slope
+(1 for a linear function, 2 for a quadratic one). Results are saved
+as JSON, and two result files can be compared:
+
+    python -m benchmarks.run -o before.json
+    python -m benchmarks.run -o after.json
+    python -m benchmarks.run --compare before.json after.json
+"""
+import argparse
+from datetime import datetime, timezone
+import inspect
+import json
+import math
+import platform
+import re
+import sys
+import time
+import tracemalloc
+
+from src import utils
+from .corpora import corpora, generate
+
+
+
+####
+# Functions
+####
+
+# Call of the functions that need other arguments than a text
+_calls = {
+    'filter_letters': lambda s: utils.filter_letters(s, "AEIOU"),
+    'chunk': lambda s: utils.chunk(s, 11),
+    'count_common': lambda s: utils.count_common(s, "Georges Perec"),
+    'mask_letters': lambda s: utils.mask_letters(utils.letter_mask(s)),
+    'source_span': lambda s: utils.source_span(utils.letter_offsets(s), 0, 1),
+    'check_beaupresent': lambda s: utils.check_beaupresent(s, "Georges Perec"),
+    'check_lipogram': lambda s: utils.check_lipogram(s, "E"),
+    'check_acrostic': lambda s: utils.check_acrostic(s, "OULIPO"),
+    'check_progressive_tautogram': lambda s: utils.check_progressive_tautogram(s, "OULIPO"),
+    'check_maxgram': lambda s: utils.check_maxgram(s, 12),
+    'check_mingram': lambda s: utils.check_mingram(s, 1),
+    'check_ananym': lambda s: utils.check_ananym(s, s),
+    'check_anagram': lambda s: utils.check_anagram(s, s),
+    'check_subanagram': lambda s: utils.check_subanagram(s, s),
+    'check_all': lambda s: utils.check_all(s, [
+        "tautogram", ("lipogram", {"forbidden": "E"}), "pangram", "okapi", "kyrielle",
+    ]),
+    'compile_constraint': lambda s: utils.compile_constraint("lipogram", forbidden="E")(s),
+}
+
+def _takes_text(function) -> bool:
+    """
+    Return True if the first parameter of a function is
+    required (the text), False for functions that do not
+    take a text (e.g. clear_normalization_cache()).
+    """
+    parameters = list(inspect.signature(function).parameters.values())
+    return bool(parameters) and parameters[0].default is inspect.Parameter.empty
+
+def public_functions() -> dict:
+    """
+    Return the public functions of src/utils.py, by name,
+    as functions of a single text.
+    """
+    functions = {}
+    for name, function in vars(utils).items():
+        if (name.startswith('_') or not inspect.isfunction(function)
+                or function.__module__ != utils.__name__):
+            continue
+        if name in _calls:
+            functions[name] = _calls[name]
+        elif _takes_text(function):
+            functions[name] = function
+    return functions
+
+
+####
+# Measures
+####
+
+_units = {'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9}
+
+def parse_size(size: str) -> int:
+    """
+    Return a size given as '100', '10KB', '1MB'... in bytes.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*([KMG]?B)?\s*", size.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {size!r}")
+    return int(match.group(1)) * _units[match.group(2) or 'B']
+
+def measure_time(function, s: str, min_time: float) -> float:
+    """
+    Return the best time of a call, repeating it
+    for at least 'min_time' seconds (and at least once).
+    """
+    best = math.inf
+    total = 0
+    while total < min_time or best == math.inf:
+        start = time.perf_counter()
+        function(s)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    return best
+
+def measure_memory(function, s: str) -> int:
+    """
+    Return the peak memory allocated during a call, in bytes.
+    """
+    tracemalloc.start()
+    try:
+        function(s)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def scaling_slope(points: list) -> float:
+    """
+    Return the slope of log(time) against log(size), by
+    least squares, from (size, time) points.
+    """
+    points = [(math.log(size), math.log(t)) for size, t in points if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+def run(functions: dict, kinds: list, sizes: list, min_time=0.2, budget=10.,
+        memory=True, log=None) -> dict:
+    """
+    Run the benchmarks, return the results as a dict
+    (see the module documentation).
+
+    Parameters
+    ----------
+    functions : dict
+        Functions of a text, by name.
+    kinds : list of str
+        Kinds of corpus (see corpora.corpora).
+    sizes : list of int
+        Sizes of the corpora, in characters.
+    min_time : float, optional
+        Minimal duration of the measure of each function,
+        in seconds (calls are repeated).
+    budget : float, optional
+        When a call takes more than 'budget' seconds,
+        larger sizes are skipped for this function.
+    memory : bool, optional
+        If True, also measure the peak memory of each call.
+    log : file, optional
+        Where to print progress. Defaults to no output.
+    """
+    results = []
+    slopes = {}
+    for kind in kinds:
+        texts = {size: generate(kind, size) for size in sorted(sizes)}
+        for name, function in functions.items():
+            points = []
+            for size, text in texts.items():
+                n_bytes = len(text.encode('utf-8'))
+                result = {'function': name, 'corpus': kind, 'size': size, 'bytes': n_bytes}
+                try:
+                    seconds = measure_time(function, text, min_time)
+                except Exception as e:
+                    result['error'] = f"{type(e).__name__}: {e}"
+                    results.append(result)
+                    break
+                result['seconds'] = seconds
+                result['mb_per_s'] = n_bytes / 1e6 / seconds if seconds else None
+                if memory:
+                    result['peak_memory'] = measure_memory(function, text)
+                results.append(result)
+                points.append((size, seconds))
+                if log:
+                    print(f"{kind:<10} {name:<30} {size:>12} {seconds:12.6f} s", file=log)
+                if seconds > budget:
+                    break
+            slopes[f"{name}/{kind}"] = scaling_slope(points)
+    return {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version,
+            'platform': platform.platform(),
+            'numpy': utils.numpy is not None,
+        },
+        'results': results,
+        'slopes': slopes,
+    }
+
+
+####
+# Comparison
+####
+
+def compare(before: dict, after: dict, threshold=1.25) -> list:
+    """
+    Return the (function, corpus, size, ratio) of the measures
+    that are slower in 'after' than in 'before', by a factor
+    greater than 'threshold'.
+    """
+    def times(results: dict) -> dict:
+        return {
+            (r['function'], r['corpus'], r['size']): r['seconds']
+            for r in results['results'] if 'seconds' in r
+        }
+    before, after = times(before), times(after)
+    regressions = []
+    for key in sorted(before.keys() & after.keys()):
+        if before[key] and after[key] / before[key] > threshold:
+            regressions.append((*key, after[key] / before[key]))
+    return regressions
+
+
+####
+# Script
+####
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the functions of src/utils.py.")
+    parser.add_argument('-o', '--output', help="JSON file for the results (default: standard output).")
+    parser.add_argument(
+        '-s', '--sizes', default="1KB,10KB,100KB,1MB",
+        help="Comma-separated sizes of the corpora (e.g. '1KB,1MB,100MB').",
+    )
+    parser.add_argument(
+        '-c', '--corpora', default=','.join(corpora),
+        help=f"Comma-separated kinds of corpus, among: {', '.join(corpora)}.",
+    )
+    parser.add_argument('-f', '--filter', default='', help="Only run functions matching this regex.")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimal time of each measure (s).")
+    parser.add_argument('--budget', type=float, default=10., help="Skip larger sizes after a slower call (s).")
+    parser.add_argument('--no-memory', action='store_true', help="Do not measure peak memory.")
+    parser.add_argument(
+        '--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+        help="Compare two result files, and fail on regressions.",
+    )
+    parser.add_argument('--threshold', type=float, default=1.25, help="Slowdown ratio of a regression.")
+    args = parser.parse_args(args)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        regressions = compare(before, after, args.threshold)
+        for function, kind, size, ratio in regressions:
+            print(f"{function:<30} {kind:<10} {size:>12} x{ratio:.2f}")
+        return 1 if regressions else 0
+
+    functions = {
+        name: function for name, function in public_functions().items()
+        if re.search(args.filter, name)
+    }
+    results = run(
+        functions,
+        kinds=args.corpora.split(','),
+        sizes=[parse_size(size) for size in args.sizes.split(',')],
+        min_time=args.min_time,
+        budget=args.budget,
+        memory=not args.no_memory,
+        log=sys.stderr,
+    )
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
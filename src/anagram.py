@@ -0,0 +1,160 @@
+"""
+This module contains an anagram engine: anagrams, sub-anagrams
+and multi-word anagrams of a text, found in a lexicon.
+"""
+from itertools import combinations_with_replacement, product
+from operator import le, sub
+from typing import Iterable, Iterator
+
+from .lexicon import Lexicon
+from .utils import letter_mask, to_letters
+
+
+
+####
+# Utils
+####
+
+def _mask(counts: tuple) -> int:
+    """
+    Return the mask of the non-zero values of a count vector.
+    """
+    return sum(1 << i for i, n in enumerate(counts) if n)
+
+def signature(s: str) -> str:
+    """
+    Return the sorted letters of given text: two texts
+    are anagrams if they have the same signature (see
+    check_anagram()).
+    """
+    return ''.join(sorted(to_letters(s)))
+
+
+####
+# Anagram index
+####
+
+class AnagramIndex(Lexicon):
+    """
+    Lexicon indexed by signature (sorted letters), to find
+    anagrams of a text in constant time, and sub-anagrams
+    or multi-word anagrams by a pruned search.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+    """
+    def __init__(self, words: Iterable[str]):
+        super().__init__(words)
+        # Words by signature
+        self.signatures = {}
+        for word in self.words:
+            self.signatures.setdefault(signature(word), []).append(word)
+        # Signatures by letter mask
+        self.signature_masks = {}
+        for sig in self.signatures:
+            self.signature_masks.setdefault(letter_mask(sig), []).append(sig)
+
+    def anagrams(self, s: str) -> list[str]:
+        """
+        Return the words of the lexicon that are anagrams
+        of given text.
+        """
+        return list(self.signatures.get(signature(s), []))
+
+    def _subsignatures(self, s: str) -> list[str]:
+        """
+        Return the signatures of the words whose letters
+        are all contained in given text.
+        """
+        target = signature(s)
+        ref = letter_mask(target)
+        target_counts = {c: target.count(c) for c in set(target)}
+        found = []
+        for mask, signatures in self.signature_masks.items():
+            if mask & ~ref:
+                continue
+            for sig in signatures:
+                if all(sig.count(c) <= target_counts.get(c, 0) for c in set(sig)):
+                    found.append(sig)
+        return found
+
+    def subanagrams(self, s: str) -> list[str]:
+        """
+        Return the words of the lexicon whose letters are
+        all contained in given text (see check_subanagram()).
+        """
+        found = set()
+        for sig in self._subsignatures(s):
+            found.update(self.signatures[sig])
+        return [word for word in self.words if word in found]
+
+    def multi_anagrams(self, s: str, max_words=None) -> Iterator[tuple[str, ...]]:
+        """
+        Yield the sequences of words of the lexicon that,
+        together, are an anagram of given text. Each set of
+        words is yielded once, longest words first.
+
+        Parameters
+        ----------
+        s : str
+            Source text.
+        max_words : int, optional
+            Maximal number of words in a sequence.
+            Defaults to no limit.
+        """
+        target = signature(s)
+        if not target:
+            return
+        # Count vectors on the letters of the target only
+        alphabet = sorted(set(target))
+
+        def counts(sig: str) -> tuple:
+            return tuple(sig.count(c) for c in alphabet)
+
+        candidates = sorted(self._subsignatures(target), key=len, reverse=True)
+        candidates = [(counts(sig), _mask(counts(sig)), sig) for sig in candidates]
+        for signatures in self._search_signatures(counts(target), candidates, max_words, []):
+            yield from self._expand(signatures)
+
+    def _search_signatures(self, remaining: tuple, candidates: list, max_words, chosen: list) -> Iterator[list]:
+        """
+        Yield the lists of signatures, taken in order from
+        'candidates', whose counts sum up to 'remaining'.
+        """
+        if not any(remaining):
+            yield list(chosen)
+            return
+        if max_words is not None and len(chosen) >= max_words:
+            return
+        # Keep the candidates that fit in the remaining letters
+        fitting = [c for c in candidates if all(map(le, c[0], remaining))]
+        # Each remaining letter must be brought by some candidate
+        union = 0
+        for _, mask, _ in fitting:
+            union |= mask
+        if _mask(remaining) & ~union:
+            return
+        for i, (counts, mask, sig) in enumerate(fitting):
+            chosen.append(sig)
+            yield from self._search_signatures(
+                tuple(map(sub, remaining, counts)), fitting[i:], max_words, chosen
+            )
+            chosen.pop()
+
+    def _expand(self, signatures: list) -> Iterator[tuple[str, ...]]:
+        """
+        Yield the sequences of words matching a list of
+        signatures (a signature used k times gives each
+        combination of k of its words once).
+        """
+        groups = {}
+        for sig in signatures:
+            groups[sig] = groups.get(sig, 0) + 1
+        choices = [
+            combinations_with_replacement(self.signatures[sig], k)
+            for sig, k in groups.items()
+        ]
+        for words in product(*choices):
+            yield tuple(w for group in words for w in group)
@@ -0,0 +1,517 @@
+"""
+This module contains engines to build chains of words
+from a lexicon, where each pair of successive words
+follows a constraint (kyrielles, snobs...).
+"""
+from functools import partial
+from typing import Iterable, Iterator
+
+from .lexicon import Lexicon
+from .utils import (
+    OTHER_CHAR_BIT, _letters_mask, _share_letters, _share_no_letter,
+    check_kyrielle, to_words,
+)
+
+
+
+####
+# Utils
+####
+
+def _shortest_paths(n: int, arcs: list, source: int) -> tuple:
+    """
+    Return the (distances, previous arcs) of the shortest
+    paths from a node, through the arcs with a remaining
+    capacity, with Bellman-Ford's algorithm (costs may be
+    negative, without negative cycle).
+    """
+    inf = float('inf')
+    distances = [inf] * n
+    previous = [None] * n
+    distances[source] = 0
+    for _ in range(n):
+        changed = False
+        for i, (u, v, capacity, cost) in enumerate(arcs):
+            if capacity and distances[u] + cost < distances[v]:
+                distances[v] = distances[u] + cost
+                previous[v] = i
+                changed = True
+        if not changed:
+            break
+    return distances, previous
+
+def _min_cost_flow(n: int, arcs: list, source: int, sink: int) -> list:
+    """
+    Send the maximal flow from 'source' to 'sink', at the
+    minimal cost, by successive shortest paths. Arcs are
+    [u, v, capacity, cost] lists, each followed by its
+    reverse arc (with a null capacity); the capacities
+    are updated, and the flow of each arc is returned.
+    """
+    capacities = [arc[2] for arc in arcs]
+    while True:
+        distances, previous = _shortest_paths(n, arcs, source)
+        if previous[sink] is None:
+            break
+        # Bottleneck of the path
+        path = []
+        v = sink
+        while v != source:
+            path.append(previous[v])
+            v = arcs[previous[v]][0]
+        amount = min(arcs[i][2] for i in path)
+        for i in path:
+            arcs[i][2] -= amount
+            arcs[i ^ 1][2] += amount
+    return [capacity - arc[2] for capacity, arc in zip(capacities, arcs)]
+
+def _euler_path(arcs: dict, start) -> list:
+    """
+    Return the arcs of an Eulerian path from 'start', with
+    Hierholzer's algorithm. Arcs are lists of (target, label)
+    by node, and are consumed; the path is a list of labels.
+    """
+    path = []
+    # Stack of (node, label of the arc leading to it)
+    stack = [(start, None)]
+    while stack:
+        node, label = stack[-1]
+        if arcs.get(node):
+            stack.append(arcs[node].pop())
+        else:
+            stack.pop()
+            if label is not None:
+                path.append(label)
+    path.reverse()
+    return path
+
+def _connected_parts(arcs: dict) -> list[dict]:
+    """
+    Split arcs, given as lists of labels by (first, last)
+    node, into the arcs of each (weakly) connected part
+    of the graph.
+    """
+    parents = {c: c for key in arcs for c in key}
+
+    def find(c):
+        while parents[c] != c:
+            parents[c] = parents[parents[c]]
+            c = parents[c]
+        return c
+
+    for first, last in arcs:
+        parents[find(first)] = find(last)
+    parts = {}
+    for key, labels in arcs.items():
+        parts.setdefault(find(key[0]), {})[key] = labels
+    return list(parts.values())
+
+def _max_balanced(arcs: dict, required=()) -> dict:
+    """
+    Return the most arcs (lists of labels by (first, last)
+    node, without loops) that can be kept so that each node
+    starts as many arcs as it ends, but for the first and
+    last nodes of a path, keeping at least one arc of each
+    'required' (first, last) pair. Return None if it cannot
+    be done.
+
+    It is a minimum cost flow problem, on a graph of a few
+    dozen nodes: all the arcs are kept first, and flow goes
+    from the nodes ending more arcs than they start towards
+    the others, either by dropping an arc (cost 1), or through
+    the end and the start of the path (once).
+    """
+    nodes = sorted({c for key in arcs for c in key})
+    index = {c: i for i, c in enumerate(nodes)}
+    n = len(nodes)
+    # Extra nodes: end -> start of the path, source and sink
+    x_in, x_out, source, sink = n, n + 1, n + 2, n + 3
+    flow_arcs = []
+
+    def add_arc(u, v, capacity, cost):
+        flow_arcs.append([u, v, capacity, cost])
+        flow_arcs.append([v, u, 0, -cost])
+
+    excess = [0] * n
+    removals = {}
+    for (first, last), labels in arcs.items():
+        u, v = index[first], index[last]
+        excess[v] += len(labels)
+        excess[u] -= len(labels)
+        removals[first, last] = len(flow_arcs)
+        add_arc(v, u, len(labels) - ((first, last) in required), 1)
+    add_arc(x_in, x_out, 1, 0)
+    for v in range(n):
+        add_arc(v, x_in, 1, 0)
+        add_arc(x_out, v, 1, 0)
+    supplies = []
+    for v in range(n):
+        if excess[v] > 0:
+            supplies.append(len(flow_arcs))
+            add_arc(source, v, excess[v], 0)
+        elif excess[v] < 0:
+            add_arc(v, sink, -excess[v], 0)
+    flows = _min_cost_flow(n + 4, flow_arcs, source, sink)
+    if any(flow_arcs[i][2] for i in supplies):
+        # Some excess cannot be sent, because of required arcs
+        return None
+    kept = {}
+    for key, labels in arcs.items():
+        removed = flows[removals[key]]
+        if labels[removed:]:
+            kept[key] = labels[removed:]
+    return kept
+
+def _longest_trail(arcs: dict) -> list:
+    """
+    Return the labels of a longest path using each arc at
+    most once, in a graph whose arcs are given as lists of
+    labels by (first, last) node.
+
+    The most arcs that can be kept with balanced nodes (see
+    _max_balanced()), with all the loops, is an upper bound.
+    It is reached when the arcs kept are connected, and the
+    path is then an Eulerian path of them. Otherwise, it is
+    a branch and bound on the connectivity of the path: for
+    a part of the arcs kept, the path either avoids its
+    nodes, stays in them, or uses one of the arcs between
+    them and the other nodes (which is then required). For
+    a letter with loops that is not reached, the path either
+    avoids it, or uses one of its arcs.
+
+    Finding a longest path is NP-hard, and the search may be
+    exponential, but on the graph of the letters of a lexicon
+    the bound is usually reached at once.
+    """
+    loops = {first: labels for (first, last), labels in arcs.items() if first == last}
+    links = {key: labels for key, labels in arcs.items() if key[0] != key[1]}
+    # Length and arcs of the longest path found so far
+    best = [0, {}]
+
+    def with_loops(part: dict) -> dict:
+        nodes = {c for key in part for c in key}
+        return {**part, **{(c, c): loops[c] for c in nodes if c in loops}}
+
+    def record(part: dict):
+        length = sum(map(len, part.values()))
+        if length > best[0]:
+            best[:] = [length, part]
+
+    for c, labels in loops.items():
+        record({(c, c): labels})
+
+    def search(deleted: frozenset, removed: frozenset, required: frozenset):
+        candidates = {
+            key: labels for key, labels in links.items()
+            if key not in removed and key[0] not in deleted and key[1] not in deleted
+        }
+        if not required <= set(candidates):
+            return
+        kept = _max_balanced(candidates, required)
+        if kept is None:
+            return
+        bound = sum(map(len, kept.values())) + sum(len(loops[c]) for c in loops if c not in deleted)
+        if bound <= best[0]:
+            return
+        parts = _connected_parts(kept)
+        for part in parts:
+            record(with_loops(part))
+        if bound <= best[0]:
+            return
+        if len(parts) > 1:
+            # The part with the fewest arcs to the other nodes
+            cuts = []
+            for part in parts:
+                inside = {c for key in part for c in key}
+                crossing = [key for key in candidates if (key[0] in inside) != (key[1] in inside)]
+                cuts.append((len(crossing), inside, crossing))
+            _, inside, crossing = min(cuts, key=lambda cut: cut[0])
+            nodes = {c for key in candidates for c in key} | set(loops)
+            search(deleted | inside, removed, required)
+            search(deleted | (nodes - deleted - inside), removed, required)
+        else:
+            # A letter with loops that is not reached
+            touched = {c for key in kept for c in key}
+            node = min(c for c in loops if c not in deleted and c not in touched)
+            crossing = [key for key in candidates if node in key]
+            search(deleted | {node}, removed, required)
+        for i, key in enumerate(crossing):
+            search(deleted, removed | frozenset(crossing[:i]), required | {key})
+
+    search(frozenset(), frozenset(), frozenset())
+    # Eulerian path of the arcs kept, from the node starting
+    # more arcs than it ends, if any
+    balance = {}
+    for (first, last), labels in best[1].items():
+        balance[first] = balance.get(first, 0) + len(labels)
+        balance[last] = balance.get(last, 0) - len(labels)
+    if not balance:
+        return []
+    start = min(balance, key=lambda c: (balance[c] <= 0, c))
+    graph = {}
+    for (first, last), labels in best[1].items():
+        graph.setdefault(first, []).extend((last, label) for label in reversed(labels))
+    return _euler_path(graph, start)
+
+
+####
+# Kyrielles
+####
+
+class KyrielleIndex(Lexicon):
+    """
+    Lexicon seen as a graph, to build kyrielles (see
+    check_kyrielle()): letters are nodes, and each word is
+    an arc from its first letter to its last one. A kyrielle
+    is a path in this graph, without using a word twice.
+
+    Words made of several words (e.g. "arc-en-ciel") are
+    only used if they are kyrielles themselves.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+
+    Example
+    -------
+    >>> index = KyrielleIndex(words)
+    >>> index.longest(lipogram="E")
+    >>> next(index.kyrielles(5, start="O", ngram=5))
+    """
+    def __init__(self, words: Iterable[str]):
+        super().__init__(words)
+        # Indices of the words, by (first letter, last letter)
+        self.arcs = {}
+        for i, word in enumerate(self.words):
+            key = self._arc(word)
+            if key is not None:
+                self.arcs.setdefault(key, []).append(i)
+
+    @staticmethod
+    def _arc(word: str):
+        """
+        Return the (first letter, last letter) of a word,
+        or None if it cannot be used in a kyrielle.
+        """
+        words = to_words(word, letters_only=True)
+        if not words or (len(words) > 1 and not check_kyrielle(word)):
+            return None
+        return words[0][0], words[-1][-1]
+
+    def _query_arcs(self, constraints: dict) -> dict:
+        """
+        Return the arcs of the words following given
+        constraints (see search()).
+        """
+        if not constraints:
+            return self.arcs
+        arcs = {}
+        for i in self._search(constraints):
+            key = self._arc(self.words[i])
+            if key is not None:
+                arcs.setdefault(key, []).append(i)
+        return arcs
+
+    def longest(self, **constraints) -> list[str]:
+        """
+        Return a longest kyrielle of the words following given
+        constraints (see search()), each word being used once.
+        It is found exactly, by a minimum cost flow on the graph
+        of the letters, and a branch and bound when the words
+        kept are not connected (see _longest_trail()).
+        """
+        parts = _connected_parts(self._query_arcs(constraints))
+        best = max((_longest_trail(part) for part in parts), key=len, default=[])
+        return [self.words[i] for i in best]
+
+    def kyrielles(self, n: int, start=None, end=None, **constraints) -> Iterator[list[str]]:
+        """
+        Yield the kyrielles of 'n' words following given
+        constraints (see search()), each word being used at
+        most once, lazily, by a depth-first search.
+
+        Parameters
+        ----------
+        n : int
+            Number of words of the kyrielles.
+        start, end : str, optional
+            First letter of the first word, last letter of
+            the last word.
+        **constraints
+            Constraints of each word (e.g. ngram=5).
+        """
+        arcs = self._query_arcs(constraints)
+        start = to_words(start, letters_only=True)[0][0] if start else None
+        end = to_words(end, letters_only=True)[-1][-1] if end else None
+        targets = {}
+        for (first, last), words in arcs.items():
+            targets.setdefault(first, []).append((last, words))
+        nodes = {c for key in arcs for c in key}
+        # reachable[k]: letters from which a path of k words
+        # can be made (to 'end' if given)
+        reachable = [nodes if end is None else {end}]
+        for k in range(1, n + 1):
+            reachable.append({
+                first for first, items in targets.items()
+                if any(last in reachable[k-1] for last, _ in items)
+            })
+        used = set()
+        chain = []
+
+        def extend(node, k):
+            if not k:
+                yield [self.words[i] for i in chain]
+                return
+            for last, words in targets.get(node, ()):
+                if last not in reachable[k-1]:
+                    continue
+                for i in words:
+                    if i in used:
+                        continue
+                    used.add(i)
+                    chain.append(i)
+                    yield from extend(last, k - 1)
+                    chain.pop()
+                    used.discard(i)
+
+        if n < 1:
+            return
+        for node in sorted(reachable[n]):
+            if start is None or node == start:
+                yield from extend(node, n)
+
+
+####
+# Snob and sympathetic chains
+####
+
+class LetterSharingIndex(Lexicon):
+    """
+    Lexicon indexed by letter mask (see letter_mask()), to
+    build chains of words where successive words share no
+    letter (see check_snob()), or at least some letters (see
+    check_sympathetic()).
+
+    The masks that can follow a mask are found once, with a
+    popcount of the common letters, and kept: extending a
+    chain is a lookup of the masks that can follow the last
+    word. Words made of several words are not used.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+
+    Example
+    -------
+    >>> index = LetterSharingIndex(words)
+    >>> next(index.snob_chains(4, lipogram="E"))
+    """
+    def __init__(self, words: Iterable[str]):
+        super().__init__(words)
+        # Normalized letters of each word (None if several words)
+        self._letters = []
+        for word in self.words:
+            words = to_words(word, letters_only=True)
+            self._letters.append(words[0] if len(words) == 1 else None)
+        # Masks that can follow a mask, with True if all their
+        # words can follow it (None: check word by word), by
+        # (minimal number of common letters, None for snob, mask)
+        self._successors = {}
+
+    def _next_masks(self, min, mask: int) -> list[tuple]:
+        key = (min, mask)
+        if key not in self._successors:
+            successors = []
+            for other in self.masks:
+                common = mask & other
+                if min is None:
+                    if not common:
+                        successors.append((other, True))
+                    elif common == OTHER_CHAR_BIT:
+                        successors.append((other, None))
+                elif (common & ~OTHER_CHAR_BIT).bit_count() >= min:
+                    successors.append((other, True))
+                elif common:
+                    successors.append((other, None))
+            self._successors[key] = successors
+        return self._successors[key]
+
+    def _chains(self, n: int, min, start, constraints: dict) -> Iterator[list[str]]:
+        """
+        Yield the chains of 'n' words where successive words
+        share at least 'min' letters (no letter if None).
+        """
+        allowed = set(self._search(constraints)) if constraints else None
+        if min is None:
+            share = _share_no_letter
+        else:
+            share = partial(_share_letters, n=min)
+        used = set()
+        chain = []
+
+        def extend(letters: str, mask: int, k: int):
+            if not k:
+                yield [self.words[i] for i in chain]
+                return
+            for other, exact in self._next_masks(min, mask):
+                for i in self.masks[other]:
+                    other_letters = self._letters[i]
+                    if other_letters is None or i in used or (allowed is not None and i not in allowed):
+                        continue
+                    if not exact and not share(letters, other_letters, mask, other):
+                        continue
+                    used.add(i)
+                    chain.append(i)
+                    yield from extend(other_letters, other, k - 1)
+                    chain.pop()
+                    used.discard(i)
+
+        if n < 1:
+            return
+        if start is not None:
+            # Chains following a given word
+            letters = ''.join(to_words(start, letters_only=True)[-1:])
+            if start in self._indices:
+                used.add(self._indices[start])
+            for words in extend(letters, _letters_mask(letters), n - 1):
+                yield [start] + words
+            return
+        masks = self._word_masks
+        for i, letters in enumerate(self._letters):
+            if letters is None or (allowed is not None and i not in allowed):
+                continue
+            used.add(i)
+            chain.append(i)
+            yield from extend(letters, masks[i], n - 1)
+            chain.pop()
+            used.discard(i)
+
+    def snob_chains(self, n: int, start=None, **constraints) -> Iterator[list[str]]:
+        """
+        Yield the chains of 'n' words of the lexicon following
+        given constraints (see search()), where successive
+        words share no letter (see check_snob()), each word
+        being used at most once, lazily.
+
+        Parameters
+        ----------
+        n : int
+            Number of words of the chains.
+        start : str, optional
+            First word of the chains (counted in 'n'), which
+            may not be in the lexicon.
+        **constraints
+            Constraints of each word (e.g. lipogram="E").
+        """
+        return self._chains(n, None, start, constraints)
+
+    def sympathetic_chains(self, n: int, min=1, start=None, **constraints) -> Iterator[list[str]]:
+        """
+        Yield the chains of 'n' words of the lexicon following
+        given constraints, where successive words share at
+        least 'min' letters (see check_sympathetic()). See
+        snob_chains() for the other arguments.
+        """
+        return self._chains(n, min, start, constraints)
@@ -0,0 +1,248 @@
+"""
+This module contains solvers that compose texts from the
+words of a lexicon, following a constraint on the letters
+of each line (beaux présents, belles absentes).
+"""
+from itertools import product
+import string
+import time
+from typing import Iterable, Iterator
+
+from .lexicon import Lexicon
+from .utils import OTHER_CHAR_BIT, check_beaupresent, letter_mask, to_letters
+
+
+
+####
+# Utils
+####
+
+# Letters that a belle absente does not need to use
+_belleabsente_optional = 'KWXYZ'
+_all_letters_mask = letter_mask(string.ascii_uppercase)
+_belleabsente_mask = _all_letters_mask & ~letter_mask(_belleabsente_optional)
+
+def _bits(mask: int) -> list[int]:
+    """
+    Return the bits set in a mask, as masks.
+    """
+    bits = []
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+def _covers(universe: int, masks: Iterable[int], max_size: int, deadline=None) -> Iterator[list[int]]:
+    """
+    Yield the sets of masks whose union contains 'universe',
+    and where no mask is useless (each one has a letter of
+    the universe that the others lack), smallest sets first.
+
+    It is a backtracking search, as for an exact cover: the
+    letter with the fewest masks left is covered first, by
+    each of its masks in turn (largest first). A set is given
+    up when 'max_size' masks cannot cover the letters left,
+    and the search stops at 'deadline' (see time.perf_counter()).
+    """
+    masks = {m & universe for m in masks} - {0}
+    if not universe:
+        yield []
+        return
+    if not masks or (universe & ~_union(masks)):
+        return
+    # Masks covering each letter, largest first
+    by_letter = {
+        bit: sorted((m for m in masks if m & bit), key=lambda m: (-m.bit_count(), m))
+        for bit in _bits(universe)
+    }
+    largest = max(m.bit_count() for m in masks)
+
+    def search(left: int, chosen: list, banned: set, size: int):
+        if not left:
+            if len(chosen) == size and _is_irredundant(chosen):
+                yield list(chosen)
+            return
+        if len(chosen) == size or (size - len(chosen)) * largest < left.bit_count():
+            return
+        if deadline is not None and time.perf_counter() > deadline:
+            return
+        # Letter left with the fewest masks
+        candidates = None
+        for bit in _bits(left):
+            options = [m for m in by_letter[bit] if m not in banned]
+            if candidates is None or len(options) < len(candidates):
+                candidates = options
+                if not candidates:
+                    return
+        # A set is only built in the branch of its first mask:
+        # the masks of the previous branches are banned
+        tried = []
+        for m in candidates:
+            chosen.append(m)
+            yield from search(left & ~m, chosen, banned, size)
+            chosen.pop()
+            banned.add(m)
+            tried.append(m)
+        banned.difference_update(tried)
+
+    for size in range(1, max_size + 1):
+        yield from search(universe, [], set(), size)
+        if deadline is not None and time.perf_counter() > deadline:
+            return
+
+def _union(masks: Iterable[int]) -> int:
+    union = 0
+    for m in masks:
+        union |= m
+    return union
+
+def _is_irredundant(masks: list) -> bool:
+    """
+    Return True if each mask has a bit that the others lack.
+    """
+    for i, m in enumerate(masks):
+        if not m & ~_union(masks[:i] + masks[i+1:]):
+            return False
+    return True
+
+
+####
+# Composer
+####
+
+class Composer(Lexicon):
+    """
+    Lexicon used to compose lines of words that use given
+    letters: beaux présents (see check_beaupresent()) and
+    belles absentes (see check_belleabsente()).
+
+    Words are grouped by the letters they bring to a line,
+    and lines are found as covers of the letters to use by
+    these groups (see _covers()): the fewest words first,
+    and as a stream, so that a time budget gives the lines
+    found so far.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+
+    Example
+    -------
+    >>> composer = Composer(words)
+    >>> next(composer.beau_present_lines("Georges Perec"))
+    >>> composer.belle_absente("Perec", timeout=60)
+    """
+    def _groups(self, universe: int, forbidden: int, check=None) -> dict:
+        """
+        Return the words that do not use any letter of
+        'forbidden', by letters of 'universe' that they use.
+        Words using other characters must pass 'check'.
+        """
+        groups = {}
+        for mask, indices in self.masks.items():
+            if mask & forbidden:
+                continue
+            words = [self.words[i] for i in indices]
+            if check is not None and mask & OTHER_CHAR_BIT:
+                words = [word for word in words if check(word)]
+            if words:
+                groups.setdefault(mask & universe, []).extend(words)
+        return groups
+
+    def _lines(self, groups: dict, universe: int, max_words: int, timeout) -> Iterator[str]:
+        """
+        Yield the lines of at most 'max_words' words (taken
+        from the groups of _groups()) that use all the letters
+        of 'universe'.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for cover in _covers(universe, groups, max_words, deadline):
+            for line in product(*(groups[m] for m in cover)):
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+                yield ' '.join(line)
+
+    def beau_present_lines(self, ref: str, max_words=4, timeout=None) -> Iterator[str]:
+        """
+        Yield lines of words of the lexicon that only use the
+        letters of 'ref' (see check_beaupresent()), and use all
+        of them, the shortest (in number of words) first.
+
+        Parameters
+        ----------
+        ref : str
+            Word, or name, whose letters are the only ones
+            that can be used.
+        max_words : int, optional
+            Maximal number of words of a line. Defaults to 4.
+        timeout : float, optional
+            Time budget of the search, in seconds: lines are
+            yielded as they are found, until it is spent.
+            Defaults to no limit.
+        """
+        universe = letter_mask(ref) & ~OTHER_CHAR_BIT
+        forbidden = _all_letters_mask & ~universe
+        groups = self._groups(universe, forbidden, lambda word: check_beaupresent(word, ref))
+        return self._lines(groups, universe, max_words, timeout)
+
+    def belle_absente_lines(self, absent: str, max_words=6, timeout=None) -> Iterator[str]:
+        """
+        Yield lines of words of the lexicon that use each
+        letter of the alphabet (but K, W, X, Y and Z) except
+        the 'absent' one, which is never used, the shortest
+        first (see check_belleabsente()). See
+        beau_present_lines() for the other arguments.
+        """
+        absent = to_letters(absent)
+        if len(absent) != 1 or absent not in string.ascii_uppercase:
+            raise ValueError("'absent' argument must be a single letter.")
+        forbidden = letter_mask(absent)
+        universe = _belleabsente_mask & ~forbidden
+        return self._lines(self._groups(universe, forbidden), universe, max_words, timeout)
+
+    def iter_belle_absente(self, ref: str, max_words=6, timeout=None) -> Iterator[tuple[int, str]]:
+        """
+        Yield the (index, line) of candidate lines for each
+        line of a belle absente on 'ref': the i-th line lacks
+        the i-th letter of 'ref'. Lines are searched in turn,
+        one at a time, so that each line soon has candidates,
+        until they are all exhausted or the time budget spent.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        letters = to_letters(ref)
+        if not letters:
+            raise ValueError("'ref' argument must contain letters.")
+        # Lines of each absent letter, shared by repeated letters
+        searches = {
+            c: self.belle_absente_lines(c, max_words, timeout)
+            for c in dict.fromkeys(letters)
+        }
+        active = list(range(len(letters)))
+        while active:
+            for i in list(active):
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+                line = next(searches[letters[i]], None)
+                if line is None:
+                    active.remove(i)
+                else:
+                    yield i, line
+
+    def belle_absente(self, ref: str, max_words=6, timeout=None):
+        """
+        Return a belle absente on 'ref' (see check_belleabsente()),
+        with a line for each letter of 'ref', the first one found,
+        or None if a line cannot be found (in the time budget).
+        See beau_present_lines() for the other arguments.
+        """
+        lines = [None] * len(to_letters(ref))
+        missing = len(lines)
+        for i, line in self.iter_belle_absente(ref, max_words, timeout):
+            if lines[i] is None:
+                lines[i] = line
+                missing -= 1
+                if not missing:
+                    return '\n'.join(lines)
+        return None
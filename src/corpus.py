@@ -0,0 +1,207 @@
+"""
+This module contains functions to check constraints on a whole
+corpus of texts, spread over several processes.
+
+It can also be run as a script:
+
+    python -m src.corpus -c lipogram:forbidden=E -c pangram texts/*.txt
+"""
+import argparse
+import ast
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+from pathlib import Path
+from typing import Iterator
+
+from .utils import Constraint, _check_prepared, _parse_constraint, _prepare_constraints, normalize
+
+
+
+####
+# Workers
+####
+
+# Prepared constraints of current worker process (see
+# _prepare_constraints()), set once by _init_worker()
+_worker_constraints = None
+
+def _init_worker(constraints: list):
+    """
+    Prepare the constraints once in the worker process
+    (fused scans, compiled predicates), so that tasks only
+    carry the documents.
+    """
+    global _worker_constraints
+    _worker_constraints = _prepare_constraints(constraints)
+
+def _read(document, encoding: str) -> str:
+    """
+    Return the text of a document: paths are read,
+    texts are returned unchanged.
+    """
+    if isinstance(document, os.PathLike):
+        with open(document, encoding=encoding) as f:
+            return f.read()
+    return document
+
+def _check_batch(batch: list, encoding: str) -> list:
+    """
+    Check the constraints of current worker on a batch
+    of (index, document), return (index, results) pairs,
+    as given by check_all().
+    """
+    return [
+        (i, _check_prepared(normalize(_read(document, encoding)), *_worker_constraints))
+        for i, document in batch
+    ]
+
+def _batches(documents, batch_size: int) -> Iterator[list]:
+    """
+    Yield lists of (index, document), of given size.
+    """
+    batch = []
+    for item in enumerate(documents):
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+####
+# Corpus checker
+####
+
+def check_corpus(documents, constraints: list, workers=None, batch_size=64,
+                 ordered=True, encoding='utf-8') -> Iterator[tuple]:
+    """
+    Check several constraints on each document of a corpus,
+    with a pool of processes. Yield (index, results) pairs,
+    where 'results' is the list given by check_all() for the
+    document at 'index' in the corpus.
+
+    Parameters
+    ----------
+    documents : iterable
+        Texts (str), or paths to text files (os.PathLike,
+        e.g. pathlib.Path), read by the workers themselves.
+    constraints : list
+        Constraints to check (see check_all()), including
+        compiled and combined ones (see compile_constraint()).
+        They are sent once to each worker, not with every task.
+    workers : int, optional
+        Number of processes. Defaults to the number of CPUs.
+        With 1 worker, documents are checked in current process.
+    batch_size : int, optional
+        Number of documents sent to a worker in each task.
+    ordered : bool, optional
+        If True, results are yielded in the order of the corpus.
+        Otherwise, they are yielded as soon as they are ready.
+        Defaults to True.
+    encoding : str, optional
+        Encoding of text files. Defaults to UTF-8.
+    """
+    # Compiled constraints are sent as they are (they can be pickled)
+    constraints = [c if isinstance(c, Constraint) else _parse_constraint(c) for c in constraints]
+    batches = _batches(documents, batch_size)
+    if workers == 1:
+        _init_worker(constraints)
+        for batch in batches:
+            yield from _check_batch(batch, encoding)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    # Results received, not yielded yet, by index
+    ready = {}
+    next_index = 0
+
+    def flush() -> list:
+        """
+        Remove and return the results that can be yielded.
+        """
+        nonlocal next_index
+        if not ordered:
+            items = list(ready.items())
+            ready.clear()
+            return items
+        items = []
+        while next_index in ready:
+            items.append((next_index, ready.pop(next_index)))
+            next_index += 1
+        return items
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(constraints,),
+    ) as executor:
+        pending = set()
+        for batch in batches:
+            pending.add(executor.submit(_check_batch, batch, encoding))
+            # Keep a bounded number of pending tasks
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ready.update(future.result())
+                yield from flush()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ready.update(future.result())
+            yield from flush()
+
+
+####
+# Script
+####
+
+def parse_constraint(spec: str) -> tuple:
+    """
+    Return the (name, parameters) of a constraint written
+    as 'name' or 'name:key=value:key=value'. Values are read
+    as Python literals when possible ('3', '[5, 7]'...),
+    as strings otherwise.
+    """
+    name, *params = spec.split(':')
+    parsed_params = {}
+    for param in params:
+        key, value = param.split('=', 1)
+        try:
+            parsed_params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            parsed_params[key] = value
+    return _parse_constraint((name, parsed_params))
+
+def main(args=None):
+    """
+    Check constraints on text files, and print one line
+    per file: its path, then the result of each constraint.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check constraints on a corpus of text files.",
+    )
+    parser.add_argument('files', nargs='+', help="Text files to check.")
+    parser.add_argument(
+        '-c', '--constraint', action='append', required=True, type=parse_constraint,
+        help="Constraint, as 'name' or 'name:key=value:...' (e.g. 'lipogram:forbidden=E').",
+    )
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Number of processes.")
+    parser.add_argument('-b', '--batch-size', type=int, default=64, help="Files per task.")
+    parser.add_argument('--unordered', action='store_true', help="Print results as soon as ready.")
+    parser.add_argument('--encoding', default='utf-8', help="Encoding of the files.")
+    args = parser.parse_args(args)
+
+    results = check_corpus(
+        [Path(f) for f in args.files],
+        args.constraint,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        ordered=not args.unordered,
+        encoding=args.encoding,
+    )
+    for i, result in results:
+        print(args.files[i], *result, sep='\t')
+
+if __name__ == '__main__':
+    main()
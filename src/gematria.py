@@ -0,0 +1,227 @@
+"""
+This module contains an inverse gematria index: the words
+of a lexicon, by gematria value, for each mapping.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import combinations_with_replacement, product
+import json
+from typing import Iterable, Iterator
+
+from .lexicon import Lexicon
+from .utils import (
+    _gematria_table, _parse_constraint, check_all, constraint_checkers,
+    gematria_dict, to_letters,
+)
+
+
+
+####
+# Utils
+####
+
+# Constraints followed by a text if, and only if,
+# they are followed by each of its words
+_word_constraints = {
+    'beaupresent', 'lipogram', 'maxgram', 'mingram',
+    'prisoner', 'released_prisoner', 'turkish',
+}
+
+def _is_word_constraint(name: str, params: dict) -> bool:
+    """
+    Return True if a constraint can be checked word by word.
+    """
+    if name == 'tautogram':
+        return params.get('start_with') is not None
+    if name == 'ngram':
+        return params.get('n') is not None
+    return name in _word_constraints
+
+def _value_sums(values: list, target: int, n: int, start: int = 0) -> Iterator[list]:
+    """
+    Yield the lists of 'n' values, taken in order from the
+    sorted (non-negative) 'values[start:]', with repetition,
+    whose sum is 'target'.
+    """
+    if n == 1:
+        i = bisect_left(values, target, start)
+        if i < len(values) and values[i] == target:
+            yield [target]
+        return
+    if not values:
+        return
+    # Smaller values cannot reach the target, even with
+    # the greatest value for the other ones
+    start = max(start, bisect_left(values, target - (n - 1) * values[-1]))
+    for i in range(start, len(values)):
+        value = values[i]
+        # Next values are greater: stop when they cannot fit
+        if value * n > target:
+            break
+        for rest in _value_sums(values, target - value, n - 1, i):
+            yield [value, *rest]
+
+
+####
+# Gematria index
+####
+
+class GematriaIndex(Lexicon):
+    """
+    Lexicon indexed by gematria value, to find the words
+    of a given value (or range of values) without computing
+    the gematria of the whole lexicon for each query.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+    mappings : iterable of str, or dict, optional
+        Names of the mappings to index (see gematria_dict),
+        or dict of custom mappings by name.
+        Defaults to all the mappings of gematria_dict.
+    """
+    def __init__(self, words: Iterable[str], mappings=None):
+        super().__init__(words)
+        if mappings is None:
+            mappings = gematria_dict
+        if not isinstance(mappings, dict):
+            mappings = {name: name for name in mappings}
+        # Mappings, by name (as dicts, or names in gematria_dict)
+        self.mappings = dict(mappings)
+        # Indices of the words, by value, by mapping name
+        self.values = {}
+        letters = [to_letters(word) for word in self.words]
+        for name, mapping in self.mappings.items():
+            by_value = {}
+            for i, value in enumerate(_gematria_table(mapping).sums(letters)):
+                by_value.setdefault(value, []).append(i)
+            self.values[name] = by_value
+        self._sort_values()
+
+    def _sort_values(self):
+        """
+        Sort the values of each mapping, for range queries.
+        """
+        self._sorted_values = {name: sorted(by_value) for name, by_value in self.values.items()}
+
+    def _values(self, mapping: str) -> dict:
+        if mapping not in self.values:
+            raise ValueError(f"'mapping' argument must be in: {set(self.values.keys())}")
+        return self.values[mapping]
+
+    def find(self, value: int, mapping='french_rank') -> list[str]:
+        """
+        Return the words of given gematria value, following
+        given mapping, in lexicon order.
+        """
+        return [self.words[i] for i in self._values(mapping).get(value, [])]
+
+    def find_range(self, low: int, high: int, mapping='french_rank') -> list[str]:
+        """
+        Return the words whose gematria value is between 'low'
+        and 'high' (included), following given mapping, sorted
+        by value (then in lexicon order).
+        """
+        by_value = self._values(mapping)
+        values = self._sorted_values[mapping]
+        start, end = bisect_left(values, low), bisect_right(values, high)
+        return [self.words[i] for value in values[start:end] for i in by_value[value]]
+
+    def phrases(self, target: int, max_words=3, mapping='french_rank',
+                constraints=()) -> Iterator[tuple[str, ...]]:
+        """
+        Yield the sequences of at most 'max_words' words of
+        the lexicon whose total gematria value is 'target',
+        following given mapping (with non-negative values).
+        Each set of words is yielded once, shortest sequences
+        first; the search is lazy, and only keeps the current
+        sequence in memory.
+
+        Parameters
+        ----------
+        target : int
+            Gematria value of the phrases.
+        max_words : int, optional
+            Maximal number of words of a phrase. Defaults to 3.
+        mapping : str, optional
+            Name of an indexed mapping. Defaults to 'french_rank'.
+        constraints : list, optional
+            Constraints that the phrases (words joined by spaces)
+            must follow, as in check_all(). Constraints that hold
+            word by word (lipogram, tautogram with 'start_with'...)
+            first filter the lexicon.
+
+        Example
+        -------
+        >>> index = GematriaIndex(words)
+        >>> index.phrases(153, constraints=[('lipogram', {'forbidden': 'E'})])
+        """
+        constraints = [_parse_constraint(c) for c in constraints]
+        word_constraints = [c for c in constraints if _is_word_constraint(*c)]
+        by_value = {}
+        for value, indices in self._values(mapping).items():
+            words = [
+                self.words[i] for i in indices
+                if all(constraint_checkers[name](self.words[i], **params)
+                       for name, params in word_constraints)
+            ]
+            if words:
+                by_value[value] = words
+        values = sorted(by_value)
+        for n in range(1, max_words + 1):
+            for sums in _value_sums(values, target, n):
+                for words in self._expand(sums, by_value):
+                    if all(check_all(' '.join(words), constraints)):
+                        yield words
+
+    def _expand(self, values: list, by_value: dict) -> Iterator[tuple[str, ...]]:
+        """
+        Yield the sequences of words matching a list of
+        values (a value used k times gives each combination
+        of k of its words once).
+        """
+        groups = {}
+        for value in values:
+            groups[value] = groups.get(value, 0) + 1
+        choices = [
+            combinations_with_replacement(by_value[value], k)
+            for value, k in groups.items()
+        ]
+        for words in product(*choices):
+            yield tuple(w for group in words for w in group)
+
+    def save(self, path, encoding='utf-8'):
+        """
+        Save the index to a JSON file (see load()).
+        """
+        data = {
+            'words': self.words,
+            'mappings': self.mappings,
+            'values': {
+                name: [[value, indices] for value, indices in by_value.items()]
+                for name, by_value in self.values.items()
+            },
+        }
+        with open(path, 'w', encoding=encoding) as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, encoding='utf-8') -> 'GematriaIndex':
+        """
+        Load an index saved by save(), without computing
+        the gematria of its words again.
+        """
+        with open(path, encoding=encoding) as f:
+            data = json.load(f)
+        index = cls.__new__(cls)
+        Lexicon.__init__(index, data['words'])
+        index.mappings = data['mappings']
+        index.values = {
+            name: {value: indices for value, indices in items}
+            for name, items in data['values'].items()
+        }
+        index._sort_values()
+        return index
+
+    def __repr__(self) -> str:
+        return f"<GematriaIndex of {len(self.words)} words, {len(self.values)} mappings>"
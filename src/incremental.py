@@ -0,0 +1,259 @@
+"""
+This module contains checkers that follow the edits of a
+document (insertions, deletions, replacements), and update
+their answer in a time proportional to the edit.
+
+Letters are normalized character by character (see
+to_letters()), so the letters of a document are the sum of
+the letters of its parts: each edit only needs to count the
+letters of the inserted or deleted text.
+"""
+from collections import Counter
+import string
+
+from .utils import consonants_char, letter_counter, to_letters, vowels_char
+
+
+
+####
+# Incremental checkers
+####
+
+# Maximal length of the chunks of a document
+_chunk_size = 65536
+
+class IncrementalChecker:
+    """
+    Base class of the incremental checkers. It keeps the
+    document and the Counter of its letters; subclasses
+    follow the changes of the letters they care about in
+    a set of violations.
+
+    Parameters
+    ----------
+    text : str, optional
+        Initial document. Defaults to an empty document.
+
+    Notes
+    -----
+    Offsets are character offsets in the document. The
+    document is kept as a list of chunks (of at most
+    _chunk_size characters): an edit only rebuilds the
+    chunks it touches, and the whole text is only joined
+    when it is read (see text).
+    """
+    def __init__(self, text: str = ''):
+        self._chunks = []
+        self._length = 0
+        # Joined chunks, until the next edit
+        self._text = ''
+        self.counter = Counter()
+        self.violations = set()
+        self.insert(0, text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def text(self) -> str:
+        """
+        The document, as a string.
+        """
+        if self._text is None:
+            self._text = ''.join(self._chunks)
+        return self._text
+
+    def __bool__(self) -> bool:
+        return self.check()
+
+    def check(self) -> bool:
+        """
+        Return True if the document follows the constraint,
+        as the matching check_* function would.
+        """
+        return not self.violations
+
+    def insert(self, offset: int, s: str):
+        """
+        Insert text 's' at given offset.
+        """
+        self.replace(offset, 0, s)
+
+    def delete(self, offset: int, length: int):
+        """
+        Delete 'length' characters from given offset.
+        """
+        self.replace(offset, length, '')
+
+    def replace(self, offset: int, length: int, s: str):
+        """
+        Replace 'length' characters from given offset
+        by text 's'.
+        """
+        if not (0 <= offset and 0 <= length and offset + length <= self._length):
+            raise ValueError(
+                f"Invalid edit ({offset}, {length}) for a document "
+                f"of {self._length} characters."
+            )
+        removed = self._splice(offset, length, s)
+        self._length += len(s) - length
+        self._text = None
+        self._count(removed, -1)
+        self._count(s, 1)
+
+    def _splice(self, offset: int, length: int, s: str) -> str:
+        """
+        Replace the characters of the chunks as replace(),
+        and return the removed text.
+        """
+        chunks = self._chunks
+        # First chunk touched by the edit (or the end)
+        i, start = 0, 0
+        while i < len(chunks) and start + len(chunks[i]) <= offset:
+            start += len(chunks[i])
+            i += 1
+        # Chunks i to j (excluded) contain the removed text
+        j, end = i, start
+        while j < len(chunks) and (j == i or end < offset + length):
+            end += len(chunks[j])
+            j += 1
+        old = ''.join(chunks[i:j])
+        removed = old[offset-start:offset-start+length]
+        new = old[:offset-start] + s + old[offset-start+length:]
+        if len(new) < _chunk_size // 2 and j < len(chunks):
+            # Merge small chunks with the next one
+            new += chunks[j]
+            j += 1
+        # Split into chunks of the same length (rounded up)
+        count = -(-len(new) // _chunk_size)
+        size = -(-len(new) // count) if count else 1
+        chunks[i:j] = [new[k:k+size] for k in range(0, len(new), size)]
+        return removed
+
+    def _count(self, s: str, sign: int):
+        """
+        Add (sign=1) or remove (sign=-1) the letters of
+        given text from the counter.
+        """
+        for letter, n in Counter(to_letters(s)).items():
+            old = self.counter[letter]
+            new = old + sign * n
+            if new:
+                self.counter[letter] = new
+            else:
+                del self.counter[letter]
+            self.update(letter, old, new)
+
+    def update(self, letter: str, old: int, new: int):
+        """
+        Update violations, when the number of occurrences
+        of 'letter' in the document changes from 'old' to
+        'new'.
+        """
+        pass
+
+class IncrementalLipogram(IncrementalChecker):
+    """
+    Incremental version of check_lipogram(). Violations
+    are the forbidden letters used in the document.
+    """
+    def __init__(self, forbidden: str, text: str = ''):
+        self.forbidden = frozenset(to_letters(forbidden))
+        super().__init__(text)
+
+    def update(self, letter, old, new):
+        if letter in self.forbidden:
+            if new:
+                self.violations.add(letter)
+            else:
+                self.violations.discard(letter)
+
+class IncrementalMonovocalism(IncrementalChecker):
+    """
+    Incremental version of check_monovocalism(). Violations
+    are the vowels used in the document other than the target
+    vowel (or all of them, if several are used without target).
+    """
+    def __init__(self, vowel=None, text: str = ''):
+        if vowel:
+            vowel = vowel.upper()
+            if not (set(vowel) < set(vowels_char)):
+                raise ValueError(f"Please chose target voyel in {vowels_char}.")
+        self.vowel = vowel
+        # All the vowels used in the document
+        self.vowels = set()
+        super().__init__(text)
+
+    def check(self) -> bool:
+        if self.violations:
+            return False
+        return not self.vowel or self.vowel in self.vowels
+
+    def update(self, letter, old, new):
+        if letter not in vowels_char:
+            return
+        if new:
+            self.vowels.add(letter)
+        else:
+            self.vowels.discard(letter)
+        if self.vowel:
+            self.violations = self.vowels - {self.vowel}
+        elif len(self.vowels) > 1:
+            self.violations = set(self.vowels)
+        else:
+            self.violations = set()
+
+class IncrementalHeteroconsonantism(IncrementalChecker):
+    """
+    Incremental version of check_heteroconsonantism().
+    Violations are the consonants used several times.
+    """
+    def update(self, letter, old, new):
+        if letter in consonants_char:
+            if new > 1:
+                self.violations.add(letter)
+            else:
+                self.violations.discard(letter)
+
+class IncrementalAnagram(IncrementalChecker):
+    """
+    Incremental version of check_anagram(), against a
+    reference text. Violations are the letters whose
+    number of occurrences differs from the reference.
+    """
+    def __init__(self, ref: str, text: str = ''):
+        self.ref = letter_counter(ref)
+        super().__init__(text)
+        self.violations.update(
+            letter for letter, n in self.ref.items()
+            if self.counter[letter] != n
+        )
+
+    def update(self, letter, old, new):
+        if new != self.ref[letter]:
+            self.violations.add(letter)
+        else:
+            self.violations.discard(letter)
+
+class IncrementalPangram(IncrementalChecker):
+    """
+    Incremental version of check_pangram(). Violations
+    are the letters of the alphabet missing in the
+    document (or not used enough).
+    """
+    def __init__(self, alphabet=None, text: str = ''):
+        if alphabet is None:
+            # By default, latin alphabet
+            alphabet = string.ascii_uppercase
+        self.alphabet = letter_counter(alphabet)
+        super().__init__(text)
+        self.violations.update(
+            letter for letter, n in self.alphabet.items()
+            if self.counter[letter] < n
+        )
+
+    def update(self, letter, old, new):
+        if new < self.alphabet[letter]:
+            self.violations.add(letter)
+        else:
+            self.violations.discard(letter)
@@ -0,0 +1,440 @@
+"""
+This module contains a lexicon (word list) indexed for
+constraint queries: which words use only some letters,
+which words avoid others...
+"""
+from functools import cached_property
+import inspect
+import string
+import time
+from typing import Iterable, Iterator
+
+from .utils import (
+    OTHER_CHAR_BIT, _normalize_char, _prisoner_forbidden_char, _released_prisoner_char,
+    _turkish_forbidden_char, accents_char, check_beaupresent, check_lipogram,
+    constraint_checkers, letter_mask, ligatures_char, to_words, vowels_char,
+)
+
+
+
+####
+# Index filters
+####
+
+# Filters of the constraints that can be decided (at least
+# partly) from the letter mask, or from the word lengths, of
+# the words: they return True or False, or None if the words
+# must be checked one by one.
+
+_vowels_mask = letter_mask(vowels_char)
+
+def _prisoner_forbidden_letters(allow_accent=True) -> str:
+    """
+    Return the letters always forbidden by the prisoner's
+    constraint: those whose every known source character
+    (any case, accent or ligature) is forbidden, e.g. J,
+    but not Y ('ÿ' is allowed). Other letters depend on
+    case and accents.
+    """
+    forbidden_char = _prisoner_forbidden_char(allow_accent)
+    sources = string.ascii_letters + accents_char + ligatures_char
+    return ''.join(
+        letter for letter in string.ascii_uppercase
+        if all(c in forbidden_char for c in sources if letter in _normalize_char(c))
+    )
+
+def _avoiding_filter(forbidden: str):
+    forbidden = letter_mask(forbidden)
+
+    def test(mask: int):
+        common = mask & forbidden
+        if not common:
+            return True
+        if common == OTHER_CHAR_BIT:
+            return None
+        return False
+    return test
+
+def _using_only_filter(ref: str):
+    ref = letter_mask(ref)
+
+    def test(mask: int):
+        if mask & ~ref:
+            return False
+        return None if mask & OTHER_CHAR_BIT else True
+    return test
+
+def _prisoner_filter(allow_accent=True):
+    forbidden = letter_mask(_prisoner_forbidden_letters(allow_accent))
+    return lambda mask: False if mask & forbidden else None
+
+def _monovocalism_filter(vowel=None):
+    if vowel and not (len(vowel) == 1 and vowel.upper() in vowels_char):
+        # Left to the checker (bivocalism, wrong vowels)
+        return lambda mask: None
+    required = letter_mask(vowel) if vowel else 0
+
+    def test(mask: int):
+        vowels = mask & _vowels_mask
+        if vowels & (vowels - 1):
+            # Several vowels
+            return False
+        return not required or vowels == required
+    return test
+
+def _pangram_filter(alphabet=None):
+    if alphabet is None:
+        alphabet = string.ascii_uppercase
+    required = letter_mask(alphabet) & ~OTHER_CHAR_BIT
+    return lambda mask: None if mask & required == required else False
+
+def _ngram_filter(n=None):
+    def test(lengths):
+        if lengths is None:
+            return True
+        low, high = lengths
+        if n is None:
+            return low == high
+        if isinstance(n, int):
+            return low == high == n
+        if isinstance(n, list):
+            if low not in n or high not in n:
+                return False
+            return True if low == high else None
+        # Left to the checker (invalid argument)
+        return None
+    return test
+
+def _mingram_filter(m: int):
+    return lambda lengths: lengths is None or lengths[0] >= m
+
+def _maxgram_filter(m: int):
+    return lambda lengths: lengths is None or lengths[1] <= m
+
+# Filter on letter masks of each constraint, by name
+_mask_filters = {
+    'beaupresent': _using_only_filter,
+    'lipogram': _avoiding_filter,
+    'monovocalism': _monovocalism_filter,
+    'pangram': _pangram_filter,
+    'prisoner': _prisoner_filter,
+    'released_prisoner': lambda: _using_only_filter(_released_prisoner_char),
+    'turkish': lambda: _avoiding_filter(_turkish_forbidden_char),
+}
+
+# Filter on (shortest, longest) word lengths of each constraint, by name
+_length_filters = {
+    'maxgram': _maxgram_filter,
+    'mingram': _mingram_filter,
+    'ngram': _ngram_filter,
+}
+
+def _query_constraint(name: str, value) -> tuple:
+    """
+    Return the (name, parameters, expected result) of a
+    constraint given as a keyword argument of search().
+    """
+    if name not in constraint_checkers:
+        raise ValueError(f"Unknown constraint: {name!r}")
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[1], bool):
+        # (parameters, expected result)
+        if isinstance(value[0], bool):
+            raise ValueError(f"Please give the parameters of {name!r}, or use {name}={value[1]}.")
+        name, params, _ = _query_constraint(name, value[0])
+        return name, params, value[1]
+    parameters = list(inspect.signature(constraint_checkers[name]).parameters.values())[1:]
+    if isinstance(value, bool):
+        required = [p.name for p in parameters if p.default is inspect.Parameter.empty]
+        if required:
+            raise ValueError(
+                f"Constraint {name!r} needs parameters {required}, "
+                f"please use {name}=(parameters, {value})."
+            )
+        return name, {}, value
+    if isinstance(value, dict):
+        return name, value, True
+    # Other values are the first argument after the text
+    if not parameters:
+        raise ValueError(f"Constraint {name!r} has no parameter, please use {name}=True.")
+    return name, {parameters[0].name: value}, True
+
+def _follows(check, word: str, params: dict, expected: bool) -> bool:
+    """
+    Return True if the result of a checker on a word is the
+    expected one. Words the checker cannot decide (e.g. the
+    okapi of "22", which has no vowel nor consonant) follow
+    neither the constraint nor its negation.
+    """
+    try:
+        return check(word, **params) == expected
+    except RuntimeError:
+        return False
+
+def _sample_cost(check, params: dict, expected: bool, words: list) -> float:
+    """
+    Return the expected cost of a checker as a filter:
+    its average time per word, divided by the share of
+    words it rejects, measured on a sample of words.
+    """
+    rejected = 0
+    start = time.perf_counter()
+    for word in words:
+        try:
+            if check(word, **params) != expected:
+                rejected += 1
+        except Exception:
+            rejected += 1
+    seconds = (time.perf_counter() - start) / max(len(words), 1)
+    return seconds / max(rejected / max(len(words), 1), 1e-3)
+
+
+
+####
+# Lexicon
+####
+
+class Lexicon:
+    """
+    List of words, indexed by the set of letters they use
+    (see letter_mask()). Words sharing the same letters are
+    tested at once, so that a query only considers each set
+    of letters once.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+    """
+    def __init__(self, words: Iterable[str]):
+        # Index of each word in the list
+        self._indices = {}
+        for word in words:
+            self._indices.setdefault(word, len(self._indices))
+        self.words = list(self._indices)
+        # Index of the words, by letter mask
+        self.masks = {}
+        for i, word in enumerate(self.words):
+            self.masks.setdefault(letter_mask(word), []).append(i)
+
+    @classmethod
+    def from_file(cls, path, encoding='utf-8') -> 'Lexicon':
+        """
+        Build a lexicon from a text file, with one word
+        per line (blank lines are ignored).
+        """
+        with open(path, encoding=encoding) as f:
+            return cls(line.strip() for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._indices
+
+    def __repr__(self) -> str:
+        return f"<Lexicon of {len(self.words)} words>"
+
+    @cached_property
+    def _word_masks(self) -> list[int]:
+        """
+        Letter mask of each word.
+        """
+        masks = [0] * len(self.words)
+        for mask, indices in self.masks.items():
+            for i in indices:
+                masks[i] = mask
+        return masks
+
+    @cached_property
+    def lengths(self) -> dict:
+        """
+        Index of the words by (shortest, longest) length of
+        the words they contain (see check_ngram()), or None
+        for the words without letters.
+        """
+        lengths = {}
+        for i, word in enumerate(self.words):
+            words_lengths = [len(w) for w in to_words(word)]
+            key = (min(words_lengths), max(words_lengths)) if words_lengths else None
+            lengths.setdefault(key, []).append(i)
+        return lengths
+
+    @cached_property
+    def _word_lengths(self) -> list:
+        """
+        (Shortest, longest) word lengths of each word.
+        """
+        keys = [None] * len(self.words)
+        for key, indices in self.lengths.items():
+            for i in indices:
+                keys[i] = key
+        return keys
+
+    def _select(self, indices: list) -> list[str]:
+        """
+        Return the words at given indices, in lexicon order.
+        """
+        indices.sort()
+        return [self.words[i] for i in indices]
+
+    def using_only(self, letters: str) -> list[str]:
+        """
+        Return the words that only use given letters
+        (see check_beaupresent()).
+        """
+        ref = letter_mask(letters)
+        indices = []
+        for mask, words in self.masks.items():
+            if not mask & ~ref:
+                if mask & OTHER_CHAR_BIT:
+                    # Other characters must be checked one by one
+                    words = [i for i in words if check_beaupresent(self.words[i], letters)]
+                indices.extend(words)
+        return self._select(indices)
+
+    def avoiding(self, letters: str) -> list[str]:
+        """
+        Return the words that do not use any of given letters
+        (see check_lipogram()).
+        """
+        forbidden = letter_mask(letters)
+        indices = []
+        for mask, words in self.masks.items():
+            common = mask & forbidden
+            if not common:
+                indices.extend(words)
+            elif common == OTHER_CHAR_BIT:
+                # Other characters must be checked one by one
+                indices.extend(i for i in words if check_lipogram(self.words[i], letters))
+        return self._select(indices)
+
+    def containing(self, letters: str) -> list[str]:
+        """
+        Return the words that use all the given letters
+        (other characters than A-Z are ignored).
+        """
+        required = letter_mask(letters) & ~OTHER_CHAR_BIT
+        indices = []
+        for mask, words in self.masks.items():
+            if mask & required == required:
+                indices.extend(words)
+        return self._select(indices)
+
+    def _plan(self, constraints: dict, sample_size=64) -> tuple:
+        """
+        Return the plan of a search (see plan()), and the
+        candidate words left by the index filters, as a
+        sorted list of (index, constraints to check) tuples.
+        """
+        constraints = [_query_constraint(name, value) for name, value in constraints.items()]
+        # Filters on each index, with the number of words they keep
+        filters = []
+        checks = []
+        for name, params, expected in constraints:
+            for method, factories, attribute in (
+                    ('mask', _mask_filters, 'masks'),
+                    ('length', _length_filters, 'lengths')):
+                if name in factories:
+                    index = getattr(self, attribute)
+                    test = factories[name](**params)
+                    results = {key: test(key) for key in index}
+                    if not expected:
+                        results = {key: r if r is None else not r for key, r in results.items()}
+                    count = sum(len(index[key]) for key, r in results.items() if r is not False)
+                    filters.append((count, method, (name, params, expected), index, results))
+                    break
+            else:
+                checks.append((name, params, expected))
+        # Most selective filter first: it gives the candidates
+        filters.sort(key=lambda f: f[0])
+        if filters:
+            _, _, constraint, index, results = filters[0]
+            candidates = [
+                (i, [constraint] if r is None else [])
+                for key, r in results.items() if r is not False
+                for i in index[key]
+            ]
+            candidates.sort()
+        else:
+            candidates = [(i, []) for i in range(len(self.words))]
+        for _, method, constraint, _, results in filters[1:]:
+            keys = self._word_masks if method == 'mask' else self._word_lengths
+            kept = []
+            for i, maybe in candidates:
+                r = results[keys[i]]
+                if r is None:
+                    maybe.append(constraint)
+                if r is not False:
+                    kept.append((i, maybe))
+            candidates = kept
+        # Other constraints, cheapest and most selective first
+        if len(checks) > 1:
+            step = max(len(candidates) // sample_size, 1)
+            sample = [self.words[i] for i, _ in candidates[::step][:sample_size]]
+            checks.sort(key=lambda c: _sample_cost(constraint_checkers[c[0]], c[1], c[2], sample))
+        plan = [(*f[2], f[1]) for f in filters] + [(*c, 'check') for c in checks]
+        return plan, candidates
+
+    def plan(self, **constraints) -> list[tuple]:
+        """
+        Return the steps of a search with given constraints
+        (see search()), in order, as (name, parameters,
+        expected result, method) tuples, where method is:
+        - 'mask': the letter masks of the words are filtered,
+        - 'length': the word lengths are filtered,
+        - 'check': the checker is called on remaining words.
+        Index filters may still call the checker on a few
+        words ('2' is not a letter, for instance).
+        """
+        return self._plan(constraints)[0]
+
+    def search(self, **constraints) -> Iterator[str]:
+        """
+        Yield the words following all the given constraints,
+        lazily, in lexicon order.
+
+        Constraints are given as keyword arguments, by name
+        (see constraint_checkers), with as value:
+        - True (or False, for the words that do not follow it),
+        - the first parameter of the constraint (e.g. the
+          forbidden letters of a lipogram),
+        - a dict of parameters,
+        - or a (parameters, expected result) tuple, to negate
+          a constraint with parameters: lipogram=("E", False).
+
+        Words that a checker cannot decide (see check_okapi())
+        are skipped.
+
+        Constraints that can be decided from the letters used
+        by the words (lipogram, beaupresent, monovocalism...)
+        or from their lengths (ngram, mingram, maxgram) first
+        filter the indexes of the lexicon, most selective
+        first. Other checkers are then called on remaining
+        words only, cheapest and most selective first (as
+        measured on a sample of words).
+
+        Example
+        -------
+        >>> lexicon.search(lipogram="E", ngram=7, beaupresent="GEORGES PEREC", okapi=True)
+        """
+        for i in self._search(constraints):
+            yield self.words[i]
+
+    def _search(self, constraints: dict) -> Iterator[int]:
+        """
+        Yield the indices of the words found by search().
+        """
+        plan, candidates = self._plan(constraints)
+        checks = [
+            (constraint_checkers[name], params, expected)
+            for name, params, expected, method in plan if method == 'check'
+        ]
+        for i, maybe in candidates:
+            word = self.words[i]
+            if all(_follows(constraint_checkers[name], word, params, expected)
+                   for name, params, expected in maybe):
+                if all(_follows(check, word, params, expected) for check, params, expected in checks):
+                    yield i
@@ -0,0 +1,246 @@
+"""
+This module contains an opt-in instrumentation of the checkers
+(check_*), normalization (to_*) and gematria functions of
+src/utils.py: call counts, latencies, input sizes, and time
+spent in normalization versus constraint logic.
+
+    from src import profiling
+    profiling.enable()
+    ...
+    profiling.snapshot()
+    profiling.write_prometheus('/var/lib/node_exporter/oulipy.prom')
+
+Instrumentation replaces the functions of src/utils.py by
+wrappers (also in constraint_checkers, used by check_all()),
+and restores them when disabled: there is no overhead at all
+when it is not enabled.
+
+Notes
+-----
+Names imported from src.utils before enable() (e.g. 'from
+src.utils import check_lipogram') still refer to the original
+functions, and are not instrumented.
+"""
+from bisect import bisect_left
+from functools import wraps
+import os
+import threading
+import time
+
+from . import utils
+
+
+
+####
+# Statistics
+####
+
+# Upper bounds of the latency histogram buckets, in seconds
+buckets = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0,)
+
+class _Stats:
+    """
+    Statistics of the calls of a function.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.
+        self.normalization_seconds = 0.
+        self.input_chars = 0
+        self.max_input_chars = 0
+        # Number of calls in each bucket (the last one is +Inf)
+        self.histogram = [0] * (len(buckets) + 1)
+
+    def add(self, seconds: float, normalization_seconds: float, size: int):
+        self.calls += 1
+        self.seconds += seconds
+        self.normalization_seconds += normalization_seconds
+        self.input_chars += size
+        self.max_input_chars = max(self.max_input_chars, size)
+        self.histogram[bisect_left(buckets, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Return the q-th quantile (0 <= q <= 1) of the latency,
+        as the upper bound of its histogram bucket (None if
+        there is no call, inf beyond the last bucket).
+        """
+        if not self.calls:
+            return None
+        count = 0
+        for bound, n in zip(buckets + (float('inf'),), self.histogram):
+            count += n
+            if count >= q * self.calls:
+                return bound
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'normalization_seconds': self.normalization_seconds,
+            'logic_seconds': self.seconds - self.normalization_seconds,
+            'input_chars': self.input_chars,
+            'max_input_chars': self.max_input_chars,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'histogram': list(self.histogram),
+        }
+
+# Statistics of each function, by name
+_stats = {}
+_lock = threading.Lock()
+# Stack of the instrumented calls of each thread
+_local = threading.local()
+# Original functions replaced by enable(), by name
+_originals = {}
+
+
+####
+# Instrumentation
+####
+
+def _is_instrumented(name: str) -> bool:
+    return name.startswith(('check_', 'to_', 'gematria'))
+
+def _input_size(args: tuple, kwargs: dict) -> int:
+    """
+    Return the size of the text given to a function.
+    """
+    s = args[0] if args else kwargs.get('s', '')
+    if isinstance(s, (str, utils.NormalizedText)):
+        return len(s)
+    return 0
+
+def _wrap(name: str, function):
+    """
+    Return the instrumented version of a function.
+    """
+    is_normalization = name.startswith('to_')
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        # [is normalization, time spent in nested normalization]
+        frame = [is_normalization, 0.]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            normalization_seconds = seconds if is_normalization else frame[1]
+            # Report normalization time to the calling checker
+            if stack and not stack[-1][0]:
+                stack[-1][1] += normalization_seconds
+            size = _input_size(args, kwargs)
+            with _lock:
+                if name not in _stats:
+                    _stats[name] = _Stats()
+                _stats[name].add(seconds, normalization_seconds, size)
+
+    return wrapper
+
+def _update_checkers():
+    """
+    Make constraint_checkers use current functions of utils.
+    """
+    for name in utils.constraint_checkers:
+        utils.constraint_checkers[name] = getattr(utils, 'check_' + name)
+
+def enable():
+    """
+    Start recording the calls of the functions of src/utils.py.
+    """
+    if _originals:
+        return
+    for name, function in list(vars(utils).items()):
+        if _is_instrumented(name) and callable(function) and not isinstance(function, type):
+            _originals[name] = function
+            setattr(utils, name, _wrap(name, function))
+    _update_checkers()
+
+def disable():
+    """
+    Stop recording, and restore the original functions.
+    Recorded statistics are kept (see reset()).
+    """
+    for name, function in _originals.items():
+        setattr(utils, name, function)
+    _originals.clear()
+    _update_checkers()
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+def reset():
+    """
+    Forget recorded statistics.
+    """
+    with _lock:
+        _stats.clear()
+
+
+####
+# Output
+####
+
+def snapshot() -> dict:
+    """
+    Return the statistics of each called function, by name:
+    - 'calls': number of calls,
+    - 'seconds': cumulative time,
+    - 'normalization_seconds': time spent in normalization
+      (in to_* functions),
+    - 'logic_seconds': remaining time (constraint logic),
+    - 'input_chars', 'max_input_chars': total and maximal
+      size of the input texts,
+    - 'p50', 'p90', 'p99': latency percentiles, in seconds
+      (upper bounds of histogram buckets),
+    - 'histogram': number of calls in each latency bucket
+      (see 'buckets'), then beyond the last one.
+    """
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(_stats.items())}
+
+def to_prometheus(prefix='oulipy') -> str:
+    """
+    Return the statistics in Prometheus text format.
+    """
+    data = snapshot()
+    lines = []
+
+    def metric(name: str, kind: str, help: str, key: str):
+        lines.append(f"# HELP {prefix}_{name} {help}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for function, stats in data.items():
+            lines.append(f'{prefix}_{name}{{function="{function}"}} {stats[key]}')
+
+    metric('calls_total', 'counter', "Number of calls.", 'calls')
+    metric('normalization_seconds_total', 'counter', "Time spent in normalization.", 'normalization_seconds')
+    metric('logic_seconds_total', 'counter', "Time spent in constraint logic.", 'logic_seconds')
+    metric('input_characters_total', 'counter', "Size of the input texts.", 'input_chars')
+    lines.append(f"# HELP {prefix}_call_seconds Latency of the calls.")
+    lines.append(f"# TYPE {prefix}_call_seconds histogram")
+    for function, stats in data.items():
+        count = 0
+        for bound, n in zip(buckets + ('+Inf',), stats['histogram']):
+            count += n
+            lines.append(f'{prefix}_call_seconds_bucket{{function="{function}",le="{bound}"}} {count}')
+        lines.append(f'{prefix}_call_seconds_sum{{function="{function}"}} {stats["seconds"]}')
+        lines.append(f'{prefix}_call_seconds_count{{function="{function}"}} {stats["calls"]}')
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus(path, prefix='oulipy'):
+    """
+    Write the statistics in Prometheus text format to a file
+    (e.g. for the textfile collector of node_exporter). The
+    file is replaced atomically.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(to_prometheus(prefix))
+    os.replace(tmp_path, path)
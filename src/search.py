@@ -0,0 +1,318 @@
+"""
+This module contains functions to search passages of a text
+that follow a constraint (palindroms, heterograms, pangrams...),
+reported as spans of the original text.
+"""
+from array import array
+from bisect import bisect_left
+import string
+from typing import Iterator
+
+from .utils import (
+    Span, _anagram_windows, letter_count, letter_offsets, source_span, to_letters,
+)
+
+
+
+####
+# Utils
+####
+
+def _starts_char(offsets, i: int) -> bool:
+    """
+    Return True if the i-th letter is the first one given
+    by its source character (or the end of the letters):
+    a range of letters starting or ending there does not
+    cut a ligature.
+    """
+    return i <= 0 or i >= len(offsets) or offsets[i-1] != offsets[i]
+
+
+####
+# Palindroms
+####
+
+def _manacher(letters: str) -> tuple:
+    """
+    Return the (odd, even) radii of the longest palindroms
+    centered on each letter, with Manacher's algorithm:
+    - odd[i] = k: letters[i-k+1:i+k] is a palindrom,
+    - even[i] = k: letters[i-k:i+k] is a palindrom,
+    and they cannot be extended. Runs in O(n).
+    """
+    n = len(letters)
+    odd = array('q', bytes(8 * n))
+    even = array('q', bytes(8 * n))
+    # Rightmost palindrom found so far: letters[left:right+1]
+    left, right = 0, -1
+    for i in range(n):
+        if i > right:
+            k = 1
+        else:
+            k = odd[left + right - i]
+            if k > right - i + 1:
+                k = right - i + 1
+        while i - k >= 0 and i + k < n and letters[i-k] == letters[i+k]:
+            k += 1
+        odd[i] = k
+        if i + k - 1 > right:
+            left, right = i - k + 1, i + k - 1
+    left, right = 0, -1
+    for i in range(n):
+        if i > right:
+            k = 0
+        else:
+            k = even[left + right - i + 1]
+            if k > right - i + 1:
+                k = right - i + 1
+        while i - k - 1 >= 0 and i + k < n and letters[i-k-1] == letters[i+k]:
+            k += 1
+        even[i] = k
+        if i + k - 1 > right:
+            left, right = i - k, i + k - 1
+    return odd, even
+
+def _iter_palindroms(letters: str, min_length: int, offsets=None) -> Iterator[tuple]:
+    """
+    Yield the (start, end) letter ranges of the longest
+    palindrom centered on each letter, and between each
+    pair of letters, of at least 'min_length' letters.
+
+    If the 'offsets' of the letters are given, ranges that
+    cut a ligature are shrunk (on both ends, to remain
+    palindroms) until they do not.
+    """
+    odd, even = _manacher(letters)
+    for i in range(len(letters)):
+        for start, end in ((i - even[i], i + even[i]), (i - odd[i] + 1, i + odd[i])):
+            if offsets is not None:
+                while start < end and not (_starts_char(offsets, start) and _starts_char(offsets, end)):
+                    start += 1
+                    end -= 1
+            if end - start >= min_length and end > start:
+                yield start, end
+
+def longest_palindrom(s: str):
+    """
+    Return the Span of the longest palindromic passage of
+    given text (the first one, if several have the same
+    length), or None if there is none.
+
+    As in check_palindrom(), punctuation, spaces, accents
+    and cases are ignored; the span starts and ends on a
+    letter of the original text. A palindrom cannot cut a
+    ligature: "œ" gives "OE", which is not a palindrom, so
+    a text made only of ligatures may have no palindromic
+    passage at all.
+
+    Example
+    -------
+    >>> s = "Il dit : « Ésope reste ici et se repose. »"
+    >>> span = longest_palindrom(s)
+    >>> s[span.start:span.end]
+    'Ésope reste ici et se repose'
+    """
+    offsets = letter_offsets(s)
+    best = max(_iter_palindroms(to_letters(s), 1, offsets), key=lambda r: r[1] - r[0], default=None)
+    if best is None:
+        return None
+    return source_span(offsets, *best)
+
+def find_palindroms(s: str, min_length: int = 2) -> list[Span]:
+    """
+    Return the Spans of the palindromic passages of given
+    text, of at least 'min_length' letters, sorted by start.
+
+    Only the longest palindrom around each center is given
+    (a letter, or the gap between two letters): "ÉSOPE RESTE
+    ICI ET SE REPOSE" also contains "ICI", with the same
+    center, which is not reported.
+
+    Parameters
+    ----------
+    s : str or NormalizedText
+        Source text.
+    min_length : int, optional
+        Minimal number of letters of a palindrom.
+        Defaults to 2.
+    """
+    letters = to_letters(s)
+    offsets = letter_offsets(s)
+    spans = [
+        source_span(offsets, start, end)
+        for start, end in _iter_palindroms(letters, max(min_length, 1), offsets)
+    ]
+    # Shrunk ranges may give the same span
+    return sorted(dict.fromkeys(spans))
+
+
+####
+# Heterograms
+####
+
+def _heterogram_ref(ref: str) -> str:
+    ref = to_letters(ref)
+    if not ref:
+        raise ValueError("'ref' argument must contain letters.")
+    return ref
+
+def find_anagram_windows(s: str, ref: str = 'ULCERATIONS') -> list[Span]:
+    """
+    Return the Spans of all the passages of given text
+    whose letters are an anagram of 'ref': the offsets
+    where a heterogram on 'ref' could start. Windows
+    slide letter by letter, and may overlap.
+
+    For "Ulcérations" on another tone (see
+    check_ulcerations()), use ref='ULERATIONS' + tone.
+    """
+    ref = _heterogram_ref(ref)
+    offsets = letter_offsets(s)
+    n = len(ref)
+    # Windows cutting a ligature are skipped
+    return [
+        source_span(offsets, i, i + n)
+        for i, is_anagram in enumerate(_anagram_windows(to_letters(s), ref))
+        if is_anagram and _starts_char(offsets, i) and _starts_char(offsets, i + n)
+    ]
+
+def find_heterogram_runs(s: str, ref: str = 'ULCERATIONS', min_chunks: int = 1) -> list[Span]:
+    """
+    Return the Spans of the longest passages of given text
+    made of successive anagrams of 'ref' (at least
+    'min_chunks' of them), whatever their alignment with
+    the beginning of the text, sorted by start. A text
+    is a heterogram if it is a single run.
+    """
+    ref = _heterogram_ref(ref)
+    n = len(ref)
+    letters = to_letters(s)
+    windows = list(_anagram_windows(letters, ref))
+    offsets = letter_offsets(s)
+    spans = []
+    for start, is_anagram in enumerate(windows):
+        # Runs start on an anagram not preceded by another one
+        if not is_anagram or (start >= n and windows[start-n]):
+            continue
+        end = start
+        while end < len(windows) and windows[end]:
+            end += n
+        # Drop the chunks at both ends while they cut a ligature
+        while start < end and not _starts_char(offsets, start):
+            start += n
+        while start < end and not _starts_char(offsets, end):
+            end -= n
+        if start < end and (end - start) // n >= min_chunks:
+            spans.append(source_span(offsets, start, end))
+    return spans
+
+def longest_heterogram_prefix(s: str, ref: str = 'ULCERATIONS'):
+    """
+    Return the Span of the longest beginning of given text
+    that is a heterogram on 'ref' (see check_heterogram()),
+    or None if the first letters are not an anagram of 'ref'.
+    The rest of the text, from the end of the span, is where
+    the heterogram breaks.
+    """
+    ref = _heterogram_ref(ref)
+    n = len(ref)
+    letters = to_letters(s)
+    end = 0
+    for offset, is_anagram in enumerate(_anagram_windows(letters, ref)):
+        if offset == end:
+            if not is_anagram:
+                break
+            end += n
+    offsets = letter_offsets(s)
+    # The prefix must not end inside a ligature
+    while end and not _starts_char(offsets, end):
+        end -= n
+    if not end:
+        return None
+    return source_span(offsets, 0, end)
+
+
+####
+# Pangrams
+####
+
+def _pangram_windows(letters: str, alphabet=None) -> Iterator[tuple]:
+    """
+    Yield the (start, end) letter range of the shortest
+    window ending at each letter that contains the whole
+    alphabet (as check_pangram()), with two pointers.
+    """
+    if alphabet is None:
+        # By default, latin alphabet
+        alphabet = string.ascii_uppercase
+    need = dict(letter_count(alphabet).items())
+    if not need:
+        raise ValueError("'alphabet' argument must contain letters.")
+    window = dict.fromkeys(need, 0)
+    # Number of letters of the alphabet not used enough in the window
+    missing = len(need)
+    start = 0
+    for end, c in enumerate(letters):
+        if c in window:
+            window[c] += 1
+            if window[c] == need[c]:
+                missing -= 1
+        if missing:
+            continue
+        # Move the start forward while the window stays a pangram
+        while True:
+            c = letters[start]
+            if c in window:
+                if window[c] == need[c]:
+                    break
+                window[c] -= 1
+            start += 1
+        yield start, end + 1
+
+def shortest_pangram(s: str, alphabet=None):
+    """
+    Return the Span of the shortest passage of given text
+    that contains all the letters of the alphabet (the first
+    one, if several have the same length), or None if the
+    whole text is not a pangram. Runs in linear time.
+
+    Parameters
+    ----------
+    s : str or NormalizedText
+        Source text.
+    alphabet : str, optional
+        Letters to find, as in check_pangram() (a letter
+        given twice must be found twice). Defaults to the
+        latin alphabet.
+    """
+    letters = to_letters(s)
+    best = min(_pangram_windows(letters, alphabet), key=lambda r: r[1] - r[0], default=None)
+    if best is None:
+        return None
+    return source_span(letter_offsets(s), *best)
+
+def find_pangram_windows(s: str, k: int = 1, alphabet=None) -> list[Span]:
+    """
+    Return the Spans of the 'k' shortest passages of given
+    text that contain all the letters of the alphabet, and
+    do not overlap, sorted by length (then by start). They
+    are chosen greedily, shortest first.
+
+    See shortest_pangram() for the description of arguments.
+    """
+    letters = to_letters(s)
+    windows = sorted(_pangram_windows(letters, alphabet), key=lambda r: (r[1] - r[0], r[0]))
+    # Chosen windows, sorted by start
+    chosen = []
+    for start, end in windows:
+        if len(chosen) == k:
+            break
+        i = bisect_left(chosen, (start, end))
+        if i > 0 and chosen[i-1][1] > start:
+            continue
+        if i < len(chosen) and chosen[i][0] < end:
+            continue
+        chosen.insert(i, (start, end))
+    offsets = letter_offsets(s)
+    chosen.sort(key=lambda r: (r[1] - r[0], r[0]))
+    return [source_span(offsets, start, end) for start, end in chosen]
@@ -0,0 +1,188 @@
+"""
+This module contains functions to check properties in texts
+given as streams (file objects, or iterables of chunks), with
+bounded memory.
+"""
+from collections import Counter
+import codecs
+from typing import Iterator
+
+from .utils import (
+    _build_scans, _feed_scans, _parse_constraint, _scan_block_size,
+    _words_table, to_letters, to_words,
+)
+
+
+
+####
+# Readers
+####
+
+# Number of characters (or bytes) read at once from file objects
+default_chunk_size = 1 << 16
+
+def iter_chunks(source, chunk_size=default_chunk_size, encoding='utf-8') -> Iterator[str]:
+    """
+    Yield successive chunks of text from given source.
+
+    Parameters
+    ----------
+    source : str, bytes, file object or iterable
+        A whole text, a file object opened in text or binary
+        mode, or an iterable of chunks (str or bytes).
+    chunk_size : int, optional
+        Size of the chunks read from file objects, or cut
+        from a whole text.
+    encoding : str, optional
+        Encoding of bytes chunks. A character split between
+        two chunks is decoded correctly. Defaults to UTF-8.
+    """
+    if isinstance(source, (str, bytes)):
+        chunks = (
+            source[i:i+chunk_size]
+            for i in range(0, len(source), chunk_size)
+        )
+    elif hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+
+    decoder = None
+    for c in chunks:
+        if isinstance(c, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            c = decoder.decode(c)
+        if c:
+            yield c
+    if decoder is not None:
+        # Raise an error if the stream ends with an incomplete character
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+def _iter_whole_words(source, **kwargs) -> Iterator[str]:
+    """
+    Yield successive pieces of text from given source, cut
+    between words: a word split between two chunks is only
+    yielded once complete.
+    """
+    pending = ''
+    for c in iter_chunks(source, **kwargs):
+        # Keep the last (possibly incomplete) word for next chunk
+        end = c.translate(_words_table).rfind(' ')
+        if end < 0:
+            pending += c
+            continue
+        yield pending + c[:end+1]
+        pending = c[end+1:]
+    if pending:
+        yield pending
+
+def iter_words(source, letters_only=False, **kwargs) -> Iterator[list[str]]:
+    """
+    Yield successive lists of words from given source,
+    as to_words() would find them in the whole text.
+
+    See iter_chunks() for the description of the source
+    and keyword arguments.
+    """
+    for text in _iter_whole_words(source, **kwargs):
+        words = to_words(text, letters_only=letters_only)
+        if words:
+            yield words
+
+def _iter_word_blocks(source, raw_words: bool, **kwargs) -> Iterator[tuple]:
+    """
+    Yield successive blocks of (raw words, normalized words)
+    from given source. If 'raw_words' is False, normalized
+    words are given twice.
+    """
+    for text in _iter_whole_words(source, **kwargs):
+        letters = to_words(text, letters_only=True)
+        words = to_words(text) if raw_words else letters
+        for start in range(0, len(words), _scan_block_size):
+            end = start + _scan_block_size
+            yield words[start:end], letters[start:end]
+
+
+####
+# Constraint checker
+####
+
+def check_all_stream(source, constraints: list, **kwargs) -> list[bool]:
+    """
+    Check several constraints on a text given as a stream,
+    in a single pass, as check_all() would on the whole text.
+    Reading stops as soon as all the constraints are violated.
+
+    Only the constraints that can be checked word by word are
+    supported (not those on lines, nor palindroms...).
+
+    Parameters
+    ----------
+    source : str, bytes, file object or iterable
+        Source text (see iter_chunks()).
+    constraints : list
+        Constraints to check (see check_all()).
+    """
+    constraints = [_parse_constraint(c) for c in constraints]
+    results = [None] * len(constraints)
+    scans = _build_scans(constraints)
+    for i, (name, params) in enumerate(constraints):
+        if i not in scans:
+            raise ValueError(f"Constraint {name!r} cannot be checked on a stream.")
+
+    if scans:
+        raw_words = any(scan.raw_words for scan in scans.values())
+        for words, letters in _iter_word_blocks(source, raw_words, **kwargs):
+            _feed_scans(scans, results, words, letters)
+            if not scans:
+                break
+        for i, scan in scans.items():
+            results[i] = scan.result()
+    return results
+
+def check_lipogram_stream(source, forbidden: str, **kwargs) -> bool:
+    """
+    Streaming version of check_lipogram().
+    """
+    return check_all_stream(source, [('lipogram', {'forbidden': forbidden})], **kwargs)[0]
+
+def check_pangram_stream(source, alphabet=None, **kwargs) -> bool:
+    """
+    Streaming version of check_pangram().
+    """
+    return check_all_stream(source, [('pangram', {'alphabet': alphabet})], **kwargs)[0]
+
+def check_okapi_stream(source, **kwargs) -> bool:
+    """
+    Streaming version of check_okapi().
+    """
+    return check_all_stream(source, ['okapi'], **kwargs)[0]
+
+def check_kyrielle_stream(source, **kwargs) -> bool:
+    """
+    Streaming version of check_kyrielle().
+    """
+    return check_all_stream(source, ['kyrielle'], **kwargs)[0]
+
+def check_tautogram_stream(source, start_with=None, **kwargs) -> bool:
+    """
+    Streaming version of check_tautogram().
+    """
+    return check_all_stream(source, [('tautogram', {'start_with': start_with})], **kwargs)[0]
+
+
+####
+# Operations, statistics
+####
+
+def letter_counter_stream(source, **kwargs) -> Counter:
+    """
+    Streaming version of letter_counter().
+    """
+    counter = Counter()
+    for c in iter_chunks(source, **kwargs):
+        counter.update(to_letters(c))
+    return counter
@@ -0,0 +1,288 @@
+"""
+This module contains a lexicon stored as a letter trie, in
+flat arrays, to enumerate the words following per-letter
+constraints (lipogram, okapi, prisoner...) with a single
+walk that prunes every branch as soon as it breaks them.
+"""
+from array import array
+from collections import namedtuple
+from typing import Iterable, Iterator
+
+from .lexicon import Lexicon, _prisoner_forbidden_letters
+from .utils import (
+    _parse_constraint, _released_prisoner_char,
+    _turkish_forbidden_char, constraint_checkers, consonants_char, to_letters,
+    vowels_char,
+)
+
+
+####
+# Letter automata
+####
+
+# A constraint checked letter by letter, along a branch:
+# - allowed: set of the allowed letters (None: all of them),
+# - forbidden: set of the forbidden letters,
+# - step(state, letter): next state, or None if the branch
+#   breaks the constraint (None: no state),
+# - initial: state at the root,
+# - accept(state): True if a word ending in this state
+#   follows the constraint (None: always),
+# - exact: False if the words found must still be checked
+#   by the checker (some characters are not letters).
+_Automaton = namedtuple('_Automaton', ['allowed', 'forbidden', 'step', 'initial', 'accept', 'exact'])
+
+def _letter_filter(allowed=None, forbidden='', exact=True) -> _Automaton:
+    return _Automaton(allowed, frozenset(forbidden), None, None, None, exact)
+
+def _okapi_step(state: int, c: str):
+    # States: 0 at the root, 1 after a vowel, 2 after a consonant
+    if c in vowels_char:
+        return None if state == 1 else 1
+    if c in consonants_char:
+        return None if state == 2 else 2
+    # Other characters (digits...) are not matched, even as first
+    # letter (which check_okapi() does not check)
+    return None
+
+def _monovocalism_step(state: str, c: str):
+    # State: the vowel used so far ('' if none)
+    if c not in vowels_char:
+        return state
+    if state and c != state:
+        return None
+    return c
+
+def _lipogram_automaton(forbidden: str) -> _Automaton:
+    return _letter_filter(forbidden=to_letters(forbidden))
+
+def _beaupresent_automaton(ref: str) -> _Automaton:
+    return _letter_filter(allowed=frozenset(to_letters(ref)))
+
+def _prisoner_automaton(allow_accent=True) -> _Automaton:
+    # Other letters are checked on the words found
+    return _letter_filter(forbidden=_prisoner_forbidden_letters(allow_accent), exact=False)
+
+def _monovocalism_automaton(vowel=None) -> _Automaton:
+    if vowel:
+        vowel = vowel.upper()
+        if not (set(vowel) < set(vowels_char)):
+            raise ValueError(f"Please chose target voyel in {vowels_char}.")
+        accept = vowel.__eq__
+    else:
+        accept = None
+    return _Automaton(None, frozenset(), _monovocalism_step, '', accept, True)
+
+# Letter automaton of each constraint, by name
+_letter_automata = {
+    'beaupresent': _beaupresent_automaton,
+    'lipogram': _lipogram_automaton,
+    'monovocalism': _monovocalism_automaton,
+    'okapi': lambda: _Automaton(None, frozenset(), _okapi_step, 0, None, True),
+    'prisoner': _prisoner_automaton,
+    'released_prisoner': lambda: _beaupresent_automaton(_released_prisoner_char),
+    'turkish': lambda: _lipogram_automaton(_turkish_forbidden_char),
+}
+
+def _combine_steps(steps: list):
+    """
+    Return the step function of the product of automata.
+    """
+    def step(states: tuple, c: str):
+        new_states = []
+        for step, state in zip(steps, states):
+            state = step(state, c)
+            if state is None:
+                return None
+            new_states.append(state)
+        return tuple(new_states)
+    return step
+
+def _combine_accepts(accepts: list):
+    def accept(states: tuple) -> bool:
+        return all(accept is None or accept(state) for accept, state in zip(accepts, states))
+    return accept
+
+
+####
+# Letter trie
+####
+
+class LetterTrie(Lexicon):
+    """
+    Lexicon stored as a trie of the letters of its words
+    (see to_letters()): words sharing a beginning share
+    a branch, so a walk that stops at the first letter
+    breaking a constraint skips all the words below it.
+
+    Nodes are numbered in depth-first order, and stored in
+    flat arrays: for node i, the letter leading to it, its
+    first child, its next sibling (-1 if none), and the
+    words ending there.
+
+    Parameters
+    ----------
+    words : iterable of str
+        Words of the lexicon (duplicates are ignored).
+
+    Example
+    -------
+    >>> trie = LetterTrie(words)
+    >>> trie.matching('okapi', ('lipogram', {'forbidden': 'E'}))
+    """
+    def __init__(self, words: Iterable[str]):
+        super().__init__(words)
+        keys = {}
+        for i, word in enumerate(self.words):
+            keys.setdefault(to_letters(word), []).append(i)
+        sorted_keys = sorted(keys)
+        # Words of each key (in sorted order): key_words[key_first[k]:key_first[k+1]]
+        self._key_first = array('l', [0])
+        self._key_words = array('l')
+        for key in sorted_keys:
+            self._key_words.extend(keys[key])
+            self._key_first.append(len(self._key_words))
+        del keys
+        self._build(sorted_keys)
+
+    def _build(self, keys: list):
+        """
+        Build the arrays of the trie from sorted keys, in a
+        single pass: each key only adds the nodes of its
+        letters after the prefix shared with the previous key.
+        """
+        # Letter leading to each node (a space for the root)
+        labels = [' ']
+        self._first_child = first_child = array('l', [-1])
+        self._next_sibling = next_sibling = array('l', [-1])
+        # Index of the key ending at each node, or -1
+        self._terminal = terminal = array('l', [-1])
+        # Nodes of the previous key, by depth
+        path = [0]
+        previous = ''
+        for k, key in enumerate(keys):
+            # Length of the prefix shared with the previous key
+            depth = 0
+            n = min(len(key), len(previous))
+            while depth < n and key[depth] == previous[depth]:
+                depth += 1
+            # Keys are sorted: the first new node is the next
+            # sibling of the previous one at the same depth
+            sibling = path[depth+1] if depth + 1 < len(path) else -1
+            del path[depth+1:]
+            for c in key[depth:]:
+                node = len(labels)
+                labels.append(c)
+                first_child.append(-1)
+                next_sibling.append(-1)
+                terminal.append(-1)
+                if sibling >= 0:
+                    next_sibling[sibling] = node
+                    sibling = -1
+                else:
+                    first_child[path[-1]] = node
+                path.append(node)
+            terminal[path[-1]] = k
+            previous = key
+        self._labels = ''.join(labels)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._terminal)
+
+    def __repr__(self) -> str:
+        return f"<LetterTrie of {len(self.words)} words, {self.node_count} nodes>"
+
+    def _automaton(self, constraints) -> tuple:
+        """
+        Return the (letters, step, initial, accept, checks)
+        of the walk following given constraints: the allowed
+        letters of the trie, the product of their automata,
+        and the checkers to call on the words found.
+        """
+        letters = set(self._labels)
+        steps, initials, accepts, checks = [], [], [], []
+        for constraint in constraints:
+            name, params = _parse_constraint(constraint)
+            if name not in _letter_automata:
+                raise ValueError(
+                    f"Constraint {name!r} cannot be checked letter by letter, "
+                    f"please chose in {set(_letter_automata)}."
+                )
+            automaton = _letter_automata[name](**params)
+            if automaton.allowed is not None:
+                letters &= automaton.allowed
+            letters -= automaton.forbidden
+            if automaton.step is not None:
+                steps.append(automaton.step)
+                initials.append(automaton.initial)
+                accepts.append(automaton.accept)
+            if not automaton.exact:
+                checks.append((constraint_checkers[name], params))
+        if not steps:
+            return letters, None, None, None, checks
+        return letters, _combine_steps(steps), tuple(initials), _combine_accepts(accepts), checks
+
+    def _walk(self, letters: set, step, state, accept) -> Iterator[int]:
+        """
+        Yield the keys (indices in sorted order) accepted by
+        a walk of the trie, depth first, through the edges
+        labelled by allowed letters only.
+        """
+        labels, terminal = self._labels, self._terminal
+        first_child, next_sibling = self._first_child, self._next_sibling
+        if terminal[0] >= 0 and (accept is None or accept(state)):
+            yield terminal[0]
+        # Nodes to visit, with the state of their parent
+        stack = [(first_child[0], state)] if first_child[0] >= 0 else []
+        while stack:
+            node, state = stack.pop()
+            # Siblings are visited after the subtree of the node
+            if next_sibling[node] >= 0:
+                stack.append((next_sibling[node], state))
+            c = labels[node]
+            if c not in letters:
+                continue
+            if step is not None:
+                state = step(state, c)
+                if state is None:
+                    continue
+            key = terminal[node]
+            if key >= 0 and (accept is None or accept(state)):
+                yield key
+            if first_child[node] >= 0:
+                stack.append((first_child[node], state))
+
+    def iter_matching(self, *constraints) -> Iterator[str]:
+        """
+        Yield the words following all the given constraints,
+        lazily, in the order of their letters.
+
+        Parameters
+        ----------
+        *constraints : str, tuple or Constraint
+            Constraints, as in check_all(), among: 'beaupresent',
+            'lipogram', 'monovocalism', 'okapi', 'prisoner',
+            'released_prisoner' and 'turkish'.
+        """
+        letters, step, initial, accept, checks = self._automaton(constraints)
+        key_first, key_words = self._key_first, self._key_words
+        for key in self._walk(letters, step, initial, accept):
+            for i in key_words[key_first[key]:key_first[key+1]]:
+                word = self.words[i]
+                if all(check(word, **params) for check, params in checks):
+                    yield word
+
+    def matching(self, *constraints) -> list[str]:
+        """
+        Return the words following all the given constraints
+        (see iter_matching()), in lexicon order.
+        """
+        letters, step, initial, accept, checks = self._automaton(constraints)
+        key_first, key_words = self._key_first, self._key_words
+        indices = [
+            i for key in self._walk(letters, step, initial, accept)
+            for i in key_words[key_first[key]:key_first[key+1]]
+            if all(check(self.words[i], **params) for check, params in checks)
+        ]
+        return self._select(indices)
@@ -1,9 +1,19 @@
 """
 This module contains functions to check properties in strings.
 """
-from collections import Counter
+from array import array
+from collections import Counter, namedtuple
+from functools import cached_property, lru_cache, partial
+from itertools import accumulate, chain, compress, repeat
+import operator
 import string
-from typing import List
+import threading
+from typing import Iterator, List
+
+try: # Optional, to compute gematria of large texts
+    import numpy
+except ImportError:
+    numpy = None
 
 
 
@@ -52,22 +62,112 @@ ascender_char = (
 )
 low_descender_char = ",;"
 descender_char = "gjpqy"
+_turkish_forbidden_char = "BFMPV" # Letters that move the lips
+_released_prisoner_char = 'bdfghjklpqt' + vowels_char + ligatures_char
+
+scrabble_letters = { # All the letters in a box of Scrabble
+    # French
+    'fr': "AAAAAAAAABBCCDDDEEEEEEEEEEEEEEEFFGGHHIIIIIIIIJKLLLLLMMMNNNNNNOOOOOOPPQRRRRRRSSSSSSTTTTTTUUUUUUVVWXYZ",
+    # English
+    'en': "AAAAAAAAABBCCDDDDEEEEEEEEEEEEFFGGGHHIIIIIIIIIJKLLLLMMNNNNNNOOOOOOOOPPQRRRRRRSSSSTTTTTTUUUUVVWWXYYZ"
+}
 
 
 ####
 # Utils
 ####
 
+class NormalizationDiagnostics:
+    """
+    Aggregated report of the characters met during
+    normalization that are neither letters, accents,
+    ligatures, punctuation nor white space.
+
+    Such characters are kept as is in normalized text;
+    this object only counts them, so that they can be
+    reviewed once, after a whole text has been processed.
+    """
+    def __init__(self):
+        self.unknown = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self.unknown)
+
+    def __repr__(self) -> str:
+        return f"NormalizationDiagnostics(unknown={dict(self.unknown)})"
+
+    def collect(self, s: str):
+        """
+        Count the unknown characters of given text.
+        """
+        self.unknown.update(s.translate(_unknown_table))
+
+    def clear(self):
+        """
+        Forget all the characters collected so far.
+        """
+        self.unknown.clear()
+
+class _TranslationTable(dict):
+    """
+    Table for str.translate(), filled lazily: the
+    translation of each character is computed by
+    'convert' the first time it is met, then cached.
+    """
+    def __init__(self, convert):
+        super().__init__()
+        self.convert = convert
+
+    def __missing__(self, ordinal: int) -> str:
+        value = self.convert(chr(ordinal))
+        self[ordinal] = value
+        return value
+
+def _normalize_char(c: str, separator='') -> str:
+    """
+    Return the normalized form of a single character,
+    as computed by to_letters(). Punctuation and white
+    space are replaced by 'separator'.
+    """
+    normalized = []
+    for u in c.upper():
+        u = ligature_to_letter.get(u, u)
+        if u in _non_word_char:
+            normalized.append(separator)
+        else:
+            normalized.append(accent_to_letter.get(u, u))
+    return ''.join(normalized)
+
+def _unknown_char(c: str) -> str:
+    """
+    Return the characters of the normalized form of 'c'
+    that are not known by normalization.
+    """
+    return ''.join(
+        u for u in _normalize_char(c)
+        if u not in string.ascii_uppercase
+    )
+
+_non_word_char = string.punctuation + string.whitespace
+# Tables for single-pass normalization
+_letters_table = _TranslationTable(_normalize_char)
+_words_letters_table = _TranslationTable(lambda c: _normalize_char(c, separator=' '))
+_unknown_table = _TranslationTable(_unknown_char)
+_accent_table = str.maketrans(accent_to_letter)
+_ligature_table = str.maketrans(ligature_to_letter)
+_words_table = str.maketrans({c: ' ' for c in _non_word_char})
+_letter_count_table = _TranslationTable(lambda c: chr(len(_normalize_char(c))))
+_vowels_table = _TranslationTable(lambda c: c if c in vowels_char else '')
+_consonants_table = _TranslationTable(lambda c: c if c in consonants_char else '')
+
 def remove_punctuation(s: str, replace_char='') -> str:
     """
     Return a copy of given string without
     its punctuation.
     """
-    s_copy = s
-    for c in string.punctuation:
-        if c in s_copy:
-            s_copy = s_copy.replace(c, replace_char)
-    return s_copy
+    return s.translate(str.maketrans(
+        {c: replace_char for c in string.punctuation}
+    ))
 
 def remove_non_word(s: str, replace_char='') -> str:
     """
@@ -75,58 +175,106 @@ def remove_non_word(s: str, replace_char='') -> str:
     its punctuation and white space (which
     are non-word character).
     """
-    s_copy = s
-    for c in string.punctuation:
-        if c in s_copy:
-            # (whitespace to ensure separation)
-            s_copy = s_copy.replace(c, ' ')
-    for c in string.whitespace:
-        # Replace all whitespace, and erased punctuation
-        if c in s_copy:
-            s_copy = s_copy.replace(c, replace_char)
-    return s_copy
+    return s.translate(str.maketrans(
+        {c: replace_char for c in _non_word_char}
+    ))
 
-def remove_accent(s: str) -> str:
+def remove_accent(s: str, diagnostics: NormalizationDiagnostics = None) -> str:
     """
     Return a copy of given string without
     any accents.
+
+    Unknown characters are kept, and counted in
+    'diagnostics' if given.
     """
-    s_copy = s
-    for c in s_copy:
-        if c in accents_char:
-            s_copy = s_copy.replace(c, accent_to_letter[c])
-        elif c not in (
-                string.ascii_letters
-                + string.punctuation
-                + string.whitespace
-                + ligatures_char
-                ):
-            print(f"WARNING: unknown character: {c}")
-    return s_copy
+    if diagnostics is not None:
+        diagnostics.collect(s)
+    return s.translate(_accent_table)
 
 def remove_ligature(s: str) -> str:
     """
     Return a copy of given string with ligature
     replaced by separated letters.
     """
-    s_copy = s
-    for c in ligatures_char:
-        s_copy = s_copy.replace(c, ligature_to_letter[c])
-    return s_copy
+    return s.translate(_ligature_table)
+
+def _normalize_letters(s: str) -> str:
+    return s.translate(_letters_table)
+
+def _normalize_words(s: str) -> tuple:
+    return tuple(w for w in s.translate(_words_letters_table).split(' ') if w)
+
+# Normalization cache of short strings (see configure_normalization_cache())
+_cache_max_length = 64
+_cached_letters = lru_cache(maxsize=4096)(_normalize_letters)
+_cached_words = lru_cache(maxsize=4096)(_normalize_words)
+_cache_lock = threading.Lock()
+
+def configure_normalization_cache(maxsize=4096, max_length=64):
+    """
+    Set the size of the caches of to_letters() and
+    to_words(letters_only=True), used for short strings
+    that are normalized again and again (lexicon words,
+    reference arguments...). Cached values are cleared.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximal number of strings in each cache (least
+        recently used ones are removed first). 0 disables
+        the caches. Defaults to 4096.
+    max_length : int, optional
+        Only strings of at most this length are cached.
+        Defaults to 64.
+    """
+    global _cache_max_length, _cached_letters, _cached_words
+    with _cache_lock:
+        _cached_letters = lru_cache(maxsize=maxsize)(_normalize_letters)
+        _cached_words = lru_cache(maxsize=maxsize)(_normalize_words)
+        _cache_max_length = max_length
+
+def normalization_cache_info() -> dict:
+    """
+    Return the statistics (hits, misses, maxsize, currsize)
+    of the normalization caches, by function.
+    """
+    return {
+        'to_letters': _cached_letters.cache_info()._asdict(),
+        'to_words': _cached_words.cache_info()._asdict(),
+    }
+
+def clear_normalization_cache():
+    """
+    Remove all the values (and statistics) of the
+    normalization caches.
+    """
+    _cached_letters.cache_clear()
+    _cached_words.cache_clear()
 
-def to_letters(s: str) -> str:
+def to_letters(s: str, diagnostics: NormalizationDiagnostics = None) -> str:
     """
     Return a copy of given text with only its letters,
     standardized to uppercase, without accent or
     ligature, remove all non-word characters and spaces.
-    """
-    return remove_non_word(
-        remove_accent(
-            remove_ligature(
-                s.upper()
-            )
-        )
-    )
+
+    Unknown characters (digits, symbols...) are kept,
+    and counted in 'diagnostics' if given.
+
+    Notes
+    -----
+    Normalization is done in a single pass, with a
+    translation table computed once for each character.
+    Short strings are cached (see configure_normalization_cache()).
+    """
+    if isinstance(s, NormalizedText):
+        if diagnostics is not None:
+            diagnostics.collect(s.source)
+        return s.letters
+    if diagnostics is not None:
+        diagnostics.collect(s)
+    if len(s) <= _cache_max_length:
+        return _cached_letters(s)
+    return s.translate(_letters_table)
 
 def to_words(s: str, letters_only=False) -> list[str]:
     """
@@ -134,26 +282,30 @@ def to_words(s: str, letters_only=False) -> list[str]:
 
     White space and punctuation are discarded.
     """
-    # Remove punctuation and standardize white space
-    s_copy = remove_punctuation(s, replace_char=' ')
-    for w in string.whitespace:
-        if w in s_copy:
-            s_copy = s_copy.replace(w, ' ')
-    # Get words (ignore empty strings)
-    words = [w for w in s_copy.split(' ') if w]
+    if isinstance(s, NormalizedText):
+        return list(s.letter_words if letters_only else s.words)
+    # Replace punctuation and white space by a single separator,
+    # normalizing letters on the way if needed
     if letters_only:
-        words = [to_letters(w) for w in words]
-    return words
+        if len(s) <= _cache_max_length:
+            return list(_cached_words(s))
+        s_copy = s.translate(_words_letters_table)
+    else:
+        s_copy = s.translate(_words_table)
+    # Get words (ignore empty strings)
+    return [w for w in s_copy.split(' ') if w]
 
 def to_lines(s: str, letters_only=False) -> list[str]:
     """
     Return a list of lines in given text.
     """
+    if isinstance(s, NormalizedText):
+        return list(s.letter_lines if letters_only else s.lines)
     # Get non-blank lines
     lines = [line for line in s.split('\n') if line]
     # Clean lines
     if letters_only:
-        lines = [to_letters(line) for line in lines]
+        lines = [line.translate(_letters_table) for line in lines]
 
     return lines
 
@@ -190,7 +342,9 @@ def to_vowels(s: str) -> str:
 
     White space, punctuation and accents are discarded.
     """
-    return filter_letters(s, vowels_char)
+    if isinstance(s, NormalizedText):
+        return s.vowels
+    return to_letters(s).translate(_vowels_table)
 
 def to_consonants(s: str) -> str:
     """
@@ -199,7 +353,9 @@ def to_consonants(s: str) -> str:
 
     White space, punctuation and accents are discarded.
     """
-    return filter_letters(s, consonants_char)
+    if isinstance(s, NormalizedText):
+        return s.consonants
+    return to_letters(s).translate(_consonants_table)
 
 def letter_counter(s: str) -> Counter:
     """
@@ -207,12 +363,154 @@ def letter_counter(s: str) -> Counter:
 
     Spaces, punctuation, accents are discarded.
     """
+    if isinstance(s, NormalizedText):
+        return s.letter_counter.copy()
     return Counter(to_letters(s))
 
+# Index of each letter in a LetterCount
+_letter_index = {c: i for i, c in enumerate(string.ascii_uppercase)}
+# Table that removes the letters A-Z
+_non_alphabet_table = str.maketrans('', '', string.ascii_uppercase)
+
+def _count_letters(letters: str) -> tuple:
+    """
+    Return the (array of counts of A-Z, dict of counts of
+    other characters) of normalized letters.
+    """
+    if len(letters) < 32:
+        # Short strings: count in one pass
+        counts = array('q', bytes(8 * 26))
+        others = {}
+        for c in letters:
+            i = _letter_index.get(c)
+            if i is None:
+                others[c] = others.get(c, 0) + 1
+            else:
+                counts[i] += 1
+        return counts, others
+    # Long strings: count each letter in C
+    counts = array('q', list(map(letters.count, string.ascii_uppercase)))
+    rest = letters.translate(_non_alphabet_table)
+    return counts, dict(Counter(rest)) if rest else {}
+
+class LetterCount:
+    """
+    Number of occurrences of each letter of a text, like
+    letter_counter(), as a compact vector: an array of 26
+    counts for A-Z, and a dict for other characters (digits,
+    symbols...). Comparisons do not hash letters, and build
+    no intermediate Counter.
+
+    LetterCounts support == (anagrams), <= and >= (sub-
+    multisets), + and - (negative counts are dropped, as
+    with Counter). counter() gives the equivalent Counter.
+
+    Parameters
+    ----------
+    s : str, optional
+        Source text (normalized with to_letters()).
+    """
+    __slots__ = ('counts', 'others')
+
+    def __init__(self, s: str = ''):
+        self.counts, self.others = _count_letters(to_letters(s))
+
+    @classmethod
+    def _from_counts(cls, counts: array, others: dict) -> 'LetterCount':
+        count = cls.__new__(cls)
+        count.counts = counts
+        count.others = others
+        return count
+
+    def copy(self) -> 'LetterCount':
+        return self._from_counts(array('q', self.counts), dict(self.others))
+
+    def __getitem__(self, letter: str) -> int:
+        i = _letter_index.get(letter)
+        if i is None:
+            return self.others.get(letter, 0)
+        return self.counts[i]
+
+    def items(self) -> list[tuple]:
+        """
+        Return the (letter, count) pairs of the letters
+        that occur, A-Z first.
+        """
+        return [
+            *((c, n) for c, n in zip(string.ascii_uppercase, self.counts) if n),
+            *((c, n) for c, n in self.others.items() if n),
+        ]
+
+    def total(self) -> int:
+        return sum(self.counts) + sum(self.others.values())
+
+    def counter(self) -> Counter:
+        """
+        Return the letters as a Counter (see letter_counter()).
+        """
+        return Counter(dict(self.items()))
+
+    def __bool__(self) -> bool:
+        return any(self.counts) or any(self.others.values())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LetterCount):
+            return NotImplemented
+        # (counts of other characters are never 0)
+        return self.counts == other.counts and self.others == other.others
+
+    def __le__(self, other: 'LetterCount') -> bool:
+        if not isinstance(other, LetterCount):
+            return NotImplemented
+        return all(map(operator.le, self.counts, other.counts)) and all(
+            n <= other.others.get(c, 0) for c, n in self.others.items()
+        )
+
+    def __ge__(self, other: 'LetterCount') -> bool:
+        if not isinstance(other, LetterCount):
+            return NotImplemented
+        return other <= self
+
+    def __add__(self, other: 'LetterCount') -> 'LetterCount':
+        if not isinstance(other, LetterCount):
+            return NotImplemented
+        others = dict(self.others)
+        for c, n in other.others.items():
+            others[c] = others.get(c, 0) + n
+        return self._from_counts(array('q', map(operator.add, self.counts, other.counts)), others)
+
+    def __sub__(self, other: 'LetterCount') -> 'LetterCount':
+        if not isinstance(other, LetterCount):
+            return NotImplemented
+        counts = array('q', [n if n > 0 else 0 for n in map(operator.sub, self.counts, other.counts)])
+        others = {}
+        for c, n in self.others.items():
+            n -= other.others.get(c, 0)
+            if n > 0:
+                others[c] = n
+        return self._from_counts(counts, others)
+
+    def __repr__(self) -> str:
+        return f"LetterCount({dict(self.items())})"
+
+def letter_count(s: str) -> LetterCount:
+    """
+    Return the LetterCount of the letters in the text.
+
+    Spaces, punctuation, accents are discarded.
+    """
+    if isinstance(s, NormalizedText):
+        return s.letter_count.copy()
+    return LetterCount(s)
+
 def word_counter(s: str, letters_only=False) -> Counter:
     """
     Return a Counter of words of in the text.
     """
+    if isinstance(s, NormalizedText):
+        if letters_only:
+            return s.letter_word_counter.copy()
+        return Counter(s.words)
     return Counter(to_words(s, letters_only=letters_only))
 
 def chunk(s: str, n: int) -> list[str]:
@@ -243,6 +541,188 @@ def count_common(s1: str, s2: str) -> int:
             count += 1
     return count
 
+# Bit of letter_mask() set for characters other than A-Z
+OTHER_CHAR_BIT = 1 << 26
+
+_letter_bits = {c: 1 << i for i, c in enumerate(string.ascii_uppercase)}
+
+def letter_mask(s: str) -> int:
+    """
+    Return the set of letters in given text, as an integer
+    where bit i is set if the i-th letter of the alphabet
+    (A=0, ..., Z=25) is used.
+
+    Bit 26 (OTHER_CHAR_BIT) is set if other characters
+    remain after normalization (digits, unknown symbols...).
+
+    Example
+    -------
+    >>> bin(letter_mask("Abba"))
+    '0b11'
+    """
+    return _letters_mask(to_letters(s))
+
+def _letters_mask(letters: str) -> int:
+    """
+    Return the letter_mask() of normalized letters.
+    """
+    mask = 0
+    for c in set(letters):
+        mask |= _letter_bits.get(c, OTHER_CHAR_BIT)
+    return mask
+
+def mask_letters(mask: int) -> str:
+    """
+    Return the letters of a mask given by letter_mask(),
+    in alphabetical order.
+    """
+    return ''.join(c for i, c in enumerate(string.ascii_uppercase) if mask >> i & 1)
+
+def _share_no_letter(w1: str, w2: str, mask1: int, mask2: int) -> bool:
+    """
+    Return True if count_common(w1, w2) is 0, for normalized
+    words of given masks. Words are only compared when the
+    masks cannot tell (other characters than A-Z).
+    """
+    common = mask1 & mask2
+    if not common:
+        return True
+    return common == OTHER_CHAR_BIT and set(w1).isdisjoint(w2)
+
+def _share_letters(w1: str, w2: str, mask1: int, mask2: int, n: int) -> bool:
+    """
+    Return True if count_common(w1, w2) is at least 'n', for
+    normalized words of given masks. Common letters are
+    counted with a popcount of the masks; words are only
+    compared when repeated letters (counted by count_common)
+    or other characters may change the result.
+    """
+    common = mask1 & mask2
+    if (common & ~OTHER_CHAR_BIT).bit_count() >= n:
+        return True
+    if not common:
+        return False
+    return sum(1 for c in w1 if c in w2) >= n
+
+# Span of characters in a source text, as in a slice
+Span = namedtuple('Span', ['start', 'end'])
+
+def letter_offsets(s: str) -> array:
+    """
+    Return, for each letter in to_letters(s), the offset
+    of the character it comes from in given text.
+
+    Notes
+    -----
+    Most characters give one letter, or none; ligatures
+    (and a few other characters) give several letters,
+    that share the same offset.
+    """
+    s = str(s)
+    # Number of letters given by each character
+    lengths = s.translate(_letter_count_table).encode('latin-1')
+    if max(lengths, default=0) <= 1:
+        return array('q', compress(range(len(s)), lengths))
+    return array('q', chain.from_iterable(
+        repeat(i, n) for i, n in enumerate(lengths) if n
+    ))
+
+def source_span(offsets: array, start: int, end: int) -> Span:
+    """
+    Return the Span of source text that gives the letters
+    from 'start' to 'end' (excluded), given the offsets
+    computed by letter_offsets(). The range of letters
+    must not be empty.
+    """
+    return Span(offsets[start], offsets[end-1] + 1)
+
+def normalize(s: str) -> 'NormalizedText':
+    """
+    Return given text as a NormalizedText (unchanged
+    if it already is one).
+    """
+    if isinstance(s, NormalizedText):
+        return s
+    return NormalizedText(s)
+
+class NormalizedText:
+    """
+    Wrapper around a source text, whose normalized views
+    (letters, words, lines...) are computed lazily, and
+    only once.
+
+    Every checker accepts a NormalizedText instead of a
+    string: checking several constraints on the same
+    NormalizedText costs a single normalization.
+
+    Example
+    -------
+    >>> text = NormalizedText("Être et n'être, tel est le Cerbère.")
+    >>> check_monovocalism(text) and check_lipogram(text, "a")
+    True
+    """
+    def __init__(self, source: str):
+        self.source = source
+
+    def __str__(self) -> str:
+        return self.source
+
+    def __repr__(self) -> str:
+        return f"NormalizedText({self.source!r})"
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    @cached_property
+    def letters(self) -> str:
+        """Letters of the text, as given by to_letters()."""
+        return self.source.translate(_letters_table)
+
+    @cached_property
+    def words(self) -> list[str]:
+        """Words of the text, as given by to_words()."""
+        return to_words(self.source)
+
+    @cached_property
+    def letter_words(self) -> list[str]:
+        """Normalized words of the text (to_words(letters_only=True))."""
+        return to_words(self.source, letters_only=True)
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """Non-empty lines of the text, as given by to_lines()."""
+        return to_lines(self.source)
+
+    @cached_property
+    def letter_lines(self) -> list[str]:
+        """Normalized lines of the text (to_lines(letters_only=True))."""
+        return [line.translate(_letters_table) for line in self.lines]
+
+    @cached_property
+    def vowels(self) -> str:
+        """Vowels of the text, as given by to_vowels()."""
+        return self.letters.translate(_vowels_table)
+
+    @cached_property
+    def consonants(self) -> str:
+        """Consonants of the text, as given by to_consonants()."""
+        return self.letters.translate(_consonants_table)
+
+    @cached_property
+    def letter_counter(self) -> Counter:
+        """Counter of the letters of the text."""
+        return Counter(self.letters)
+
+    @cached_property
+    def letter_count(self) -> 'LetterCount':
+        """LetterCount of the letters of the text."""
+        return LetterCount._from_counts(*_count_letters(self.letters))
+
+    @cached_property
+    def letter_word_counter(self) -> Counter:
+        """Counter of the normalized words of the text."""
+        return Counter(self.letter_words)
+
 
 ####
 # Constraint checker
@@ -410,7 +890,7 @@ def check_turkish(s: str) -> bool:
     constraint. However, current implementation of the function would
     return False.
     """
-    return check_lipogram(s, forbidden="BFMPV")
+    return check_lipogram(s, forbidden=_turkish_forbidden_char)
 
 def check_prisoner(s: str, allow_accent=True) -> bool:
     """
@@ -434,17 +914,23 @@ def check_prisoner(s: str, allow_accent=True) -> bool:
     - https://zazipo.net/+-Prisonnier-+
     - https://fr.wikipedia.org/wiki/Contrainte_du_prisonnier
     """
-    # Build list of forbidden characters
-    forbidden_char = descender_char + ascender_char
-    if not allow_accent:
-        # Avoid accents too, if specified
-        forbidden_char += low_ascender_char + low_descender_char
+    forbidden_char = _prisoner_forbidden_char(allow_accent)
     # Check each character
-    for c in s:
+    for c in str(s):
         if c in forbidden_char:
             return False
     return True
 
+def _prisoner_forbidden_char(allow_accent=True) -> str:
+    """
+    Return the characters forbidden by the prisoner's constraint.
+    """
+    forbidden_char = descender_char + ascender_char
+    if not allow_accent:
+        # Avoid accents too, if specified
+        forbidden_char += low_ascender_char + low_descender_char
+    return forbidden_char
+
 def check_released_prisoner(s: str) -> bool:
     """
     Return True if all letters given text, except vowels
@@ -456,7 +942,7 @@ def check_released_prisoner(s: str) -> bool:
     """
     return check_beaupresent(
         s=s,
-        ref='bdfghjklpqt' + vowels_char + ligatures_char
+        ref=_released_prisoner_char
     )
 
 def check_okapi(s: str) -> bool:
@@ -468,10 +954,10 @@ def check_okapi(s: str) -> bool:
     -----
     See also: https://zazipo.net/+-Okapi-+
     """
-    if not s:
-        return True
     # Extract letters only
     s_copy = to_letters(s)
+    if not s_copy:
+        return True
     # Check alternation
     previous_is_vowel = s_copy[0] in vowels_char
     for c in s_copy[1:]:
@@ -652,8 +1138,9 @@ def check_sympathetic(s: str, min=1) -> bool:
     See also: https://zazipo.net/+-Sympathique-+
     """
     words = to_words(s, letters_only=True)
+    masks = [_letters_mask(w) for w in words]
     for i in range(len(words)-1):
-        if count_common(words[i], words[i+1]) < min:
+        if not _share_letters(words[i], words[i+1], masks[i], masks[i+1], min):
             return False
     return True
 
@@ -667,8 +1154,9 @@ def check_snob(s: str) -> bool:
     See also: https://zazipo.net/+-Snob-+
     """
     words = to_words(s, letters_only=True)
+    masks = [_letters_mask(w) for w in words]
     for i in range(len(words)-1):
-        if count_common(words[i], words[i+1]) != 0:
+        if not _share_no_letter(words[i], words[i+1], masks[i], masks[i+1]):
             return False
     return True
 
@@ -807,14 +1295,14 @@ def check_anagram(s1: str, s2: str) -> bool:
     - https://www.oulipo.net/fr/contraintes/anagramme
     - https://zazipo.net/+-Anagramme-+
     """
-    return letter_counter(s1) == letter_counter(s2)
+    return letter_count(s1) == letter_count(s2)
 
 def check_subanagram(s_sub: str, s_ref: str) -> bool:
     """
     Return True if all the letter in s_sub are contained
     in s_ref.
     """
-    return letter_counter(s_sub) <= letter_counter(s_ref)
+    return letter_count(s_sub) <= letter_count(s_ref)
 
 def check_heterogram(s: str, ref: str = 'ULCERATIONS') -> bool:
     """
@@ -836,13 +1324,48 @@ def check_heterogram(s: str, ref: str = 'ULCERATIONS') -> bool:
     - https://www.zazipo.net/+-Ulcerations-+
     """
     ref_letters = to_letters(ref)
-
-    chunks = chunk(s, len(ref_letters))
-    for c in chunks:
-        if not check_anagram(c, ref_letters):
+    if not ref_letters:
+        raise ValueError("'ref' argument must contain letters.")
+    letters = to_letters(s)
+    n = len(ref_letters)
+    if len(letters) % n:
+        # Last chunk is too short
+        return False
+    # Compare the sorted letters of each chunk (see also
+    # _anagram_windows(), to check every offset)
+    ref_letters = sorted(ref_letters)
+    for i in range(0, len(letters), n):
+        if sorted(letters[i:i+n]) != ref_letters:
             return False
     return True
 
+def _anagram_windows(letters: str, ref: str) -> Iterator[bool]:
+    """
+    Yield, for each offset i in normalized 'letters',
+    whether letters[i:i+n] is an anagram of 'ref' (of n
+    letters). The window slides over the letters, and a
+    single vector of count differences is updated with
+    the letters entering and leaving it.
+    """
+    n = len(ref)
+    # Count of each letter in the window, minus its count in 'ref'
+    diff = {}
+    for c in ref:
+        diff[c] = diff.get(c, 0) - 1
+    # Number of letters whose difference is not 0
+    mismatches = len(diff)
+    for i, c in enumerate(letters):
+        d = diff.get(c, 0)
+        mismatches += (d == 0) - (d == -1)
+        diff[c] = d + 1
+        if i >= n:
+            c = letters[i-n]
+            d = diff[c]
+            mismatches += (d == 0) - (d == 1)
+            diff[c] = d - 1
+        if i >= n - 1:
+            yield not mismatches
+
 def check_ulcerations(s: str, tone='C'):
     """
     Return True if given text is an heterogram
@@ -909,16 +1432,10 @@ def check_panscrabblogram(s: str, lang='fr') -> bool:
     -----
     See also: https://zazipo.net/+-Panscrabblogramme-594-+
     """
-    available_lang = {
-        # French
-        'fr': "AAAAAAAAABBCCDDDEEEEEEEEEEEEEEEFFGGHHIIIIIIIIJKLLLLLMMMNNNNNNOOOOOOPPQRRRRRRSSSSSSTTTTTTUUUUUUVVWXYZ",
-        # English
-        'en': "AAAAAAAAABBCCDDDDEEEEEEEEEEEEFFGGGHHIIIIIIIIIJKLLLLMMNNNNNNOOOOOOOOPPQRRRRRRSSSSTTTTTTUUUUVVWWXYYZ"
-    }
-    if lang not in available_lang:
-        raise ValueError(f"'lang' argument must be in {set(available_lang.keys())}")
+    if lang not in scrabble_letters:
+        raise ValueError(f"'lang' argument must be in {set(scrabble_letters.keys())}")
 
-    return check_anagram(available_lang[lang], s)
+    return check_anagram(scrabble_letters[lang], s)
 
 def check_belleabsente(s: str, ref: str = None) -> bool:
     """
@@ -980,6 +1497,7 @@ def check_asupposer(s: str) -> bool:
     - https://www.oulipo.net/fr/contraintes/a-supposer
     - https://zazipo.net/+-A-supposer-502-+
     """
+    s = str(s)
     size = len(s)
     # Consider '...' as authorized punctuation
     s_copy = s.replace('...', '')
@@ -991,6 +1509,621 @@ def check_asupposer(s: str) -> bool:
     return size >= 1000
 
 
+####
+# Multiple constraints
+####
+
+class _Scan:
+    """
+    State of a constraint during a fused scan (see check_all()).
+
+    The scan is fed with successive blocks of words of a text,
+    and answers False as soon as the constraint is violated.
+    """
+    # True if feed() needs the raw words, not only their letters
+    raw_words = False
+
+    def feed(self, words: list[str], letters: list[str]) -> bool:
+        """
+        Process next words ('letters' are their normalized
+        forms), return False if the constraint is violated.
+        """
+        return True
+
+    def result(self) -> bool:
+        """
+        Return the final answer, once the whole text is fed.
+        """
+        return True
+
+    def copy(self) -> '_Scan':
+        """
+        Return an independent scan in the same state: a scan
+        prepared once can be copied for each text.
+        """
+        scan = object.__new__(type(self))
+        scan.__dict__ = self.__dict__.copy()
+        return scan
+
+class _LipogramScan(_Scan):
+    def __init__(self, forbidden: str):
+        self.forbidden = frozenset(to_letters(forbidden))
+
+    def feed(self, words, letters):
+        return self.forbidden.isdisjoint(''.join(letters))
+
+class _BeaupresentScan(_Scan):
+    def __init__(self, ref: str):
+        self.allowed = frozenset(to_letters(ref))
+
+    def feed(self, words, letters):
+        return self.allowed.issuperset(''.join(letters))
+
+class _MonovocalismScan(_Scan):
+    def __init__(self, vowel=None):
+        if vowel:
+            vowel = vowel.upper()
+            if not (set(vowel) < set(vowels_char)):
+                raise ValueError(f"Please chose target voyel in {vowels_char}.")
+        self.vowel = vowel
+        self.seen = set()
+
+    def copy(self):
+        scan = super().copy()
+        scan.seen = set(self.seen)
+        return scan
+
+    def feed(self, words, letters):
+        self.seen.update(''.join(letters).translate(_vowels_table))
+        return len(self.seen) <= 1
+
+    def result(self):
+        return not self.vowel or self.vowel in self.seen
+
+class _HeteroconsonantismScan(_Scan):
+    def __init__(self):
+        self.seen = set()
+
+    def copy(self):
+        scan = super().copy()
+        scan.seen = set(self.seen)
+        return scan
+
+    def feed(self, words, letters):
+        consonants = ''.join(letters).translate(_consonants_table)
+        if len(set(consonants)) != len(consonants):
+            return False
+        if not self.seen.isdisjoint(consonants):
+            return False
+        self.seen.update(consonants)
+        return True
+
+class _OkapiScan(_Scan):
+    def __init__(self):
+        self.previous = None
+
+    def feed(self, words, letters):
+        s = ''.join(letters)
+        # 'V' for vowels, 'C' for consonants, '?' otherwise
+        pattern = s.translate(_okapi_table)
+        if self.previous is None and pattern[:1] == '?':
+            # (as check_okapi(), which does not check the first letter)
+            pattern = 'C' + pattern[1:]
+        unknown = pattern.find('?')
+        if unknown >= 0:
+            pattern = pattern[:unknown]
+        if ('VV' in pattern or 'CC' in pattern
+                or (pattern and pattern[0] == self.previous)):
+            return False
+        if unknown >= 0:
+            raise RuntimeError(f"Unknown vowel or consonant: {s[unknown]}")
+        if pattern:
+            self.previous = pattern[-1]
+        return True
+
+class _TautogramScan(_Scan):
+    def __init__(self, start_with=None):
+        if start_with is not None:
+            if len(start_with) != 1:
+                raise ValueError("'start_with' must be only one character.")
+            start_with = start_with.upper()
+        self.start_with = start_with
+
+    def feed(self, words, letters):
+        if self.start_with is None:
+            self.start_with = letters[0][0]
+        return all(w[0] == self.start_with for w in letters)
+
+class _AcrosticScan(_Scan):
+    def __init__(self, ref: str, check_length=True):
+        self.ref = to_letters(ref)
+        self.check_length = check_length
+        self.n_words = 0
+
+    def feed(self, words, letters):
+        for w in letters:
+            if self.check_length and self.n_words >= len(self.ref):
+                return False
+            if w[0] != self.ref[self.n_words % len(self.ref)]:
+                return False
+            self.n_words += 1
+        return True
+
+    def result(self):
+        return not self.check_length or self.n_words == len(self.ref)
+
+class _ChainScan(_Scan):
+    """
+    Scan that checks each pair of successive words.
+    """
+    def __init__(self):
+        self.previous = None
+
+    def check_pair(self, w1: str, w2: str) -> bool:
+        return True
+
+    def feed(self, words, letters):
+        if self.previous is not None:
+            if not self.check_pair(self.previous, letters[0]):
+                return False
+        for i in range(len(letters)-1):
+            if not self.check_pair(letters[i], letters[i+1]):
+                return False
+        self.previous = letters[-1]
+        return True
+
+class _KyrielleScan(_ChainScan):
+    def check_pair(self, w1, w2):
+        return w1[-1] == w2[0]
+
+class _SympatheticScan(_ChainScan):
+    def __init__(self, min=1):
+        super().__init__()
+        self.min = min
+
+    def check_pair(self, w1, w2):
+        return sum(1 for c in w1 if c in w2) >= self.min
+
+class _SnobScan(_ChainScan):
+    def check_pair(self, w1, w2):
+        return set(w1).isdisjoint(w2)
+
+class _NgramScan(_Scan):
+    raw_words = True
+
+    def __init__(self, n=None):
+        if n is not None and not isinstance(n, (int, list)):
+            raise ValueError("'n' argument must be an integer, or a list of integer.")
+        self.n = n
+
+    def feed(self, words, letters):
+        lengths = set(map(len, words))
+        if self.n is None:
+            # All the words must have the length of the first one
+            self.n = len(words[0])
+        if isinstance(self.n, int):
+            return lengths == {self.n}
+        return lengths.issubset(self.n)
+
+class _MaxgramScan(_Scan):
+    raw_words = True
+
+    def __init__(self, m: int):
+        self.m = m
+
+    def feed(self, words, letters):
+        return max(map(len, words)) <= self.m
+
+class _MingramScan(_Scan):
+    raw_words = True
+
+    def __init__(self, m: int):
+        self.m = m
+
+    def feed(self, words, letters):
+        return min(map(len, words)) >= self.m
+
+class _LetterCountScan(_Scan):
+    """
+    Scan that counts all the letters, then compares
+    them to a reference LetterCount with 'compare'.
+    """
+    def __init__(self, ref: LetterCount, compare):
+        self.ref = ref
+        self.compare = compare
+        self.count = LetterCount()
+
+    def feed(self, words, letters):
+        self.count += LetterCount._from_counts(*_count_letters(''.join(letters)))
+        return True
+
+    def result(self):
+        return self.compare(self.count, self.ref)
+
+class _HeterogramScan(_Scan):
+    def __init__(self, ref: str = 'ULCERATIONS'):
+        self.ref = letter_count(ref)
+        self.size = self.ref.total()
+        if not self.size:
+            raise ValueError("'ref' argument must contain letters.")
+        self.pending = ''
+
+    def feed(self, words, letters):
+        s = self.pending + ''.join(letters)
+        end = len(s) - len(s) % self.size
+        for i in range(0, end, self.size):
+            if LetterCount._from_counts(*_count_letters(s[i:i+self.size])) != self.ref:
+                return False
+        self.pending = s[end:]
+        return True
+
+    def result(self):
+        # A last, incomplete chunk cannot be an anagram of 'ref'
+        return not self.pending
+
+def _abecedaire_scan():
+    return _AcrosticScan(string.ascii_uppercase)
+
+def _acrostic_scan(ref: str, by_words=False, check_length=True):
+    if not by_words:
+        # Lines are not scanned
+        return None
+    return _AcrosticScan(ref, check_length=check_length)
+
+def _anagram_scan(s2: str):
+    return _LetterCountScan(letter_count(s2), operator.eq)
+
+def _pangram_scan(alphabet=None):
+    if alphabet is None:
+        alphabet = string.ascii_uppercase
+    return _LetterCountScan(letter_count(alphabet), operator.ge)
+
+def _panscrabblogram_scan(lang='fr'):
+    if lang not in scrabble_letters:
+        raise ValueError(f"'lang' argument must be in {set(scrabble_letters.keys())}")
+    return _anagram_scan(scrabble_letters[lang])
+
+# Number of words given at once to fused scans
+_scan_block_size = 4096
+_okapi_table = _TranslationTable(
+    lambda c: 'V' if c in vowels_char else 'C' if c in consonants_char else '?'
+)
+
+# Checker of each constraint, by name
+constraint_checkers = {
+    name[len('check_'):]: checker
+    for name, checker in list(globals().items())
+    if name.startswith('check_')
+}
+
+# Fused scan of each constraint, by name (returns None
+# if the constraint must be checked as a whole instead)
+_scan_factories = {
+    'abecedaire': _abecedaire_scan,
+    'acrostic': _acrostic_scan,
+    'anagram': _anagram_scan,
+    'beaupresent': _BeaupresentScan,
+    'heteroconsonantism': _HeteroconsonantismScan,
+    'heterogram': _HeterogramScan,
+    'kyrielle': _KyrielleScan,
+    'lipogram': _LipogramScan,
+    'maxgram': _MaxgramScan,
+    'mingram': _MingramScan,
+    'monovocalism': _MonovocalismScan,
+    'ngram': _NgramScan,
+    'okapi': _OkapiScan,
+    'pangram': _pangram_scan,
+    'panscrabblogram': _panscrabblogram_scan,
+    'progressive_tautogram': lambda ref: _AcrosticScan(ref, check_length=False),
+    'released_prisoner': lambda: _BeaupresentScan(_released_prisoner_char),
+    'snob': _SnobScan,
+    'subanagram': lambda s_ref: _LetterCountScan(letter_count(s_ref), operator.le),
+    'sympathetic': _SympatheticScan,
+    'tautogram': _TautogramScan,
+    'turkish': lambda: _LipogramScan(_turkish_forbidden_char),
+    'ulcerations': lambda tone='C': _HeterogramScan("UL_ERATIONS" + tone),
+}
+
+def _parse_constraint(constraint) -> tuple:
+    """
+    Return the (name, parameters) of a constraint given
+    either by its name, or by a (name, parameters) tuple.
+    """
+    if isinstance(constraint, str):
+        name, params = constraint, {}
+    elif isinstance(constraint, Constraint):
+        if constraint.name is None:
+            raise ValueError(f"Combined constraint {constraint!r} has no name.")
+        name, params = constraint.name, constraint.params
+    else:
+        name, params = constraint
+    if name not in constraint_checkers:
+        raise ValueError(f"Unknown constraint: {name!r}")
+    return name, params
+
+def _build_scans(constraints: list) -> dict:
+    """
+    Return the fused scans of given (name, parameters)
+    constraints, by index. Constraints that cannot be
+    scanned are skipped.
+    """
+    scans = {}
+    for i, constraint in enumerate(constraints):
+        if constraint is None:
+            # Combined constraint
+            continue
+        name, params = constraint
+        factory = _scan_factories.get(name)
+        scan = factory(**params) if factory else None
+        if scan is not None:
+            scans[i] = scan
+    return scans
+
+def _feed_scans(scans: dict, results: list, words: list, letters: list):
+    """
+    Feed a block of words to each scan, and remove
+    violated constraints from 'scans'.
+    """
+    for i, scan in list(scans.items()):
+        if not scan.feed(words, letters):
+            results[i] = False
+            del scans[i]
+
+def check_all(s: str, constraints: list) -> list[bool]:
+    """
+    Check several constraints on the same text, in a single
+    scan of its words (processed by blocks). Return the list of results, in the
+    order of the constraints.
+
+    Each constraint keeps its own state during the scan,
+    and stops as soon as it is violated. The constraints
+    that cannot be checked word by word (palindrom,
+    isosceles, lines...) are checked by their check_*
+    function, on the same normalized text.
+
+    Parameters
+    ----------
+    s : str or NormalizedText
+        Source text.
+    constraints : list
+        Constraints to check. Each one is either the name of
+        a constraint (the name of its checker, without the
+        'check_' prefix), a tuple (name, parameters) where
+        'parameters' is a dict of keyword arguments for the
+        checker, or a Constraint (see compile_constraint()).
+        Combined constraints are checked as a whole.
+
+    Example
+    -------
+    >>> check_all("Fenouil furibond", [
+    ...     "tautogram", ("lipogram", {"forbidden": "A"}), "pangram"
+    ... ])
+    [True, True, False]
+    """
+    return _check_prepared(normalize(s), *_prepare_constraints(constraints))
+
+def _prepare_constraints(constraints: list) -> tuple:
+    """
+    Return the constraints of check_all(), prepared once to be
+    checked on several texts with _check_prepared(): the fused
+    scans, by index, before any text is fed, and the compiled
+    predicates of the other constraints, by index.
+    """
+    # (name, parameters) of each constraint, None if combined
+    parsed = [
+        None if isinstance(c, Constraint) and c.name is None else _parse_constraint(c)
+        for c in constraints
+    ]
+    scans = _build_scans(parsed)
+    predicates = {}
+    for i, constraint in enumerate(constraints):
+        if i in scans:
+            continue
+        if isinstance(constraint, Constraint):
+            predicates[i] = constraint
+        else:
+            name, params = parsed[i]
+            predicates[i] = compile_constraint(name, **params)
+    return scans, predicates
+
+def _check_prepared(text: 'NormalizedText', scans: dict, predicates: dict) -> list[bool]:
+    """
+    Check constraints prepared by _prepare_constraints() on a
+    normalized text, as check_all() does. The prepared scans
+    are copied, so that they can be reused for other texts.
+    """
+    results = [None] * (len(scans) + len(predicates))
+    scans = {i: scan.copy() for i, scan in scans.items()}
+
+    # Scan blocks of words, while some constraints are still satisfied
+    if scans:
+        raw_words = any(scan.raw_words for scan in scans.values())
+        words = text.words if raw_words else text.letter_words
+        letters = text.letter_words
+        for start in range(0, len(letters), _scan_block_size):
+            end = start + _scan_block_size
+            _feed_scans(scans, results, words[start:end], letters[start:end])
+            if not scans:
+                break
+        for i, scan in scans.items():
+            results[i] = scan.result()
+
+    # Check other constraints as a whole
+    for i, predicate in predicates.items():
+        results[i] = predicate(text)
+    return results
+
+
+####
+# Compiled constraints
+####
+
+class Constraint:
+    """
+    Reusable predicate on texts, returned by compile_constraint():
+    its parameters (letter sets, counters...) are prepared once,
+    instead of at each call of the checker.
+
+    Constraints can be combined with & (and), | (or) and ~ (not);
+    combined constraints have no name.
+
+    Parameters
+    ----------
+    predicate : callable
+        Function of a text, returning a bool.
+    name : str, optional
+        Name of the constraint (see check_all()).
+    params : dict, optional
+        Parameters of the constraint.
+    description : str, optional
+        Representation of a combined constraint.
+    """
+    def __init__(self, predicate, name=None, params=None, description=None):
+        self.predicate = predicate
+        self.name = name
+        self.params = params or {}
+        self.description = description
+
+    def __call__(self, s: str) -> bool:
+        return self.predicate(s)
+
+    def __and__(self, other: 'Constraint') -> 'Constraint':
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return Constraint(
+            partial(_check_every, (self, other)),
+            description=f"({self!r} & {other!r})",
+        )
+
+    def __or__(self, other: 'Constraint') -> 'Constraint':
+        if not isinstance(other, Constraint):
+            return NotImplemented
+        return Constraint(
+            partial(_check_any, (self, other)),
+            description=f"({self!r} | {other!r})",
+        )
+
+    def __invert__(self) -> 'Constraint':
+        return Constraint(partial(_check_not, self), description=f"~{self!r}")
+
+    def __repr__(self) -> str:
+        if self.description is not None:
+            return self.description
+        params = ''.join(f", {key}={value!r}" for key, value in self.params.items())
+        return f"compile_constraint({self.name!r}{params})"
+
+# Predicates of compiled constraints (module functions, with
+# precomputed arguments bound by functools.partial(), so that
+# compiled constraints can be sent to other processes)
+
+def _check_every(constraints: tuple, s: str) -> bool:
+    return all(constraint(s) for constraint in constraints)
+
+def _check_any(constraints: tuple, s: str) -> bool:
+    return any(constraint(s) for constraint in constraints)
+
+def _check_not(constraint: Constraint, s: str) -> bool:
+    return not constraint(s)
+
+def _check_no_letter(forbidden: frozenset, s: str) -> bool:
+    return forbidden.isdisjoint(to_letters(s))
+
+def _check_only_letters(allowed: frozenset, s: str) -> bool:
+    return allowed.issuperset(to_letters(s))
+
+def _check_no_char(forbidden: frozenset, s: str) -> bool:
+    return forbidden.isdisjoint(str(s))
+
+def _check_anagram(ref: LetterCount, size: int, s: str) -> bool:
+    letters = to_letters(s)
+    return len(letters) == size and LetterCount._from_counts(*_count_letters(letters)) == ref
+
+def _check_subanagram(ref: LetterCount, allowed: frozenset, s: str) -> bool:
+    letters = to_letters(s)
+    if not allowed.issuperset(letters):
+        return False
+    return all(letters.count(c) <= ref[c] for c in set(letters))
+
+def _check_superanagram(ref: LetterCount, required: frozenset, s: str) -> bool:
+    letters = to_letters(s)
+    if not required.issubset(letters):
+        return False
+    return all(letters.count(c) >= n for c, n in ref.items() if n > 1)
+
+def _compile_counter(check, ref: str):
+    ref = letter_count(ref)
+    if check is _check_anagram:
+        return partial(check, ref, ref.total())
+    return partial(check, ref, frozenset(c for c, _ in ref.items()))
+
+def _compile_monovocalism(vowel=None):
+    # Check the target vowel once (see check_monovocalism())
+    check_monovocalism('', vowel)
+    return partial(check_monovocalism, vowel=vowel)
+
+def _compile_pangram(alphabet=None):
+    if alphabet is None:
+        alphabet = string.ascii_uppercase
+    return _compile_counter(_check_superanagram, alphabet)
+
+def _compile_panscrabblogram(lang='fr'):
+    if lang not in scrabble_letters:
+        raise ValueError(f"'lang' argument must be in {set(scrabble_letters.keys())}")
+    return _compile_counter(_check_anagram, scrabble_letters[lang])
+
+# Compiler of each constraint, by name: returns the predicate
+# of the constraint, given its parameters. Other constraints
+# call their checker.
+_constraint_compilers = {
+    'anagram': lambda s2: _compile_counter(_check_anagram, s2),
+    'beaupresent': lambda ref: partial(_check_only_letters, frozenset(to_letters(ref))),
+    'lipogram': lambda forbidden: partial(_check_no_letter, frozenset(to_letters(forbidden))),
+    'monovocalism': _compile_monovocalism,
+    'pangram': _compile_pangram,
+    'panscrabblogram': _compile_panscrabblogram,
+    'prisoner': lambda allow_accent=True: partial(
+        _check_no_char, frozenset(_prisoner_forbidden_char(allow_accent))
+    ),
+    'released_prisoner': lambda: partial(
+        _check_only_letters, frozenset(to_letters(_released_prisoner_char))
+    ),
+    'subanagram': lambda s_ref: _compile_counter(_check_subanagram, s_ref),
+    'turkish': lambda: partial(_check_no_letter, frozenset(_turkish_forbidden_char)),
+}
+
+def compile_constraint(name: str, **params) -> Constraint:
+    """
+    Return a constraint as a reusable predicate, whose
+    parameters are prepared once: to check the same
+    constraint on many texts (e.g. to filter a lexicon).
+
+    Compiled constraints can be combined with & (and),
+    | (or) and ~ (not), and given to check_all().
+
+    Parameters
+    ----------
+    name : str
+        Name of the constraint (see check_all()).
+    **params
+        Parameters of the constraint, as for its checker.
+
+    Example
+    -------
+    >>> no_e = compile_constraint("lipogram", forbidden="E")
+    >>> no_e("Fenouil"), no_e("Oulipo")
+    (False, True)
+    >>> (no_e & ~compile_constraint("pangram"))("Oulipo")
+    True
+    """
+    name, params = _parse_constraint((name, params))
+    compiler = _constraint_compilers.get(name)
+    if compiler is not None:
+        predicate = compiler(**params)
+    else:
+        predicate = partial(constraint_checkers[name], **params)
+    return Constraint(predicate, name, params)
+
+
 ####
 # Operations, statistics
 ####
@@ -1079,14 +2212,88 @@ gematria_dict = { # From http://www.gef.free.fr/gem.php
     },
 }
 
+class _GematriaTable:
+    """
+    Gematria mapping compiled for fast sums: each letter
+    is encoded as a small integer (0 for characters that
+    are not in the mapping), used as an index in a dense
+    array of values. Sums are vectorized with NumPy when
+    it is installed.
+    """
+    def __init__(self, mapping: dict):
+        if len(mapping) > 255:
+            raise ValueError("'mapping' argument must have at most 255 letters.")
+        if any(not isinstance(letter, str) or len(letter) != 1 for letter in mapping):
+            raise ValueError("'mapping' argument keys must be single letters.")
+        # Code of each character (as a character, for str.translate())
+        self.codes = _TranslationTable(lambda c: '\x00')
+        self.codes.update({ord(letter): chr(i) for i, letter in enumerate(mapping, 1)})
+        # Value of each code
+        self.values = [0, *mapping.values()]
+        if numpy is not None:
+            self.array = numpy.array(self.values)
+
+    def encode(self, letters: str) -> bytes:
+        """
+        Return the codes of given letters.
+        """
+        return letters.translate(self.codes).encode('latin-1')
+
+    def sums(self, parts: list[str]) -> list[int]:
+        """
+        Return the sum of the values of the letters of each
+        part (normalized words, lines...), from the cumulative
+        sum of the values over all the parts.
+        """
+        codes = self.encode(''.join(parts))
+        bounds = accumulate(map(len, parts), initial=0)
+        if numpy is not None:
+            values = self.array[numpy.frombuffer(codes, dtype=numpy.uint8)]
+            prefix = numpy.zeros(len(codes) + 1, dtype=self.array.dtype)
+            numpy.cumsum(values, out=prefix[1:])
+            bounds = numpy.fromiter(bounds, dtype=numpy.int64, count=len(parts) + 1)
+            return numpy.diff(prefix[bounds]).tolist()
+        prefix = list(accumulate(map(self.values.__getitem__, codes), initial=0))
+        bounds = list(bounds)
+        return [prefix[end] - prefix[start] for start, end in zip(bounds, bounds[1:])]
+
+# Compiled tables of gematria_dict, by name
+_gematria_tables = {}
+
+@lru_cache(maxsize=64)
+def _custom_gematria_table(items: tuple) -> _GematriaTable:
+    """
+    Return the compiled table of a custom mapping, given
+    by its (letter, value) items, so that calls with the
+    same mapping only compile it once.
+    """
+    return _GematriaTable(dict(items))
+
+def _gematria_table(mapping) -> _GematriaTable:
+    """
+    Return the compiled table of a gematria mapping, given
+    by name (see gematria_dict), or as a dict.
+    """
+    if isinstance(mapping, dict):
+        try:
+            return _custom_gematria_table(tuple(mapping.items()))
+        except TypeError:
+            # Unhashable values
+            return _GematriaTable(mapping)
+    if mapping not in gematria_dict:
+        raise ValueError(f"'mapping' argument must be in: {set(gematria_dict.keys())}")
+    if mapping not in _gematria_tables:
+        _gematria_tables[mapping] = _GematriaTable(gematria_dict[mapping])
+    return _gematria_tables[mapping]
+
 def gematria(s: str, mapping='french_rank') -> int:
     """
-    Return the gematria value for each word
-    of given text. The gematria of the word is the
-    sum of the value of each of its letters, following
-    given mapping.
+    Return the gematria value of given text: the sum of
+    the gematria values of its words.
+
+    See gematria_words() for the description of arguments.
     """
-    return sum(gematria_words(s=s, mapping=mapping))
+    return _gematria_table(mapping).sums([to_letters(s)])[0]
 
 def gematria_words(s: str, mapping='french_rank') -> list[int]:
     """
@@ -1094,33 +2301,27 @@ def gematria_words(s: str, mapping='french_rank') -> list[int]:
     of given text. The gematria of the word is the
     sum of the value of each of its letters, following
     given mapping.
-    """
-    if not isinstance(mapping, dict) and mapping not in gematria_dict:
-        raise ValueError(f"'mapping' argument must be in: {set(gematria_dict.keys())}")
-    letter_to_value = gematria_dict[mapping]
-    words = to_words(s, letters_only=True)
 
-    gematria_list = []
-    for word in words:
-        sum = 0
-        for letter in word:
-            sum += letter_to_value[letter]
-        gematria_list.append(sum)
-    return gematria_list
+    Parameters
+    ----------
+    s : str or NormalizedText
+        Source text.
+    mapping : str or dict, optional
+        Name of a mapping in gematria_dict, or dict giving
+        the value of each (upper case) letter. Letters that
+        are not in the mapping are worth 0.
+        Defaults to 'french_rank'.
+    """
+    return _gematria_table(mapping).sums(to_words(s, letters_only=True))
 
 def gematria_lines(s: str, mapping='french_rank') -> list[int]:
     """
-    Return the gematria value for each word
-    of given text. The gematria of the word is the
-    sum of the value of each of its letters, following
-    given mapping.
+    Return the list of gematria value for each non-empty
+    line of given text.
+
+    See gematria_words() for the description of arguments.
     """
-    lines = to_lines(s)
-    gematria_list = [
-        gematria(line, mapping=mapping)
-        for line in lines if line
-    ]
-    return gematria_list
+    return _gematria_table(mapping).sums(to_lines(s, letters_only=True))
 
 
 ####
@@ -0,0 +1,230 @@
+"""
+This module contains functions to locate where a text breaks
+a constraint, as character offsets in the original text.
+"""
+from itertools import islice
+import re
+from typing import Iterator
+
+from .utils import (
+    Span, _consonants_table, _letters_table, _non_word_char, _okapi_table,
+    _parse_constraint, _prisoner_forbidden_char, _released_prisoner_char,
+    _turkish_forbidden_char, to_letters,
+)
+
+
+
+####
+# Utils
+####
+
+# Words, as found by to_words()
+_word_re = re.compile(f"[^{re.escape(_non_word_char)}]+")
+
+def _iter_words(s: str) -> Iterator[tuple]:
+    """
+    Yield the (offset, word, normalized word) of each word
+    of given text, lazily.
+    """
+    for match in _word_re.finditer(s):
+        word = match.group()
+        yield match.start(), word, word.translate(_letters_table)
+
+def _word_span(offset: int, word: str) -> Span:
+    return Span(offset, offset + len(word))
+
+
+####
+# Letters
+####
+
+def _locate_letters(s: str, is_valid) -> Iterator[Span]:
+    """
+    Yield the span of each character whose letters are
+    not valid for 'is_valid' (a predicate on strings).
+    """
+    for offset, word, letters in _iter_words(s):
+        if is_valid(letters):
+            continue
+        for i, c in enumerate(word):
+            if not is_valid(_letters_table[ord(c)]):
+                yield Span(offset + i, offset + i + 1)
+
+def _locate_lipogram(s: str, forbidden: str) -> Iterator[Span]:
+    return _locate_letters(s, frozenset(to_letters(forbidden)).isdisjoint)
+
+def _locate_beaupresent(s: str, ref: str) -> Iterator[Span]:
+    return _locate_letters(s, frozenset(to_letters(ref)).issuperset)
+
+def _locate_prisoner(s: str, allow_accent=True) -> Iterator[Span]:
+    forbidden_re = re.compile(f"[{re.escape(_prisoner_forbidden_char(allow_accent))}]")
+    for match in forbidden_re.finditer(s):
+        yield Span(match.start(), match.end())
+
+def _locate_heteroconsonantism(s: str) -> Iterator[Span]:
+    seen = set()
+    for offset, word, letters in _iter_words(s):
+        consonants = letters.translate(_consonants_table)
+        if len(set(consonants)) == len(consonants) and seen.isdisjoint(consonants):
+            seen.update(consonants)
+            continue
+        for i, c in enumerate(word):
+            consonants = _letters_table[ord(c)].translate(_consonants_table)
+            if not seen.isdisjoint(consonants) or len(set(consonants)) != len(consonants):
+                yield Span(offset + i, offset + i + 1)
+            seen.update(consonants)
+
+def _locate_okapi(s: str) -> Iterator[Span]:
+    """
+    Yield the span of each letter of the same kind (vowel
+    or consonant) as the previous one, and of each character
+    that is neither a vowel nor a consonant.
+    """
+    previous = None
+    for offset, word, letters in _iter_words(s):
+        # 'V' for vowels, 'C' for consonants, '?' otherwise
+        pattern = letters.translate(_okapi_table)
+        if ('?' not in pattern and 'VV' not in pattern and 'CC' not in pattern
+                and pattern[0] != previous):
+            previous = pattern[-1]
+            continue
+        for i, c in enumerate(word):
+            violation = False
+            for kind in _letters_table[ord(c)].translate(_okapi_table):
+                if previous is None and kind == '?':
+                    # (as check_okapi(), which does not check the first letter)
+                    kind = 'C'
+                if kind == '?' or kind == previous:
+                    violation = True
+                previous = kind
+            if violation:
+                yield Span(offset + i, offset + i + 1)
+
+
+####
+# Words
+####
+
+def _locate_words(s: str, is_valid) -> Iterator[Span]:
+    """
+    Yield the span of each word that is not valid for
+    'is_valid', a predicate on (word, normalized word).
+    """
+    for offset, word, letters in _iter_words(s):
+        if not is_valid(word, letters):
+            yield _word_span(offset, word)
+
+def _locate_pairs(s: str, is_valid) -> Iterator[Span]:
+    """
+    Yield the span of each word that is not valid, given
+    the previous one: 'is_valid' is a predicate on the
+    normalized words (previous, current).
+    """
+    previous = None
+    for offset, word, letters in _iter_words(s):
+        if previous is not None and not is_valid(previous, letters):
+            yield _word_span(offset, word)
+        previous = letters
+
+def _locate_tautogram(s: str, start_with=None) -> Iterator[Span]:
+    if start_with is not None:
+        if len(start_with) != 1:
+            raise ValueError("'start_with' must be only one character.")
+        start_with = start_with.upper()
+    for offset, word, letters in _iter_words(s):
+        if start_with is None:
+            start_with = letters[0]
+        if letters[0] != start_with:
+            yield _word_span(offset, word)
+
+def _locate_ngram(s: str, n=None) -> Iterator[Span]:
+    if n is not None and not isinstance(n, (int, list)):
+        raise ValueError("'n' argument must be an integer, or a list of integer.")
+    for offset, word, letters in _iter_words(s):
+        if n is None:
+            # All the words must have the length of the first one
+            n = len(word)
+        if isinstance(n, int):
+            valid = len(word) == n
+        else:
+            valid = len(word) in n
+        if not valid:
+            yield _word_span(offset, word)
+
+def _locate_maxgram(s: str, m: int) -> Iterator[Span]:
+    return _locate_words(s, lambda word, letters: len(word) <= m)
+
+def _locate_mingram(s: str, m: int) -> Iterator[Span]:
+    return _locate_words(s, lambda word, letters: len(word) >= m)
+
+def _locate_kyrielle(s: str) -> Iterator[Span]:
+    return _locate_pairs(s, lambda w1, w2: w1[-1] == w2[0])
+
+def _locate_sympathetic(s: str, min=1) -> Iterator[Span]:
+    return _locate_pairs(s, lambda w1, w2: sum(1 for c in w1 if c in w2) >= min)
+
+def _locate_snob(s: str) -> Iterator[Span]:
+    return _locate_pairs(s, lambda w1, w2: set(w1).isdisjoint(w2))
+
+
+####
+# Locator
+####
+
+# Locator of each constraint, by name
+_locators = {
+    'beaupresent': _locate_beaupresent,
+    'heteroconsonantism': _locate_heteroconsonantism,
+    'kyrielle': _locate_kyrielle,
+    'lipogram': _locate_lipogram,
+    'maxgram': _locate_maxgram,
+    'mingram': _locate_mingram,
+    'ngram': _locate_ngram,
+    'okapi': _locate_okapi,
+    'prisoner': _locate_prisoner,
+    'released_prisoner': lambda s: _locate_beaupresent(s, _released_prisoner_char),
+    'snob': _locate_snob,
+    'sympathetic': _locate_sympathetic,
+    'tautogram': _locate_tautogram,
+    'turkish': lambda s: _locate_lipogram(s, _turkish_forbidden_char),
+}
+
+def iter_violations(s: str, constraint) -> Iterator[Span]:
+    """
+    Yield the spans of given text that break a constraint,
+    lazily, in the order of the text.
+
+    See find_violations() for the description of arguments.
+    """
+    name, params = _parse_constraint(constraint)
+    if name not in _locators:
+        raise ValueError(f"Violations of {name!r} cannot be located.")
+    return _locators[name](str(s), **params)
+
+def find_violations(s: str, constraint, limit=None) -> list[Span]:
+    """
+    Return the spans of given text that break a constraint,
+    as (start, end) character offsets in the original text.
+
+    Letter constraints (lipogram, okapi, prisoner...) report
+    the offending characters; word constraints (tautogram,
+    kyrielle, snob...) report the offending words. The text
+    follows the constraint if no violation is found.
+
+    Parameters
+    ----------
+    s : str or NormalizedText
+        Source text.
+    constraint : str or tuple
+        Name of the constraint, or (name, parameters) tuple,
+        as in check_all().
+    limit : int, optional
+        Stop after this number of violations. By default,
+        find all of them.
+
+    Example
+    -------
+    >>> find_violations("Il était une fois", ("lipogram", {"forbidden": "e"}))
+    [Span(start=3, end=4), Span(start=11, end=12)]
+    """
+    return list(islice(iter_violations(s, constraint), limit))
@@ -0,0 +1,62 @@
+import unittest
+
+from src.utils import *
+from src.anagram import *
+
+
+class TestAnagramIndex(unittest.TestCase):
+    words = ["chien", "niche", "chine", "le", "el", "sel", "les", "ours", "rose", "oser", "été", "tee", "un", "lune"]
+
+    def test_signature(self):
+        self.assertEqual(signature("Chiné !"), "CEHIN")
+        self.assertEqual(signature("Œuf"), "EFOU")
+        self.assertEqual(signature(""), "")
+
+    def test_anagrams(self):
+        index = AnagramIndex(self.words)
+        self.assertEqual(index.anagrams("Chiné"), ["chien", "niche", "chine"])
+        self.assertEqual(index.anagrams("Été"), ["été", "tee"])
+        self.assertEqual(index.anagrams("xyz"), [])
+        for word in ["chien", "rose", "tee"]:
+            self.assertEqual(index.anagrams(word), [w for w in self.words if check_anagram(w, word)])
+
+    def test_subanagrams(self):
+        index = AnagramIndex(self.words)
+        self.assertEqual(index.subanagrams("Le sel"), ["le", "el", "sel", "les"])
+        for s in ["Le sel", "Une chienne rose", "Georges Perec"]:
+            self.assertEqual(index.subanagrams(s), [w for w in self.words if check_subanagram(w, s)])
+
+    def test_multi_anagrams(self):
+        index = AnagramIndex(self.words)
+        self.assertEqual(
+            sorted(index.multi_anagrams("Le sel")),
+            [("les", "el"), ("les", "le"), ("sel", "el"), ("sel", "le")],
+        )
+        self.assertEqual(list(index.multi_anagrams("rose")), [("rose",), ("oser",)])
+        self.assertEqual(list(index.multi_anagrams("")), [])
+        self.assertEqual(list(index.multi_anagrams("rosex")), [])
+        solutions = list(index.multi_anagrams("Chien, rose, lune"))
+        self.assertIn(("chien", "rose", "lune"), solutions)
+        for solution in solutions:
+            self.assertTrue(check_anagram(" ".join(solution), "Chien, rose, lune"))
+        # Each set of words is found once
+        self.assertEqual(len(solutions), len({tuple(sorted(s)) for s in solutions}))
+
+    def test_other_characters(self):
+        words = ["a1", "ba", "b2", "2a", "a-b", "2"]
+        index = AnagramIndex(words)
+        for s in ["a2", "ab2", "b-a", "1"]:
+            self.assertEqual(index.subanagrams(s), [w for w in words if check_subanagram(w, s)])
+            for solution in index.multi_anagrams(s):
+                self.assertTrue(check_anagram(" ".join(solution), s))
+        self.assertEqual(index.subanagrams("a2"), ["2a", "2"])
+        self.assertEqual(sorted(index.multi_anagrams("ab2")), [("a-b", "2"), ("ba", "2")])
+
+    def test_max_words(self):
+        index = AnagramIndex(self.words)
+        self.assertEqual(list(index.multi_anagrams("elle", max_words=1)), [])
+        self.assertEqual(list(index.multi_anagrams("elle", max_words=2)), [("le", "le"), ("le", "el"), ("el", "el")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from benchmarks.corpora import corpora, generate
+from benchmarks.run import compare, parse_size, public_functions, run, scaling_slope
+
+
+class TestCorpora(unittest.TestCase):
+
+    def test_generate(self):
+        for kind in corpora:
+            text = generate(kind, 1000)
+            self.assertEqual(len(text), 1000)
+            self.assertEqual(text, generate(kind, 1000))
+        self.assertNotEqual(generate('french', 1000), generate('french', 1000, seed=1))
+        self.assertIn('œ', generate('ligatures', 1000))
+        self.assertEqual(generate('plain', 0), "")
+        with self.assertRaises(ValueError):
+            generate('unknown', 10)
+
+
+class TestRun(unittest.TestCase):
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("100"), 100)
+        self.assertEqual(parse_size("10KB"), 10**4)
+        self.assertEqual(parse_size(" 2 mb "), 2 * 10**6)
+        self.assertEqual(parse_size("1GB"), 10**9)
+        for size in ["", "KB", "1TB", "1.5MB"]:
+            with self.assertRaises(ValueError):
+                parse_size(size)
+
+    def test_scaling_slope(self):
+        self.assertAlmostEqual(scaling_slope([(10, 1), (100, 10), (1000, 100)]), 1)
+        self.assertAlmostEqual(scaling_slope([(10, 1), (100, 100)]), 2)
+        self.assertAlmostEqual(scaling_slope([(10, 5), (1000, 5)]), 0)
+        self.assertIsNone(scaling_slope([(10, 1)]))
+        self.assertIsNone(scaling_slope([(10, 1), (10, 2)]))
+        # Null times are ignored
+        self.assertIsNone(scaling_slope([(10, 0), (100, 1)]))
+
+    def test_compare(self):
+        def results(*measures):
+            return {'results': [
+                {'function': f, 'corpus': 'plain', 'size': 100, 'seconds': t} for f, t in measures
+            ] + [{'function': 'failed', 'corpus': 'plain', 'size': 100, 'error': "TypeError"}]}
+
+        before = results(('a', 1.), ('b', 1.), ('c', 1.), ('d', 0.))
+        after = results(('a', 1.2), ('b', 2.), ('c', 0.5), ('d', 1.), ('e', 9.))
+        self.assertEqual(compare(before, after), [('b', 'plain', 100, 2.)])
+        self.assertEqual(compare(before, after, threshold=1.1), [('a', 'plain', 100, 1.2), ('b', 'plain', 100, 2.)])
+        self.assertEqual(compare(after, after), [])
+
+    def test_public_functions(self):
+        functions = public_functions()
+        self.assertIn('check_lipogram', functions)
+        self.assertNotIn('clear_normalization_cache', functions)
+        self.assertNotIn('configure_normalization_cache', functions)
+        self.assertFalse(any(name.startswith('_') for name in functions))
+        text = generate('french', 200)
+        for name, function in functions.items():
+            with self.subTest(name=name):
+                function(text)
+
+    def test_run(self):
+        results = run({'len': len}, ['plain'], [100, 1000], min_time=0, memory=False)
+        self.assertEqual([(r['function'], r['size']) for r in results['results']], [('len', 100), ('len', 1000)])
+        self.assertIn('len/plain', results['slopes'])
+        results = run({'fail': lambda s: 1 / 0}, ['plain'], [100, 1000], min_time=0)
+        self.assertEqual(len(results['results']), 1)
+        self.assertTrue(results['results'][0]['error'].startswith("ZeroDivisionError"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+from itertools import permutations
+import random
+import unittest
+
+from src.utils import *
+from src.chains import *
+
+
+class TestKyrielleIndex(unittest.TestCase):
+    words = [
+        "oulipo", "opéra", "arbre", "étoile", "élan", "nuit", "tour", "rose", "été",
+        "arc-en-ciel", "porte-étendard", "lune", "eau", "usine", "œuf", "figue", "2e",
+    ]
+
+    def test_arcs(self):
+        index = KyrielleIndex(self.words)
+        self.assertEqual(index.arcs["O", "O"], [0])
+        self.assertEqual(index.arcs["O", "F"], [14])
+        self.assertEqual(index.arcs["2", "E"], [16])
+        # "arc-en-ciel" is not a kyrielle, "porte-étendard" is
+        self.assertNotIn(9, [i for words in index.arcs.values() for i in words])
+        self.assertEqual(index.arcs["P", "D"], [10])
+
+    def test_longest(self):
+        index = KyrielleIndex(self.words)
+        chain = index.longest()
+        self.assertTrue(check_kyrielle(' '.join(chain)))
+        self.assertEqual(len(set(chain)), len(chain))
+        self.assertEqual(len(chain), 11)
+        chain = index.longest(lipogram="N")
+        self.assertTrue(check_kyrielle(' '.join(chain)))
+        self.assertTrue(all(check_lipogram(w, "N") for w in chain))
+        self.assertEqual(KyrielleIndex([]).longest(), [])
+        self.assertEqual(KyrielleIndex(["ab", "cd"]).longest(), ["ab"])
+        self.assertEqual(KyrielleIndex(["a", "ab", "cdb"]).longest(), ["a", "ab"])
+        self.assertEqual(KyrielleIndex(["cdb", "ab", "db", "c"]).longest(), ["c", "cdb"])
+
+    def test_longest_brute_force(self):
+        def longest(words, last=None, used=()):
+            return max((
+                1 + longest(words, w[-1], used + (w,))
+                for w in words if w not in used and (last is None or w[0] == last)
+            ), default=0)
+
+        rng = random.Random(0)
+        for _ in range(300):
+            words = ["".join(rng.choices("abcde", k=rng.randint(1, 3))) for _ in range(rng.randint(0, 9))]
+            chain = KyrielleIndex(words).longest()
+            self.assertEqual(len(set(chain)), len(chain))
+            self.assertTrue(not chain or check_kyrielle(' '.join(chain)))
+            self.assertEqual(len(chain), longest(list(dict.fromkeys(words))), words)
+
+    def test_kyrielles(self):
+        index = KyrielleIndex(self.words)
+        words = [w for w in self.words if w != "arc-en-ciel"]
+        for n in range(1, 4):
+            expected = [list(p) for p in permutations(words, n) if check_kyrielle(' '.join(p))]
+            self.assertEqual(sorted(index.kyrielles(n)), sorted(expected))
+        self.assertEqual(list(index.kyrielles(3, start="n", ngram=[4, 5])), [["nuit", "tour", "rose"]])
+        self.assertEqual(list(index.kyrielles(3, end="e", ngram=[4, 5])), [["nuit", "tour", "rose"]])
+        self.assertEqual(list(index.kyrielles(2, start="É", end="E")), [["étoile", "été"], ["été", "étoile"], ["eau", "usine"]])
+        self.assertEqual(list(index.kyrielles(0)), [])
+
+
+class TestLetterSharingIndex(unittest.TestCase):
+    words = ["fenouil", "ça", "quel", "gras", "un", "cuit", "anna", "nil", "nul", "ah", "arc-en-ciel", "a2", "b2"]
+
+    def test_snob_chains(self):
+        index = LetterSharingIndex(self.words)
+        words = [w for w in self.words if w != "arc-en-ciel"]
+        for n in range(1, 4):
+            expected = [list(p) for p in permutations(words, n) if check_snob(' '.join(p))]
+            self.assertEqual(sorted(index.snob_chains(n)), sorted(expected))
+        self.assertIn(["ça", "quel", "gras", "fenouil"], list(index.snob_chains(4, start="ça")))
+        self.assertNotIn(["ça", "fenouil", "ça", "quel"], list(index.snob_chains(4, start="ça")))
+        for chain in index.snob_chains(3, start="Ça", lipogram="E"):
+            self.assertTrue(check_snob(' '.join(chain)))
+            self.assertTrue(check_lipogram(' '.join(chain[1:]), "E"))
+        self.assertEqual(list(index.snob_chains(0)), [])
+
+    def test_sympathetic_chains(self):
+        index = LetterSharingIndex(self.words)
+        words = [w for w in self.words if w != "arc-en-ciel"]
+        for n in range(1, 4):
+            for min in range(4):
+                expected = [list(p) for p in permutations(words, n) if check_sympathetic(' '.join(p), min)]
+                self.assertEqual(sorted(index.sympathetic_chains(n, min)), sorted(expected))
+        self.assertEqual(list(index.sympathetic_chains(2, min=2, start="nil")), [["nil", "fenouil"], ["nil", "nul"]])
+        self.assertNotIn(["anna", "anna"], list(index.sympathetic_chains(2, start="anna")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+from itertools import combinations
+import unittest
+
+from src.utils import *
+from src.compose import *
+from src.compose import _covers, _is_irredundant, _union
+
+
+class TestCovers(unittest.TestCase):
+
+    def test_covers(self):
+        masks = [0b0011, 0b0110, 0b1100, 0b1000, 0b0001, 0b1111, 0b0101]
+        covers = list(_covers(0b1111, masks, 3))
+        expected = [
+            list(c) for n in range(1, 4) for c in combinations(masks, n)
+            if _union(c) == 0b1111 and _is_irredundant(list(c))
+        ]
+        self.assertEqual(sorted(map(sorted, covers)), sorted(map(sorted, expected)))
+        # Smallest first
+        self.assertEqual(covers[0], [0b1111])
+        self.assertEqual([len(c) for c in covers], sorted(len(c) for c in covers))
+        self.assertEqual(list(_covers(0b1111, [0b0011, 0b0100], 3)), [])
+        self.assertEqual(list(_covers(0, masks, 3)), [[]])
+
+
+class TestComposer(unittest.TestCase):
+    words = [
+        "Georges", "Perec", "grèce", "pro", "ogre", "cep", "sec", "porc", "gros",
+        "rose", "pré", "2e", "zèbre", "jambe",
+        # Lines of a belle absente on "Ane"
+        "fjord", "vingt", "plomb", "chaux", "quais", "quiches", "vigies", "quête",
+        "dwarf", "ciel", "jaugé", "nymphe",
+    ]
+
+    def test_beau_present_lines(self):
+        composer = Composer(self.words)
+        ref = "Georges Perec"
+        lines = list(composer.beau_present_lines(ref, max_words=2))
+        # Same lines as a brute force search, fewest words first
+        words = [w for w in self.words if check_beaupresent(w, ref)]
+        expected = [
+            c for n in (1, 2) for c in combinations(words, n)
+            if set(to_letters(' '.join(c))) == set(to_letters(ref))
+            and _is_irredundant([letter_mask(w) for w in c])
+        ]
+        self.assertEqual(sorted(sorted(line.split()) for line in lines), sorted(map(sorted, expected)))
+        self.assertEqual([len(line.split()) for line in lines], sorted(len(line.split()) for line in lines))
+        self.assertEqual(lines[0], "Georges Perec")
+        self.assertNotIn("2e", ' '.join(composer.beau_present_lines(ref, max_words=4)))
+        self.assertEqual(list(composer.beau_present_lines("Zazie")), [])
+
+    def test_belle_absente_lines(self):
+        composer = Composer(self.words)
+        lines = list(composer.belle_absente_lines("a", max_words=5))
+        self.assertIn(["fjord", "plomb", "quiches", "vingt"], [sorted(line.split()) for line in lines])
+        for line in lines:
+            self.assertTrue(check_belleabsente(line, "A"))
+        self.assertEqual(list(composer.belle_absente_lines("k", max_words=2)), [])
+        with self.assertRaises(ValueError):
+            composer.belle_absente_lines("ab")
+
+    def test_belle_absente(self):
+        composer = Composer(self.words)
+        poem = composer.belle_absente("Ane", max_words=5)
+        self.assertIsNotNone(poem)
+        self.assertEqual(len(poem.split('\n')), 3)
+        self.assertTrue(check_belleabsente(poem, "Ane"))
+        for i, line in composer.iter_belle_absente("Ane", max_words=5):
+            self.assertTrue(check_belleabsente(line, "ANE"[i]))
+        # No line without a V
+        self.assertIsNone(composer.belle_absente("Ave", max_words=5))
+        self.assertIsNone(Composer(self.words[:14]).belle_absente("Ane", timeout=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import contextlib
+import io
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.utils import *
+from src.corpus import *
+
+
+class TestCheckCorpus(unittest.TestCase):
+    documents = [
+        "Fenouil furibond faisant finement fi !",
+        "Il était une fois...",
+        "Parfois, j'ai froid.",
+        "",
+    ] * 5
+    constraints = ["tautogram", ("lipogram", {"forbidden": "e"})]
+
+    def expected(self):
+        return [(i, check_all(d, self.constraints)) for i, d in enumerate(self.documents)]
+
+    def test_single_process(self):
+        results = check_corpus(self.documents, self.constraints, workers=1)
+        self.assertEqual(list(results), self.expected())
+
+    def test_ordered(self):
+        results = check_corpus(self.documents, self.constraints, workers=2, batch_size=3)
+        self.assertEqual(list(results), self.expected())
+
+    def test_unordered(self):
+        results = check_corpus(self.documents, self.constraints, workers=2, batch_size=3, ordered=False)
+        self.assertEqual(sorted(results), self.expected())
+
+    def test_compiled_constraints(self):
+        constraints = [
+            compile_constraint("lipogram", forbidden="e") | compile_constraint("tautogram"),
+            ~compile_constraint("pangram"),
+            compile_constraint("lipogram", forbidden="a"),
+        ]
+        expected = [(i, check_all(d, constraints)) for i, d in enumerate(self.documents)]
+        for workers in (1, 2):
+            results = check_corpus(self.documents, constraints, workers=workers, batch_size=3)
+            self.assertEqual(list(results), expected)
+
+    def test_stateful_scans(self):
+        # Scans prepared once per worker must not keep the state of previous documents
+        documents = ["Été, le berger est entré", "Oh, pomme", "Gros gras", "Kayak akène", "tata toto"] * 3
+        constraints = [
+            "monovocalism", "heteroconsonantism", "tautogram", "ngram", "okapi", "kyrielle",
+            "pangram", ("acrostic", {"ref": "OP", "by_words": True}), "palindrom",
+        ]
+        expected = [(i, check_all(d, constraints)) for i, d in enumerate(documents)]
+        self.assertEqual(list(check_corpus(documents, constraints, workers=1, batch_size=4)), expected)
+        self.assertEqual(list(check_corpus(documents[::-1], constraints, workers=1)), [
+            (i, results) for i, (_, results) in enumerate(expected[::-1])
+        ])
+
+    def test_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i, document in enumerate(self.documents[:4]):
+                path = Path(directory, f"{i}.txt")
+                path.write_text(document, encoding='utf-8')
+                paths.append(path)
+            results = check_corpus(paths, self.constraints, workers=2)
+            self.assertEqual(list(results), self.expected()[:4])
+
+            # Script
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                main(["-c", "tautogram", "-c", "lipogram:forbidden=e", "-w", "1"] + [str(p) for p in paths])
+            self.assertEqual(
+                output.getvalue().splitlines()[0],
+                f"{paths[0]}\tTrue\tFalse"
+            )
+
+    def test_parse_constraint(self):
+        self.assertEqual(parse_constraint("pangram"), ("pangram", {}))
+        self.assertEqual(parse_constraint("lipogram:forbidden=E"), ("lipogram", {"forbidden": "E"}))
+        self.assertEqual(parse_constraint("ngram:n=[5, 7]"), ("ngram", {"n": [5, 7]}))
+        with self.assertRaises(ValueError):
+            parse_constraint("unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
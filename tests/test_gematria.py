@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from src.utils import *
+from src.gematria import *
+
+
+class TestGematriaIndex(unittest.TestCase):
+    words = ["fenouil", "Fenouil !", "oulipo", "Perec", "été", "kayak", "roi", "CIVIL"]
+
+    def test_find(self):
+        index = GematriaIndex(self.words)
+        self.assertEqual(index.find(82), ["fenouil", "Fenouil !"])
+        self.assertEqual(index.find(0), [])
+        self.assertEqual(index.find(157, mapping='roman_numeral'), ["CIVIL"])
+        for mapping in ["french_rank", "scrabble_fr"]:
+            for word in self.words:
+                self.assertIn(word, index.find(gematria(word, mapping), mapping=mapping))
+        with self.assertRaises(ValueError):
+            index.find(82, mapping='unknown')
+
+    def test_find_range(self):
+        index = GematriaIndex(self.words, mappings=['french_rank'])
+        values = {word: gematria(word) for word in self.words}
+        self.assertEqual(
+            index.find_range(40, 82),
+            sorted((w for w in self.words if 40 <= values[w] <= 82), key=values.get),
+        )
+        self.assertEqual(index.find_range(83, 40), [])
+        self.assertEqual(len(index.find_range(0, 1000)), len(self.words))
+
+    def test_custom_mapping(self):
+        index = GematriaIndex(self.words, mappings={'vowels': {c: 1 for c in vowels_char}})
+        self.assertEqual(index.find(3, mapping='vowels'), ["kayak"])
+
+    def test_phrases(self):
+        index = GematriaIndex(self.words + ["paris", "pipo", "pie", "lune"], mappings=['french_rank'])
+        phrases = list(index.phrases(164, max_words=2))
+        self.assertIn(("fenouil", "fenouil"), phrases)
+        self.assertIn(("fenouil", "Fenouil !"), phrases)
+        for phrase in index.phrases(112, max_words=3):
+            self.assertLessEqual(len(phrase), 3)
+            self.assertEqual(gematria(" ".join(phrase)), 112)
+        # Each set of words is found once
+        phrases = list(index.phrases(112, max_words=3))
+        self.assertEqual(len(phrases), len({tuple(sorted(p)) for p in phrases}))
+        self.assertEqual(list(index.phrases(1)), [])
+
+    def test_phrases_constraints(self):
+        index = GematriaIndex(self.words + ["paris", "pipo", "pie", "lune"], mappings=['french_rank'])
+        for constraints in [
+            [('lipogram', {'forbidden': 'e'})],
+            [('tautogram', {'start_with': 'p'})],
+            ['tautogram'],
+            ['heterogram'],
+        ]:
+            expected = [
+                p for p in index.phrases(112, max_words=3)
+                if all(check_all(" ".join(p), constraints))
+            ]
+            self.assertEqual(list(index.phrases(112, max_words=3, constraints=constraints)), expected)
+        phrases = list(index.phrases(116, max_words=3, constraints=[('tautogram', {'start_with': 'p'})]))
+        self.assertEqual(phrases, [("pie", "pie", "pipo")])
+
+    def test_save_load(self):
+        index = GematriaIndex(self.words, mappings=['french_rank', 'scrabble_fr'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.json")
+            index.save(path)
+            loaded = GematriaIndex.load(path)
+        self.assertEqual(loaded.words, index.words)
+        self.assertEqual(loaded.values, index.values)
+        self.assertEqual(loaded.find_range(0, 100, mapping='scrabble_fr'), index.find_range(0, 100, mapping='scrabble_fr'))
+        self.assertEqual(loaded.using_only("kay"), ["kayak"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from src.utils import *
+from src.incremental import *
+from src import incremental
+
+
+class TestIncrementalChecker(unittest.TestCase):
+    def test_edits(self):
+        checker = IncrementalChecker("fenouil")
+        checker.insert(0, "Un ")
+        checker.replace(3, 1, "F")
+        checker.delete(9, 1)
+        self.assertEqual(checker.text, "Un Fenoui")
+        self.assertEqual(checker.counter, letter_counter("Un Fenoui"))
+        with self.assertRaises(ValueError):
+            checker.delete(5, 10)
+
+    def test_chunks(self):
+        # Small chunks, to edit across several of them
+        chunk_size, incremental._chunk_size = incremental._chunk_size, 8
+        try:
+            rng = random.Random(0)
+            checker = IncrementalChecker("Parfois, j'ai froid. " * 5)
+            text = checker.text
+            for _ in range(300):
+                offset = rng.randint(0, len(text))
+                length = rng.randint(0, min(20, len(text) - offset))
+                s = ''.join(rng.choices("aé œ,", k=rng.randint(0, 12)))
+                checker.replace(offset, length, s)
+                text = text[:offset] + s + text[offset+length:]
+                self.assertEqual(len(checker), len(text))
+                self.assertEqual(checker.text, text)
+                self.assertTrue(all(0 < len(chunk) <= 8 for chunk in checker._chunks))
+            self.assertEqual(checker.counter, letter_counter(text))
+        finally:
+            incremental._chunk_size = chunk_size
+
+    def test_lipogram(self):
+        checker = IncrementalLipogram("e", "Parfois, j'ai froid.")
+        self.assertTrue(checker.check())
+        checker.insert(8, " et")
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, {"E"})
+        checker.replace(9, 1, "ê")
+        self.assertFalse(checker.check()) # Not sensitive to accents
+        checker.delete(8, 3)
+        self.assertTrue(checker.check())
+        self.assertEqual(checker.text, "Parfois, j'ai froid.")
+
+    def test_monovocalism(self):
+        checker = IncrementalMonovocalism(text="Être et n'être")
+        self.assertTrue(checker.check())
+        checker.insert(0, "Ah ! ")
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, {"A", "E"})
+        checker.delete(0, 5)
+        self.assertTrue(checker.check())
+        checker = IncrementalMonovocalism("a", "Être")
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, {"E"})
+        checker.replace(0, 4, "Papa")
+        self.assertTrue(checker.check())
+        checker.delete(0, 4)
+        self.assertFalse(checker.check()) # Target vowel not used
+
+    def test_heteroconsonantism(self):
+        checker = IncrementalHeteroconsonantism("fenouil")
+        self.assertTrue(checker.check())
+        checker.insert(7, " fin")
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, {"F", "N"})
+        checker.replace(8, 1, "p")
+        self.assertEqual(checker.violations, {"N"})
+
+    def test_anagram(self):
+        checker = IncrementalAnagram("Marie", "")
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, set("MARIE"))
+        checker.insert(0, "aimer")
+        self.assertTrue(checker.check())
+        checker.insert(5, "s")
+        self.assertEqual(checker.violations, {"S"})
+
+    def test_pangram(self):
+        checker = IncrementalPangram(text="Portez ce vieux whisky au juge blond qui fume")
+        self.assertTrue(checker.check())
+        checker.delete(0, 1)
+        self.assertFalse(checker.check())
+        self.assertEqual(checker.violations, {"P"})
+        checker = IncrementalPangram(alphabet="AAB")
+        checker.insert(0, "ba")
+        self.assertEqual(checker.violations, {"A"})
+        checker.insert(2, "à")
+        self.assertTrue(checker.check())
+
+    def test_matches_checkers(self):
+        edits = [(0, 0, "Il était"), (8, 0, " une fois"), (3, 5, "es"), (0, 2, "Ô"), (4, 0, "...")]
+        checkers = [
+            (IncrementalLipogram("u"), lambda s: check_lipogram(s, "u")),
+            (IncrementalMonovocalism(), check_monovocalism),
+            (IncrementalHeteroconsonantism(), check_heteroconsonantism),
+            (IncrementalAnagram("Il est une fois"), lambda s: check_anagram(s, "Il est une fois")),
+            (IncrementalPangram("aeiou"), lambda s: check_pangram(s, "aeiou")),
+        ]
+        for offset, length, s in edits:
+            for checker, check in checkers:
+                checker.replace(offset, length, s)
+                self.assertEqual(checker.check(), check(checker.text))
+
+
+if __name__ == '__main__':
+    unittest.main()
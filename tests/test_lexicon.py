@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+from src.utils import *
+from src.lexicon import *
+
+
+class TestLexicon(unittest.TestCase):
+    words = ["fenouil", "kayak", "parfois", "froid", "été", "œuf", "positif", "effaré", "2e", "a2"]
+
+    def test_build(self):
+        lexicon = Lexicon(self.words + ["kayak"])
+        self.assertEqual(len(lexicon), len(self.words))
+        self.assertIn("kayak", lexicon)
+        self.assertEqual(list(lexicon), self.words)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(self.words) + "\n\n")
+            self.assertEqual(Lexicon.from_file(path).words, self.words)
+
+    def test_avoiding(self):
+        lexicon = Lexicon(self.words)
+        self.assertEqual(lexicon.avoiding("e"), ["kayak", "parfois", "froid", "positif", "a2"])
+        self.assertEqual(lexicon.avoiding("ea"), ["froid", "positif"])
+        self.assertEqual(lexicon.avoiding("2"), [w for w in self.words if check_lipogram(w, "2")])
+
+    def test_using_only(self):
+        lexicon = Lexicon(self.words)
+        self.assertEqual(lexicon.using_only("Gilles Esposito-Farèse"), ["parfois", "été", "positif", "effaré"])
+        self.assertEqual(lexicon.using_only("ea2"), ["2e", "a2"])
+        self.assertEqual(lexicon.using_only(""), [])
+
+    def test_containing(self):
+        lexicon = Lexicon(self.words)
+        self.assertEqual(lexicon.containing("of"), ["fenouil", "parfois", "froid", "œuf", "positif"])
+        self.assertEqual(lexicon.containing("ef"), ["fenouil", "œuf", "effaré"])
+
+    def test_matches_checkers(self):
+        lexicon = Lexicon(self.words)
+        for letters in ["e", "ai", "kay", "Georges Perec"]:
+            self.assertEqual(lexicon.avoiding(letters), [w for w in self.words if check_lipogram(w, letters)])
+            self.assertEqual(lexicon.using_only(letters), [w for w in self.words if check_beaupresent(w, letters)])
+
+    def test_search(self):
+        lexicon = Lexicon(self.words + ["pore", "gros", "sorgo", "ego", "reg"])
+        self.assertEqual(list(lexicon.search(lipogram="E", beaupresent="Georges Perec", mingram=4)), ["gros", "sorgo"])
+        self.assertEqual(list(lexicon.search(ngram=5, okapi=False)), ["kayak", "froid", "sorgo"])
+        self.assertEqual(list(lexicon.search(monovocalism="e")), ["été", "2e", "reg"])
+        self.assertEqual(list(lexicon.search(ngram=[2, 3], lipogram="2")), ["été", "œuf", "ego", "reg"])
+        self.assertEqual(list(lexicon.search(pangram={'alphabet': "fio"})), ["fenouil", "parfois", "froid", "positif"])
+        self.assertEqual(list(lexicon.search()), lexicon.words)
+        # 'ÿ' has no descender, unlike 'y'
+        self.assertEqual(list(Lexicon(["moÿen", "moyen"]).search(prisoner=True)), ["moÿen"])
+        with self.assertRaises(ValueError):
+            list(lexicon.search(unknown=True))
+        with self.assertRaises(ValueError):
+            list(lexicon.search(okapi="E"))
+
+    def test_search_negation(self):
+        lexicon = Lexicon(self.words + ["22"])
+        self.assertEqual(list(lexicon.search(lipogram=("E", False))), ["fenouil", "été", "œuf", "effaré", "2e"])
+        self.assertEqual(list(lexicon.search(lipogram=({'forbidden': "E"}, False), ngram=3)), ["été", "œuf"])
+        self.assertEqual(list(lexicon.search(okapi=False)), ["fenouil", "kayak", "parfois", "froid", "œuf", "effaré"])
+        with self.assertRaises(ValueError):
+            list(lexicon.search(lipogram=False))
+        with self.assertRaises(ValueError):
+            list(lexicon.search(lipogram=(True, False)))
+        # check_okapi() raises an error on "a2" and "22": they are skipped
+        with self.assertRaises(RuntimeError):
+            check_okapi("22")
+        self.assertEqual(list(lexicon.search(okapi=True)), ["été", "positif", "2e"])
+
+    def test_search_subclasses(self):
+        from src.anagram import AnagramIndex
+        from src.chains import KyrielleIndex, LetterSharingIndex
+        from src.compose import Composer
+        from src.gematria import GematriaIndex
+        from src.trie import LetterTrie
+        expected = list(Lexicon(self.words).search(lipogram="e", ngram=[2, 6]))
+        for cls in (AnagramIndex, GematriaIndex, LetterTrie, KyrielleIndex, LetterSharingIndex, Composer):
+            with self.subTest(cls=cls.__name__):
+                self.assertEqual(list(cls(self.words).search(lipogram="e", ngram=[2, 6])), expected)
+
+    def test_plan(self):
+        lexicon = Lexicon(self.words)
+        plan = lexicon.plan(okapi=True, lipogram="E", ngram=7, beaupresent="Georges Perec")
+        self.assertEqual([step[0] for step in plan][-1], 'okapi')
+        self.assertEqual({step[0]: step[3] for step in plan}, {
+            'okapi': 'check', 'lipogram': 'mask', 'ngram': 'length', 'beaupresent': 'mask',
+        })
+        self.assertIn(('lipogram', {'forbidden': "E"}, True, 'mask'), plan)
+
+    def test_search_matches_checkers(self):
+        lexicon = Lexicon(self.words)
+        queries = [
+            ({'lipogram': "e"}, lambda w: check_lipogram(w, "e")),
+            ({'beaupresent': "Georges Perec", 'maxgram': 5},
+             lambda w: check_beaupresent(w, "Georges Perec") and check_maxgram(w, 5)),
+            ({'turkish': False}, lambda w: not check_turkish(w)),
+            ({'prisoner': True, 'ngram': None}, lambda w: check_prisoner(w) and check_ngram(w)),
+            ({'monovocalism': {'vowel': "o"}}, lambda w: check_monovocalism(w, vowel="o")),
+            ({'palindrom': True, 'mingram': 5}, lambda w: check_palindrom(w) and check_mingram(w, 5)),
+        ]
+        for query, check in queries:
+            self.assertEqual(list(lexicon.search(**query)), [w for w in self.words if check(w)])
+
+
+if __name__ == '__main__':
+    unittest.main()
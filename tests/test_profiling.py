@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from src import profiling, utils
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_enable_disable(self):
+        check_lipogram = utils.check_lipogram
+        profiling.enable()
+        self.assertTrue(profiling.is_enabled())
+        self.assertIsNot(utils.check_lipogram, check_lipogram)
+        self.assertIs(utils.constraint_checkers['lipogram'], utils.check_lipogram)
+        profiling.disable()
+        self.assertFalse(profiling.is_enabled())
+        self.assertIs(utils.check_lipogram, check_lipogram)
+        self.assertIs(utils.constraint_checkers['lipogram'], check_lipogram)
+        # Nothing is recorded when disabled
+        utils.check_lipogram("fenouil", "e")
+        self.assertEqual(profiling.snapshot(), {})
+
+    def test_snapshot(self):
+        profiling.enable()
+        for _ in range(10):
+            self.assertFalse(utils.check_lipogram("Il était une fois", "e"))
+        self.assertEqual(utils.check_all("Kayak", ["palindrom", ("lipogram", {"forbidden": "e"})]), [True, True])
+        data = profiling.snapshot()
+        stats = data['check_lipogram']
+        self.assertEqual(stats['calls'], 10)
+        self.assertEqual(stats['input_chars'], 10 * len("Il était une fois"))
+        self.assertEqual(stats['max_input_chars'], len("Il était une fois"))
+        self.assertGreater(stats['normalization_seconds'], 0)
+        self.assertAlmostEqual(stats['logic_seconds'], stats['seconds'] - stats['normalization_seconds'])
+        self.assertLessEqual(stats['p50'], stats['p99'])
+        self.assertEqual(sum(stats['histogram']), 10)
+        self.assertEqual(data['to_letters']['normalization_seconds'], data['to_letters']['seconds'])
+        # Checkers called by check_all() are recorded too
+        self.assertEqual(data['check_all']['calls'], 1)
+        self.assertEqual(data['check_palindrom']['calls'], 1)
+
+    def test_prometheus(self):
+        profiling.enable()
+        utils.gematria("fenouil")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "oulipy.prom")
+            profiling.write_prometheus(path)
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(os.listdir(directory), ["oulipy.prom"])
+        self.assertIn('oulipy_calls_total{function="gematria"} 1', lines)
+        self.assertIn('oulipy_call_seconds_bucket{function="gematria",le="+Inf"} 1', lines)
+        self.assertIn('oulipy_call_seconds_count{function="gematria"} 1', lines)
+        self.assertIn("# TYPE oulipy_call_seconds histogram", lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
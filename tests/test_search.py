@@ -0,0 +1,119 @@
+import unittest
+
+from src.utils import *
+from src.search import *
+
+
+class TestPalindroms(unittest.TestCase):
+    s = "Il dit : « Ésope reste ici et se repose. »"
+
+    def test_longest_palindrom(self):
+        span = longest_palindrom(self.s)
+        self.assertEqual(self.s[span.start:span.end], "Ésope reste ici et se repose")
+        span = longest_palindrom("Élu par cette crapule !")
+        self.assertEqual(span, Span(0, 21))
+        self.assertEqual(longest_palindrom("abc"), Span(0, 1))
+        self.assertIsNone(longest_palindrom(" ... "))
+
+    def test_find_palindroms(self):
+        spans = find_palindroms(self.s, min_length=3)
+        self.assertEqual([self.s[a:b] for a, b in spans], ["Ésope reste ici et se repose", "e re", "e re"])
+        self.assertEqual(find_palindroms(self.s, min_length=30), [])
+        self.assertEqual(find_palindroms("aa bb", min_length=2), [Span(0, 2), Span(3, 5)])
+
+    def test_matches_check_palindrom(self):
+        letters = "abcbaabbcacba"
+        for length in range(1, len(letters) + 1):
+            for start, end in find_palindroms(letters, min_length=length):
+                self.assertTrue(check_palindrom(letters[start:end]))
+                self.assertGreaterEqual(end - start, length)
+        longest = max(
+            (letters[i:j] for i in range(len(letters)) for j in range(i + 1, len(letters) + 1)
+             if check_palindrom(letters[i:j])),
+            key=len,
+        )
+        span = longest_palindrom(letters)
+        self.assertEqual(span.end - span.start, len(longest))
+
+    def test_ligatures(self):
+        # Ranges cutting "œ" are shrunk
+        self.assertEqual(longest_palindrom("aœ é"), Span(0, 1))
+        self.assertEqual(find_palindroms("œ ea", min_length=2), [])
+        # Neither "OE" nor "AE" is a palindrom, and their letters cannot be split
+        for s in ["œ", "Æ", "œ æ"]:
+            self.assertFalse(check_palindrom(s))
+            self.assertIsNone(longest_palindrom(s))
+        self.assertEqual(longest_palindrom("œ, éo"), Span(0, 5))
+        self.assertEqual(find_palindroms("Œ, sœur : rue Ossœ !", min_length=8), [Span(3, 16)])
+        for s in ["aœ é", "œ ea", "Œ, sœur : rue Ossœ !", "æ a æ ea", "Eæ"]:
+            for start, end in find_palindroms(s, min_length=1):
+                self.assertTrue(check_palindrom(s[start:end]), s[start:end])
+
+
+class TestHeterograms(unittest.TestCase):
+    s = "Ulcérations : sulcatioren, rules action... X ulcerations"
+
+    def test_find_anagram_windows(self):
+        windows = find_anagram_windows(self.s)
+        self.assertEqual(
+            [self.s[a:b] for a, b in windows],
+            ["Ulcérations", "sulcatioren", "n, rules actio", "rules action", "ulcerations"],
+        )
+        self.assertEqual(find_anagram_windows("Ultérations", ref="ULERATIONS" + "T"), [Span(0, 11)])
+        self.assertEqual(find_anagram_windows("abc", ref="abcd"), [])
+        # Windows cutting "œ" are skipped
+        self.assertEqual(find_anagram_windows("cœlu", ref="ELU"), [])
+        self.assertEqual(find_anagram_windows("cœlu", ref="OELU"), [Span(1, 4)])
+        with self.assertRaises(ValueError):
+            find_anagram_windows(self.s, ref="...")
+
+    def test_find_heterogram_runs(self):
+        runs = find_heterogram_runs(self.s)
+        self.assertEqual(
+            [self.s[a:b] for a, b in runs],
+            ["Ulcérations : sulcatioren, rules action", "n, rules actio", "ulcerations"],
+        )
+        self.assertEqual(find_heterogram_runs(self.s, min_chunks=2), [runs[0]])
+        self.assertEqual(find_heterogram_runs("ab ba ab", ref="ab"), [Span(0, 8)])
+        # Chunks cutting "œ" are dropped
+        self.assertEqual(find_heterogram_runs("eo eœ", ref="eo"), [Span(0, 2), Span(1, 5)])
+
+    def test_longest_heterogram_prefix(self):
+        span = longest_heterogram_prefix(self.s)
+        self.assertEqual(self.s[span.start:span.end], "Ulcérations : sulcatioren, rules action")
+        self.assertIsNone(longest_heterogram_prefix("X ulcerations"))
+        self.assertIsNone(longest_heterogram_prefix(""))
+        self.assertEqual(longest_heterogram_prefix("ab eœa", ref="abe"), Span(0, 4))
+        for s in ["ab ba", "ab ba a", "ab ab ba bb ab"]:
+            span = longest_heterogram_prefix(s, ref="ab")
+            self.assertTrue(check_heterogram(s[:span.end], ref="ab"))
+
+
+class TestPangrams(unittest.TestCase):
+
+    s = "Voix ambiguë d'un cœur qui, au zéphyr, préfère les jattes de kiwis."
+
+    def test_shortest_pangram(self):
+        span = shortest_pangram(self.s)
+        self.assertTrue(check_pangram(self.s[span.start:span.end]))
+        self.assertEqual(self.s[span.start:span.end], self.s[:-3])
+        self.assertIsNone(shortest_pangram("abc"))
+        span = shortest_pangram("a b a c b", alphabet="abc")
+        self.assertEqual(span, Span(2, 7))
+        # A letter given twice must be found twice
+        self.assertEqual(shortest_pangram("abcab", alphabet="aab"), Span(0, 4))
+        with self.assertRaises(ValueError):
+            shortest_pangram(self.s, alphabet="...")
+
+    def test_find_pangram_windows(self):
+        s = "abc, xxca, bca, cxxxb a"
+        windows = find_pangram_windows(s, k=5, alphabet="abc")
+        self.assertEqual([s[a:b] for a, b in windows], ["abc", "ca, b", "a, cxxxb"])
+        self.assertEqual(find_pangram_windows(s, alphabet="abc"), windows[:1])
+        self.assertEqual(find_pangram_windows("ab", k=3, alphabet="abc"), [])
+        for a, b in windows:
+            self.assertTrue(check_pangram(s[a:b], alphabet="abc"))
+
+
+if __name__ == '__main__':
+    unittest.main()
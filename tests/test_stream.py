@@ -0,0 +1,62 @@
+import io
+import unittest
+
+from src.utils import *
+from src.stream import *
+
+
+class TestReaders(unittest.TestCase):
+    def test_iter_chunks(self):
+        self.assertEqual(list(iter_chunks("")), [])
+        self.assertEqual(list(iter_chunks("fenouil", chunk_size=3)), ["fen", "oui", "l"])
+        self.assertEqual(list(iter_chunks(io.StringIO("fenouil"), chunk_size=4)), ["feno", "uil"])
+        # Accent split between two chunks of bytes
+        data = "déjà".encode()
+        self.assertEqual(''.join(iter_chunks([data[:2], data[2:]])), "déjà")
+        self.assertEqual(''.join(iter_chunks(io.BytesIO(data), chunk_size=1)), "déjà")
+        with self.assertRaises(UnicodeDecodeError):
+            list(iter_chunks([data[:2]]))
+
+    def test_iter_words(self):
+        self.assertEqual(list(iter_words([])), [])
+        # Word split between two chunks
+        self.assertEqual(
+            [w for words in iter_words(["Il ét", "ait une f", "ois,"]) for w in words],
+            ["Il", "était", "une", "fois"]
+        )
+        self.assertEqual(
+            [w for words in iter_words(io.StringIO("Œuvre, cæcum"), letters_only=True, chunk_size=2) for w in words],
+            ["OEUVRE", "CAECUM"]
+        )
+
+
+class TestConstraintChecker(unittest.TestCase):
+    def test_check_all_stream(self):
+        s = "Fenouil furibond faisant finement fi !"
+        constraints = ["tautogram", ("lipogram", {"forbidden": "e"}), ("ngram", {"n": [2, 7, 8]})]
+        self.assertEqual(check_all_stream(io.StringIO(s), constraints, chunk_size=5), check_all(s, constraints))
+        with self.assertRaises(ValueError):
+            check_all_stream(s, ["palindrom"])
+
+    def test_check_stream(self):
+        self.assertTrue(check_lipogram_stream(["Parfois, j'ai ", "froid."], "e"))
+        self.assertFalse(check_lipogram_stream(["fenou", "il"], "e"))
+        self.assertTrue(check_pangram_stream(io.StringIO(
+            "Portez ce vieux whisky au juge blond qui fume"
+        ), chunk_size=7))
+        self.assertFalse(check_pangram_stream(["fenouil"]))
+        self.assertTrue(check_okapi_stream(["Je me d", "is à mi-mot..."]))
+        self.assertFalse(check_okapi_stream(["Pata", "tra !"]))
+        self.assertTrue(check_kyrielle_stream(["Il lit t", "ôt"]))
+        self.assertFalse(check_kyrielle_stream(["Il lit ", "pas"]))
+        self.assertTrue(check_tautogram_stream(["Fenouil fu", "ribond"], start_with="f"))
+
+
+class TestStatistics(unittest.TestCase):
+    def test_letter_counter_stream(self):
+        data = "Œuvre déjà vue".encode()
+        self.assertEqual(letter_counter_stream(io.BytesIO(data), chunk_size=3), letter_counter("Œuvre déjà vue"))
+
+
+if __name__ == '__main__':
+    unittest.main()
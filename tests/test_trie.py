@@ -0,0 +1,60 @@
+import unittest
+
+from src.utils import *
+from src.trie import *
+
+
+class TestLetterTrie(unittest.TestCase):
+    words = [
+        "fenouil", "kayak", "parfois", "froid", "été", "ete", "œuf", "positif", "effaré",
+        "2e", "a2", "ami", "amie", "amical", "mur", "Mur", "cerise", "raser", "écume",
+    ]
+
+    def test_build(self):
+        trie = LetterTrie(self.words + ["kayak"])
+        self.assertEqual(len(trie), len(self.words))
+        self.assertEqual(trie.matching(), self.words)
+        self.assertEqual(list(trie.iter_matching()), sorted(self.words, key=to_letters))
+        # Shared beginnings share nodes
+        self.assertLess(trie.node_count, sum(len(to_letters(w)) for w in self.words))
+        self.assertEqual(LetterTrie([]).matching(), [])
+        self.assertEqual(LetterTrie(["", "-"]).matching(), ["", "-"])
+
+    def test_matching(self):
+        trie = LetterTrie(self.words)
+        self.assertEqual(trie.matching('okapi'), [
+            "été", "ete", "positif", "ami", "amical", "mur", "Mur", "cerise", "raser", "écume",
+        ])
+        # Only vowels and consonants are matched, words without letters are okapi
+        self.assertEqual(LetterTrie(["'", "", "2", "2e", "'e"]).matching('okapi'), ["'", "", "'e"])
+        self.assertEqual(trie.matching(('lipogram', {'forbidden': "ae"})), ["froid", "positif", "mur", "Mur"])
+        self.assertEqual(trie.matching(('monovocalism', {'vowel': "e"})), ["été", "ete", "2e"])
+        self.assertEqual(trie.matching('prisoner'), ["2e", "a2", "ami", "amie", "mur", "cerise", "raser", "écume"])
+        self.assertEqual(trie.matching('okapi', ('lipogram', {'forbidden': "a"}), 'prisoner'), ["mur", "cerise", "écume"])
+        # 'ÿ' has no descender, unlike 'y'
+        self.assertEqual(LetterTrie(["moÿen", "moyen"]).matching('prisoner'), ["moÿen"])
+        self.assertEqual(trie.matching(compile_constraint('beaupresent', ref="Marie")), ["ami", "amie"])
+        with self.assertRaises(ValueError):
+            trie.matching('pangram')
+        with self.assertRaises(ValueError):
+            trie.matching(('monovocalism', {'vowel': "b"}))
+
+    def test_matches_checkers(self):
+        constraints = [
+            'okapi', 'prisoner', ('prisoner', {'allow_accent': False}), 'monovocalism',
+            ('monovocalism', {'vowel': "I"}), 'released_prisoner', 'turkish',
+            ('lipogram', {'forbidden': "e2"}), ('beaupresent', {'ref': "Georges Perec"}),
+        ]
+        for constraint in constraints:
+            name, params = constraint if isinstance(constraint, tuple) else (constraint, {})
+            # check_okapi() fails on other characters than letters, and
+            # accepts them as first letter, unlike the trie
+            words = [w for w in self.words if name != 'okapi' or w not in ("a2", "2e")]
+            expected = [w for w in words if constraint_checkers[name](w, **params)]
+            trie = LetterTrie(words)
+            self.assertEqual(trie.matching(constraint), expected)
+            self.assertEqual(sorted(trie.iter_matching(constraint)), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
 import unittest
 
 from src.utils import *
+from src.utils import _gematria_table
 
 
 class TestUtils(unittest.TestCase):
@@ -18,6 +21,103 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(remove_accent("À-côtés"), "A-cotes")
         self.assertEqual(remove_accent("Deçà delà"), "Deca dela")
 
+    def test_remove_ligature(self):
+        self.assertEqual(remove_ligature(""), "")
+        self.assertEqual(remove_ligature("Œuvre"), "OEuvre")
+        self.assertEqual(remove_ligature("cæcum, cœur"), "caecum, coeur")
+
+    def test_to_letters(self):
+        self.assertEqual(to_letters(""), "")
+        self.assertEqual(to_letters("fenouil"), "FENOUIL")
+        self.assertEqual(to_letters("À-côtés !"), "ACOTES")
+        self.assertEqual(to_letters("Œuvre\tcæcum\n"), "OEUVRECAECUM")
+        self.assertEqual(to_letters("Straße"), "STRASSE") # Full case mapping
+        self.assertEqual(to_letters("Page 12"), "PAGE12") # Unknown characters are kept
+
+    def test_normalization_cache(self):
+        try:
+            configure_normalization_cache(maxsize=2, max_length=10)
+            self.assertEqual(to_letters("Œuvre d'été"), "OEUVREDETE") # Too long
+            self.assertEqual(to_letters("Été"), "ETE")
+            self.assertEqual(to_letters("Été"), "ETE")
+            self.assertEqual(to_words("Été, œuf", letters_only=True), ["ETE", "OEUF"])
+            words = to_words("Été, œuf", letters_only=True)
+            words.append("X") # Cached words are copied
+            self.assertEqual(to_words("Été, œuf", letters_only=True), ["ETE", "OEUF"])
+            info = normalization_cache_info()
+            self.assertEqual(info['to_letters']['hits'], 1)
+            self.assertEqual(info['to_letters']['misses'], 1)
+            self.assertEqual(info['to_words']['hits'], 2)
+            self.assertEqual(info['to_letters']['maxsize'], 2)
+            clear_normalization_cache()
+            self.assertEqual(normalization_cache_info()['to_letters']['currsize'], 0)
+            configure_normalization_cache(maxsize=0)
+            self.assertEqual(to_letters("Été"), "ETE")
+            self.assertEqual(normalization_cache_info()['to_letters']['currsize'], 0)
+        finally:
+            configure_normalization_cache()
+
+    def test_normalization_cache_threads(self):
+        words = [f"Été{i % 50}, œuf" for i in range(2000)]
+        try:
+            configure_normalization_cache(maxsize=16)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(to_letters, words))
+        finally:
+            configure_normalization_cache()
+        self.assertEqual(results, [w.translate(str.maketrans('', '', ", ")).upper().replace("É", "E").replace("Œ", "OE") for w in words])
+
+    def test_normalization_diagnostics(self):
+        diagnostics = NormalizationDiagnostics()
+        self.assertFalse(diagnostics)
+        to_letters("Œuvre, déjà !", diagnostics=diagnostics)
+        self.assertFalse(diagnostics)
+        to_letters("Page 12, page 21", diagnostics=diagnostics)
+        self.assertEqual(diagnostics.unknown, {'1': 2, '2': 2})
+        remove_accent("« Ah »", diagnostics=diagnostics)
+        self.assertEqual(diagnostics.unknown['«'], 1)
+        diagnostics.clear()
+        self.assertFalse(diagnostics)
+
+    def test_letter_offsets(self):
+        self.assertEqual(list(letter_offsets("")), [])
+        self.assertEqual(list(letter_offsets("À-côtés !")), [0, 2, 3, 4, 5, 6])
+        s = "Un œuf."
+        offsets = letter_offsets(s)
+        self.assertEqual(list(offsets), [0, 1, 3, 3, 4, 5]) # Ligature gives two letters
+        self.assertEqual(source_span(offsets, 2, 5), (3, 5))
+        self.assertEqual(s[slice(*source_span(offsets, 0, 6))], "Un œuf")
+
+    def test_letter_count(self):
+        count = letter_count("Œuf, bœuf... 2 œufs !")
+        self.assertEqual(count["O"], 3)
+        self.assertEqual(count["2"], 1)
+        self.assertEqual(count["A"], 0)
+        self.assertEqual(count.total(), 15)
+        self.assertEqual(count.counter(), letter_counter("Œuf, bœuf... 2 œufs !"))
+        self.assertEqual(LetterCount("Chien"), LetterCount("niche"))
+        self.assertNotEqual(LetterCount("Chien"), LetterCount("chiens"))
+        self.assertNotEqual(LetterCount("a1"), LetterCount("a2"))
+        self.assertLessEqual(LetterCount("niche"), LetterCount("Chiens"))
+        self.assertGreaterEqual(LetterCount("Chiens"), LetterCount("niche"))
+        self.assertFalse(LetterCount("niches") <= LetterCount("Chien"))
+        self.assertFalse(LetterCount("1") <= LetterCount("Chien"))
+        self.assertEqual((LetterCount("ab1") + LetterCount("b1")).counter(), Counter("ABB11"))
+        self.assertEqual((LetterCount("ab1") - LetterCount("bb")).counter(), Counter("A1"))
+        self.assertFalse(LetterCount(""))
+        self.assertEqual(repr(LetterCount("ba")), "LetterCount({'A': 1, 'B': 1})")
+        # Long texts are counted the same way
+        text = "Il était une fois, dans un pays lointain... 42 fois !" * 3
+        self.assertEqual(letter_count(text).counter(), letter_counter(text))
+        self.assertEqual(letter_count(normalize(text)), letter_count(text))
+
+    def test_letter_mask(self):
+        self.assertEqual(letter_mask(""), 0)
+        self.assertEqual(letter_mask("Abba"), 0b11)
+        self.assertEqual(letter_mask("Çà"), letter_mask("ac"))
+        self.assertEqual(letter_mask("B12"), 0b10 | OTHER_CHAR_BIT)
+        self.assertEqual(mask_letters(letter_mask("Être et n'être")), "ENRT")
+
     def test_to_vowels(self):
         self.assertEqual(to_vowels(""), "")
         self.assertEqual(to_vowels("fenouil"), "EOUI")
@@ -37,6 +137,44 @@ class TestUtils(unittest.TestCase):
         #self.assertEqual(to_words("Aujourd'hui, c'est lundi ! Eh."), ["Aujourd'hui", "c", "est", "lundi", "Eh"])
 
 
+class TestNormalizedText(unittest.TestCase):
+    def test_views(self):
+        text = NormalizedText("Où est l'œuvre ?\nÇà !")
+        self.assertEqual(text.letters, "OUESTLOEUVRECA")
+        self.assertEqual(text.words, ["Où", "est", "l", "œuvre", "Çà"])
+        self.assertEqual(text.letter_words, ["OU", "EST", "L", "OEUVRE", "CA"])
+        self.assertEqual(text.lines, ["Où est l'œuvre ?", "Çà !"])
+        self.assertEqual(text.letter_lines, ["OUESTLOEUVRE", "CA"])
+        self.assertEqual(text.vowels, "OUEOEUEA")
+        self.assertEqual(text.consonants, "STLVRC")
+        self.assertEqual(text.letter_counter["E"], 3)
+
+    def test_cache(self):
+        text = NormalizedText("Fenouil furibond")
+        self.assertIs(text.letter_words, text.letter_words)
+        self.assertIs(normalize(text), text)
+        # Helpers return copies of cached views
+        words = to_words(text)
+        words.append("fi")
+        self.assertEqual(to_words(text), ["Fenouil", "furibond"])
+        self.assertIs(to_vowels(text), text.vowels)
+        self.assertIs(to_consonants(text), text.consonants)
+        self.assertEqual(to_vowels(text), to_vowels(text.source))
+        self.assertEqual(to_consonants(text), to_consonants(text.source))
+
+    def test_checkers(self):
+        s = "Être et n'être, tel est le Cerbère."
+        text = NormalizedText(s)
+        self.assertEqual(to_letters(text), to_letters(s))
+        self.assertEqual(letter_counter(text), letter_counter(s))
+        self.assertTrue(check_monovocalism(text))
+        self.assertTrue(check_lipogram(text, "a"))
+        self.assertFalse(check_tautogram(text))
+        self.assertFalse(check_prisoner(text))
+        self.assertFalse(check_asupposer(text))
+        self.assertTrue(check_anagram(text, NormalizedText(s[::-1])))
+
+
 class TestConstraintChecker(unittest.TestCase):
     def test_isosceles(self):
         self.assertTrue(check_isosceles(""))
@@ -126,6 +264,7 @@ class TestConstraintChecker(unittest.TestCase):
 
     def test_okapi(self):
         self.assertTrue(check_okapi(""))
+        self.assertTrue(check_okapi(" ... "))
         self.assertTrue(check_okapi("E"))
         self.assertTrue(check_okapi("okapi"))
         self.assertTrue(check_okapi("Je me dis à mi-mot..."))
@@ -202,12 +341,18 @@ class TestConstraintChecker(unittest.TestCase):
         self.assertTrue(check_sympathetic("Un fenouil cuit", min=2)) # nu, ui
         self.assertFalse(check_sympathetic("Un fenouil cuit", min=3)) # nu, ui
         self.assertFalse(check_sympathetic("Fenouil, ahah !"))
+        # Repeated letters are counted, as in count_common()
+        self.assertTrue(check_sympathetic("Anna Nil", min=2))
+        self.assertFalse(check_sympathetic("Nil Anna", min=2))
+        self.assertTrue(check_sympathetic("a2 b2"))
     
     def test_snob(self):
         self.assertTrue(check_snob(""))
         self.assertTrue(check_snob("fenouil"))
         self.assertTrue(check_snob("Ça ! Quel gras fenouil !"))
         self.assertFalse(check_snob("Un fenouil cuit"))
+        self.assertFalse(check_snob("a2 b2"))
+        self.assertTrue(check_snob("a2 b3"))
 
     def test_ngram(self):
         self.assertTrue(check_ngram("", 7))
@@ -281,6 +426,9 @@ class TestConstraintChecker(unittest.TestCase):
         self.assertFalse(check_heterogram("fenouil", "ULCERATIONS"))
         self.assertFalse(check_heterogram("lcerations", "ULCERATIONS"))
         self.assertFalse(check_heterogram("ulcerations, et...", "ULCERATIONS"))
+        self.assertFalse(check_heterogram("ab ba a", "ab"))
+        with self.assertRaises(ValueError):
+            check_heterogram("ulcerations", "...")
 
     def test_ulcerations(self):
         self.assertTrue(check_ulcerations("")) # Empty case
@@ -363,6 +511,111 @@ class TestConstraintChecker(unittest.TestCase):
         self.assertFalse(check_asupposer("fenouil"))
 
 
+class TestCheckAll(unittest.TestCase):
+    def test_check_all(self):
+        self.assertEqual(check_all("", []), [])
+        self.assertEqual(check_all("", ["okapi", "pangram"]), [True, False])
+        self.assertEqual(
+            check_all("Fenouil furibond faisant finement fi !", [
+                "tautogram",
+                ("tautogram", {"start_with": "a"}),
+                ("lipogram", {"forbidden": "z"}),
+                ("lipogram", {"forbidden": "e"}),
+                ("ngram", {"n": [2, 7, 8]}),
+                "palindrom", # Checked as a whole
+            ]),
+            [True, False, True, False, True, False]
+        )
+        self.assertEqual(
+            check_all("Être et n'être, tel est le Cerbère.", [
+                "monovocalism", ("monovocalism", {"vowel": "a"}), "turkish", "kyrielle",
+            ]),
+            [True, False, False, False] # B in 'Cerbère'
+        )
+        self.assertEqual(
+            check_all(NormalizedText("Ab. Cdf; ghjkl emnpqrstvwxz !"), [
+                "heteroconsonantism", "pangram", ("anagram", {"s2": "zyx"}), "okapi",
+            ]),
+            [True, False, False, False]
+        )
+
+    def test_check_all_matches_checkers(self):
+        texts = [
+            "", "kayak", "okapi", "Je me dis à mi-mot...", "Bac cab abc",
+            "Il était une fois...", "Ulcérations, scintilla...",
+        ]
+        constraints = [
+            ("beaupresent", {"ref": "Georges Perec"}), "snob", "sympathetic",
+            ("heterogram", {"ref": "abc"}), "ulcerations", ("mingram", {"m": 3}),
+            ("progressive_tautogram", {"ref": "abc"}), "abecedaire", "isosceles",
+        ]
+        for s in texts:
+            expected = [
+                constraint_checkers[name](s, **params) if params else constraint_checkers[name](s)
+                for name, params in [(c, {}) if isinstance(c, str) else c for c in constraints]
+            ]
+            self.assertEqual(check_all(s, constraints), expected)
+
+    def test_check_all_errors(self):
+        with self.assertRaises(ValueError):
+            check_all("fenouil", ["unknown"])
+        with self.assertRaises(ValueError):
+            check_all("fenouil", [("tautogram", {"start_with": "ab"})])
+
+
+class TestCompileConstraint(unittest.TestCase):
+    def test_compile_constraint(self):
+        no_e = compile_constraint("lipogram", forbidden="E")
+        self.assertFalse(no_e("Fenouil"))
+        self.assertTrue(no_e("Oulipo"))
+        self.assertEqual(no_e.name, "lipogram")
+        self.assertEqual(repr(no_e), "compile_constraint('lipogram', forbidden='E')")
+        self.assertTrue(compile_constraint("palindrom")("Kayak"))
+        self.assertTrue(compile_constraint("subanagram", s_ref="Georges Perec")("greco"))
+        self.assertFalse(compile_constraint("subanagram", s_ref="Georges Perec")("perce-oreille"))
+        with self.assertRaises(ValueError):
+            compile_constraint("unknown")
+        with self.assertRaises(ValueError):
+            compile_constraint("monovocalism", vowel="b")
+        with self.assertRaises(ValueError):
+            compile_constraint("panscrabblogram", lang="de")
+
+    def test_matches_checkers(self):
+        texts = ["", "Oulipo", "Fenouil !", "Œuf, bœuf", "Je me dis à mi-mot", "abcdefghijklmnopqrstuvwxyz"]
+        constraints = [
+            ("lipogram", {"forbidden": "eA"}), ("beaupresent", {"ref": "Paris é"}), ("prisoner", {}),
+            ("prisoner", {"allow_accent": False}), ("released_prisoner", {}), ("turkish", {}),
+            ("anagram", {"s2": "Fée, nil ou"}), ("subanagram", {"s_ref": "Fenouil au beurre"}), ("pangram", {}),
+            ("pangram", {"alphabet": "ffe"}), ("panscrabblogram", {}), ("monovocalism", {"vowel": "e"}),
+            ("heteroconsonantism", {}),
+        ]
+        for s in texts:
+            for name, params in constraints:
+                self.assertEqual(compile_constraint(name, **params)(s), constraint_checkers[name](s, **params))
+
+    def test_combination(self):
+        no_e = compile_constraint("lipogram", forbidden="E")
+        pangram = compile_constraint("pangram")
+        self.assertTrue((no_e & ~pangram)("Oulipo"))
+        self.assertFalse((no_e & pangram)("Oulipo"))
+        self.assertTrue((no_e | pangram)("Oulipo"))
+        self.assertFalse((~no_e | pangram)("Oulipo"))
+        self.assertIsNone((no_e & pangram).name)
+        with self.assertRaises(TypeError):
+            no_e & "pangram"
+
+    def test_check_all(self):
+        no_e = compile_constraint("lipogram", forbidden="E")
+        self.assertEqual(
+            check_all("Oulipo", [no_e, ~no_e, no_e | compile_constraint("pangram"), "pangram"]),
+            [True, False, True, False],
+        )
+
+    def test_pickle(self):
+        constraint = compile_constraint("lipogram", forbidden="E") & ~compile_constraint("pangram")
+        self.assertTrue(pickle.loads(pickle.dumps(constraint))("Oulipo"))
+
+
 class TestStatistics(unittest.TestCase):
     def test_gematria(self):
         self.assertEqual(gematria(""), 0)
@@ -382,6 +635,25 @@ class TestStatistics(unittest.TestCase):
         self.assertEqual(gematria_lines("FênOuil !"), [82])
         self.assertEqual(gematria_lines("fenouil\n"), [82])
         self.assertEqual(gematria_lines("fenouil fenouil...\nFenouil !"), [164, 82])
+        self.assertEqual(gematria_lines("fenouil\n...\nfenouil"), [82, 0, 82])
+
+    def test_gematria_mapping(self):
+        self.assertEqual(gematria("CIVIL", mapping='roman_numeral'), 157)
+        self.assertEqual(gematria_words("Le roi", mapping={'L': 50, 'I': 1}), [50, 1])
+        self.assertEqual(gematria_lines("Le\nroi", mapping={'L': 50, 'I': 1}), [50, 1])
+        self.assertEqual(gematria("wax", mapping='latin_rank'), 22)
+        with self.assertRaises(ValueError):
+            gematria("fenouil", mapping='unknown')
+        with self.assertRaises(ValueError):
+            gematria("fenouil", mapping={'LI': 51})
+        # Custom mappings are compiled once, but can change
+        mapping = {'L': 50, 'I': 1}
+        self.assertIs(_gematria_table(mapping), _gematria_table(dict(mapping)))
+        mapping['I'] = 2
+        self.assertEqual(gematria("Le roi", mapping=mapping), 52)
+        text = normalize("Fenouil, fenouil ?\nFenouil !")
+        self.assertEqual(gematria_words(text), [82, 82, 82])
+        self.assertEqual(gematria_lines(text), [164, 82])
 
 
 
@@ -0,0 +1,54 @@
+import unittest
+
+from src.utils import *
+from src.violations import *
+
+
+class TestFindViolations(unittest.TestCase):
+    def test_lipogram(self):
+        self.assertEqual(find_violations("", ("lipogram", {"forbidden": "e"})), [])
+        self.assertEqual(find_violations("Parfois, j'ai froid.", ("lipogram", {"forbidden": "e"})), [])
+        self.assertEqual(
+            find_violations("Il était une fois, œuf", ("lipogram", {"forbidden": "e"})),
+            [(3, 4), (11, 12), (19, 20)] # With accents and ligatures
+        )
+        self.assertEqual(find_violations("Il était une fois", ("lipogram", {"forbidden": "e"}), limit=1), [(3, 4)])
+        self.assertEqual(find_violations("un bois", "turkish"), [(3, 4)])
+
+    def test_prisoner(self):
+        self.assertEqual(find_violations("sans un son", "prisoner"), [])
+        self.assertEqual(find_violations("un réseau", "prisoner"), [])
+        self.assertEqual(find_violations("un réseau", ("prisoner", {"allow_accent": False})), [(4, 5)])
+        self.assertEqual(find_violations("cinq, j", "prisoner"), [(3, 4), (6, 7)])
+
+    def test_okapi(self):
+        self.assertEqual(find_violations("Je me dis à mi-mot...", "okapi"), [])
+        self.assertEqual(find_violations("Patatra !", "okapi"), [(5, 6)])
+        self.assertEqual(find_violations("fenouil", "okapi"), [(4, 5), (5, 6)])
+
+    def test_words(self):
+        s = "Fenouil furibond, pas fin"
+        self.assertEqual(find_violations(s, "tautogram"), [(18, 21)])
+        self.assertEqual(find_violations(s, ("tautogram", {"start_with": "p"})), [(0, 7), (8, 16), (22, 25)])
+        self.assertEqual(find_violations("Il lit tôt ou pas", "kyrielle"), [(11, 13), (14, 17)])
+        self.assertEqual(find_violations("Il a tu", "snob"), [])
+        self.assertEqual(find_violations("Il a ta", "snob"), [(5, 7)])
+        self.assertEqual(find_violations("Il était une fois", ("ngram", {"n": [2, 4, 5]})), [(9, 12)])
+
+    def test_matches_checkers(self):
+        texts = ["", "kayak", "Je me dis à mi-mot...", "Il était une fois...", "Ab. Cdf; ghjkl emnpqrstvwxz !"]
+        constraints = [
+            ("beaupresent", {"ref": "Gilles Esposito-Farèse"}), "released_prisoner", "heteroconsonantism",
+            "sympathetic", ("maxgram", {"m": 4}), ("mingram", {"m": 2}),
+        ]
+        for s in texts:
+            for constraint in constraints:
+                self.assertEqual(not find_violations(s, constraint), check_all(s, [constraint])[0])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            find_violations("kayak", "palindrom")
+
+
+if __name__ == '__main__':
+    unittest.main()